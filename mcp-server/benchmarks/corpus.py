@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Synthetic governance corpus generator for benchmarks.
+
+Produces markdown documents shaped like the real standards and workflows
+(front matter, heading hierarchy, rule lists, tables and code fences) from a
+fixed vocabulary, so runs with the same seed and size are byte-identical.
+"""
+import argparse
+import os
+import random
+from typing import Dict, List
+
+CATEGORIES = ["standards", "workflows", "policies", "templates"]
+
+TOPICS = [
+    "branch protection", "code review", "conventional commits", "release management",
+    "dependency updates", "secret scanning", "incident response", "access control",
+    "code owners", "status checks", "merge strategy", "documentation", "agent handoffs",
+    "memory bank", "compliance reporting", "security scanning", "onboarding", "testing",
+]
+
+VOCABULARY = (
+    "repository branch main development feature hotfix release merge squash rebase commit "
+    "pull request review approval approver reviewer codeowners owner maintainer admin "
+    "protection rule status check ci tests security scan lint coverage pipeline workflow "
+    "policy standard guideline requirement exception override expiry audit report violation "
+    "compliance health score agent handoff logbook context progress memory bank template "
+    "version tag changelog semantic breaking deprecation migration rollback deploy production "
+    "staging environment secret token credential rotation access permission team role "
+    "must should may never always required optional enforced recommended documented"
+).split()
+
+BRANCHES = ["main", "development", "release/1.4", "hotfix/login-timeout", "feature/payments-api"]
+CHECKS = ["ci-tests", "security-scan", "compliance-check", "performance-tests", "markdown-lint"]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(VOCABULARY) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng, rng.randint(8, 18)) for _ in range(rng.randint(2, 5)))
+
+
+def generate_document(rng: random.Random, topic: str, index: int) -> str:
+    """Render one synthetic governance document."""
+    lines = [
+        "---",
+        f"title: {topic.title()} Standard {index}",
+        f"owner: team-{rng.randint(1, 40)}",
+        "---",
+        f"# {topic.title()} Standard {index}",
+        "",
+        _paragraph(rng),
+        "",
+    ]
+    for section in range(rng.randint(3, 7)):
+        lines += [f"## {rng.choice(VOCABULARY).title()} {rng.choice(VOCABULARY)} {section + 1}", "", _paragraph(rng), ""]
+        if rng.random() < 0.5:
+            lines += [f"### Rules for `{rng.choice(BRANCHES)}`", ""]
+            lines += [f"- {_sentence(rng, rng.randint(6, 12))}" for _ in range(rng.randint(2, 5))]
+            lines.append("")
+        if rng.random() < 0.3:
+            lines += ["| Check | Required | Timeout |", "| --- | --- | --- |"]
+            lines += [
+                f"| {check} | {rng.choice(['yes', 'no'])} | {rng.randint(5, 30)}m |"
+                for check in rng.sample(CHECKS, 3)
+            ]
+            lines.append("")
+        if rng.random() < 0.2:
+            lines += ["```bash", f"git checkout -b {rng.choice(BRANCHES)}", "git commit -m \"feat: update\"", "```", ""]
+    return "\n".join(lines)
+
+
+def generate_corpus(root: str, num_docs: int, seed: int = 42) -> Dict[str, int]:
+    """Write num_docs documents under root/<category>/ and return basic size stats."""
+    rng = random.Random(seed)
+    total_bytes = 0
+    for category in CATEGORIES:
+        os.makedirs(os.path.join(root, category), exist_ok=True)
+    for i in range(num_docs):
+        topic = TOPICS[i % len(TOPICS)]
+        category = CATEGORIES[i % len(CATEGORIES)]
+        content = generate_document(rng, topic, i)
+        path = os.path.join(root, category, f"{topic.replace(' ', '-')}-{i:06d}.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        total_bytes += len(content.encode("utf-8"))
+    return {"documents": num_docs, "bytes": total_bytes}
+
+
+def generate_queries(count: int, seed: int = 7) -> List[str]:
+    """Deterministic mix of natural-language and exact-term queries."""
+    rng = random.Random(seed)
+    queries = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            queries.append(f"{rng.choice(TOPICS)} requirements")
+        elif kind == 1:
+            queries.append(" ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(3, 6))))
+        else:
+            queries.append(rng.choice(CHECKS + BRANCHES))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic governance corpus.")
+    parser.add_argument("root", help="Output directory")
+    parser.add_argument("--docs", type=int, default=1000, help="Number of documents (default: 1000)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    stats = generate_corpus(args.root, args.docs, args.seed)
+    print(f"Wrote {stats['documents']} documents ({stats['bytes'] / 1e6:.1f} MB) to {args.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the governance MCP server and search engine.
+
+Runs fully offline: a synthetic corpus (see corpus.py) is indexed with the
+deterministic local embedder, then the harness measures indexing throughput,
+query latency percentiles per search mode, peak memory, concurrent tool-call
+throughput through an in-process MCP client session and, for the numpy vector
+store, the recall, latency and memory of the ANN index against exact search.
+Results are written as JSON; pass --baseline to compare against a previous run
+and fail on regressions.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Add src and this directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_corpus, generate_queries
+
+# Metrics compared against a baseline: (path, higher_is_better)
+TRACKED_METRICS = [
+    (("indexing", "chunks_per_sec"), True),
+    (("indexing", "noop_reindex_seconds"), False),
+    (("query_latency_ms", "hybrid", "p95"), False),
+    (("query_latency_ms", "vector", "p95"), False),
+    (("query_latency_ms", "keyword", "p95"), False),
+    (("mcp", "calls_per_sec"), True),
+    (("memory", "max_rss_mb"), False),
+    (("ann", "recall_at_k"), True),
+    (("ann", "latency_ms", "p95"), False),
+]
+
+# (nprobe, rerank) settings of the ANN recall/latency sweep
+ANN_SETTINGS = [(4, 0), (8, 50), (16, 100), (32, 200), (64, 200)]
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max of latency samples in milliseconds."""
+    if not samples:
+        return {}
+    values = np.asarray(samples) * 1000.0
+    return {
+        "p50": round(float(np.percentile(values, 50)), 3),
+        "p95": round(float(np.percentile(values, 95)), 3),
+        "p99": round(float(np.percentile(values, 99)), 3),
+        "mean": round(float(values.mean()), 3),
+        "max": round(float(values.max()), 3),
+        "count": len(samples),
+    }
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+@contextmanager
+def patched_env(values: Dict[str, str]):
+    saved = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def bench_indexing(corpus_dir: str, index_dir: str, vector_store: str) -> Dict[str, Any]:
+    from search import SemanticSearch
+
+    engine = SemanticSearch(index_dir, embedding_backend="local", vector_store_backend=vector_store)
+    start = time.perf_counter()
+    stats = engine.index_documents(corpus_dir)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.index_documents(corpus_dir)
+    noop_elapsed = time.perf_counter() - start
+
+    return {
+        "documents": stats["added"],
+        "chunks": stats["chunks"],
+        "seconds": round(elapsed, 4),
+        "docs_per_sec": round(stats["added"] / elapsed, 1),
+        "chunks_per_sec": round(stats["chunks"] / elapsed, 1),
+        "noop_reindex_seconds": round(noop_elapsed, 4),
+        "stages": stats["timings"],
+    }
+
+
+def bench_queries(index_dir: str, vector_store: str, queries: List[str], limit: int) -> Dict[str, Any]:
+    from search import SEARCH_MODES, SemanticSearch
+
+    engine = SemanticSearch(index_dir, embedding_backend="local", vector_store_backend=vector_store)
+    results = {}
+    for mode in SEARCH_MODES:
+        engine.search(queries[0], limit=limit, mode=mode)  # warm-up
+        samples = []
+        for query in queries:
+            start = time.perf_counter()
+            engine.search(query, limit=limit, mode=mode)
+            samples.append(time.perf_counter() - start)
+        results[mode] = percentiles(samples)
+    return results
+
+
+def bench_ann(index_dir: str, queries: List[str], limit: int, quantization: str) -> Dict[str, Any]:
+    """Build the ANN index, then compare it with exact search: recall@limit and latency per setting."""
+    from search import SemanticSearch
+
+    engine = SemanticSearch(index_dir, embedding_backend="local", vector_store_backend="numpy")
+    start = time.perf_counter()
+    build = engine.build_ann_index(quantization=quantization)
+    build_seconds = time.perf_counter() - start
+    store = engine.vector_store
+    vectors = [engine._embed_query(query) for query in queries]
+
+    def timed_search(vector, **kwargs):
+        start = time.perf_counter()
+        results = store.similarity_search_by_vector_with_relevance_scores(vector, k=limit, **kwargs)
+        return {doc.id for doc, _ in results}, time.perf_counter() - start
+
+    exact = [timed_search(vector, exact=True) for vector in vectors]
+    settings = {}
+    for nprobe, rerank in sorted(set(ANN_SETTINGS + [(store.nprobe, store.rerank)])):
+        recalls, samples = [], []
+        for vector, (truth, _) in zip(vectors, exact):
+            found, seconds = timed_search(vector, nprobe=nprobe, rerank=rerank)
+            recalls.append(len(found & truth) / len(truth) if truth else 1.0)
+            samples.append(seconds)
+        settings[f"nprobe={nprobe},rerank={rerank}"] = {
+            "recall": round(float(np.mean(recalls)), 4),
+            "latency_ms": percentiles(samples),
+        }
+    default = settings[f"nprobe={store.nprobe},rerank={store.rerank}"]
+    return {
+        "quantization": quantization,
+        "nlist": build["nlist"],
+        "code_bytes_per_vector": build["code_bytes_per_vector"],
+        "build_seconds": round(build_seconds, 4),
+        "vector_bytes": build["vector_bytes"],
+        "ann_bytes": build["memory_bytes"],
+        "memory_reduction": round(build["vector_bytes"] / build["memory_bytes"], 1),
+        "exact_latency_ms": percentiles([seconds for _, seconds in exact]),
+        # At the store's default nprobe/rerank (GOVERNANCE_ANN_NPROBE / GOVERNANCE_ANN_RERANK)
+        "recall_at_k": default["recall"],
+        "latency_ms": default["latency_ms"],
+        "settings": settings,
+    }
+
+
+async def bench_mcp(queries: List[str], calls: int, concurrency: int) -> Dict[str, Any]:
+    """Drive the server's tools through an in-process MCP client session."""
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    # (Re)import so the server picks up the benchmark corpus and index from the environment
+    server = importlib.reload(sys.modules["server"]) if "server" in sys.modules else importlib.import_module("server")
+
+    async with create_connected_server_and_client_session(server.mcp) as session:
+        docs = (await session.call_tool("list_governance_docs", {})).content
+        uris = [item.text for item in docs] or ["governance://standards/missing"]
+
+        def make_call(i: int):
+            kind = i % 4
+            if kind in (0, 1):
+                return "search_governance", session.call_tool("search_governance", {"query": queries[i % len(queries)]})
+            if kind == 2:
+                return "read_governance_doc", session.read_resource(uris[i % len(uris)])
+            return "generate_compliance_report", session.call_tool("generate_compliance_report", {})
+
+        semaphore = asyncio.Semaphore(concurrency)
+        samples: Dict[str, List[float]] = {}
+        errors = 0
+
+        async def run(i: int):
+            nonlocal errors
+            async with semaphore:
+                name, call = make_call(i)
+                start = time.perf_counter()
+                try:
+                    result = await call
+                    if getattr(result, "isError", False):
+                        errors += 1
+                except Exception:
+                    errors += 1
+                samples.setdefault(name, []).append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(run(i) for i in range(calls)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "calls": calls,
+        "concurrency": concurrency,
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "calls_per_sec": round(calls / elapsed, 1),
+        "latency_ms": {name: percentiles(values) for name, values in samples.items()},
+    }
+
+
+def run_benchmarks(
+    docs: int = 1000,
+    queries: int = 200,
+    mcp_calls: int = 400,
+    concurrency: int = 16,
+    vector_store: str = "numpy",
+    limit: int = 5,
+    seed: int = 42,
+    work_dir: Optional[str] = None,
+    ann_quantization: Optional[str] = "pq",
+) -> Dict[str, Any]:
+    """Run every benchmark and return the results dictionary."""
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        corpus_dir = os.path.join(tmp, "corpus")
+        index_dir = os.path.join(tmp, "index")
+        start = time.perf_counter()
+        corpus = generate_corpus(corpus_dir, docs, seed=seed)
+        corpus["generate_seconds"] = round(time.perf_counter() - start, 4)
+        query_set = generate_queries(queries, seed=seed)
+
+        env = {
+            "GOVERNANCE_EMBEDDINGS": "local",
+            "GOVERNANCE_VECTOR_STORE": vector_store,
+            "GOVERNANCE_REPO_ROOT": corpus_dir,
+            "GOVERNANCE_INDEX_DIR": index_dir,
+            # Measure uncached latency; repeated-query caching is benchmarked separately by hit rate
+            "GOVERNANCE_SEARCH_CACHE_SIZE": "0",
+        }
+        with patched_env(env):
+            results = {
+                "config": {
+                    "docs": docs,
+                    "queries": queries,
+                    "mcp_calls": mcp_calls,
+                    "concurrency": concurrency,
+                    "vector_store": vector_store,
+                    "limit": limit,
+                    "seed": seed,
+                    "ann_quantization": ann_quantization,
+                },
+                "environment": {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "cpu_count": os.cpu_count(),
+                },
+                "corpus": corpus,
+                "indexing": bench_indexing(corpus_dir, index_dir, vector_store),
+                "query_latency_ms": bench_queries(index_dir, vector_store, query_set, limit),
+                "mcp": asyncio.run(bench_mcp(query_set, mcp_calls, concurrency)),
+            }
+            if vector_store == "numpy" and ann_quantization:
+                # Last, so the other sections measure the exact scan
+                results["ann"] = bench_ann(index_dir, query_set, limit, ann_quantization)
+    results["memory"] = {"max_rss_mb": max_rss_mb()}
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """Describe tracked metrics that regressed by more than max_regression (a fraction)."""
+    regressions = []
+    for path, higher_is_better in TRACKED_METRICS:
+        current, previous = results, baseline
+        for key in path:
+            current = current.get(key, {}) if isinstance(current, dict) else {}
+            previous = previous.get(key, {}) if isinstance(previous, dict) else {}
+        if not isinstance(current, (int, float)) or not isinstance(previous, (int, float)) or not previous:
+            continue
+        change = (current - previous) / previous
+        worse = -change if higher_is_better else change
+        marker = "REGRESSION" if worse > max_regression else "ok"
+        print(f"{'.'.join(path):<36} {previous:>12.3f} -> {current:>12.3f} ({change:+.1%}) {marker}")
+        if worse > max_regression:
+            regressions.append(".".join(path))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the governance MCP server offline.")
+    parser.add_argument("--docs", type=int, default=1000, help="Synthetic documents to generate (100 to 100000)")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per search mode")
+    parser.add_argument("--mcp-calls", type=int, default=400, help="Tool calls through the MCP session")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent in-flight tool calls")
+    parser.add_argument("--vector-store", choices=["numpy", "chroma"], default="numpy")
+    parser.add_argument(
+        "--ann-quantization", choices=["pq", "int8", "none"], default="pq",
+        help="ANN codes to benchmark against exact search (numpy store only; 'none' skips it)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument(
+        "--max-regression", type=float, default=0.2, help="Allowed fractional regression vs baseline (default 0.2)"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        docs=args.docs,
+        queries=args.queries,
+        mcp_calls=args.mcp_calls,
+        concurrency=args.concurrency,
+        vector_store=args.vector_store,
+        seed=args.seed,
+        ann_quantization=None if args.ann_quantization == "none" else args.ann_quantization,
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps({k: results[k] for k in ("indexing", "query_latency_ms", "mcp", "memory", "ann") if k in results}, indent=2))
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"❌ {len(regressions)} metric(s) regressed: {', '.join(regressions)}")
+            sys.exit(1)
+        print("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,149 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import sys
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
 
-from search import SemanticSearch
+from ann import QUANTIZATIONS
+from embeddings import EMBEDDING_BACKENDS, measure_throughput
+from pipeline import make_text_splitter
+from search import VECTOR_STORE_BACKENDS, discover_documents
+from shards import CENTRAL_SHARD, ShardedSearch
+
+def benchmark_embeddings(search_engine: ShardedSearch, repo_root: str):
+    """Chunk the whole repo and report embedding throughput without touching the index."""
+    chunks = []
+    splitter = make_text_splitter()
+    for path in discover_documents(repo_root).values():
+        with open(path, "r", encoding="utf-8") as f:
+            chunks.extend(splitter.split_text(f.read()))
+
+    result = measure_throughput(search_engine.embeddings, chunks)
+    print(
+        f"Embedded {result['chunks']} chunks in {result['seconds']:.3f}s "
+        f"({result['chunks_per_sec']:.0f} chunks/sec)"
+    )
 
 def main():
-    # Root of the repo is one level up from mcp-server
-    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
-    
-    print(f"Initializing Semantic Search for repo: {repo_root}")
-    
-    # Initialize search engine (will create/load DB in mcp-server/chroma_db)
-    db_path = os.path.join(os.path.dirname(__file__), "chroma_db")
-    search_engine = SemanticSearch(persistence_directory=db_path)
-    
-    # Index documents
-    search_engine.index_documents(repo_root)
+    parser = argparse.ArgumentParser(description="Index governance documents for semantic search.")
+    parser.add_argument(
+        "--embeddings",
+        choices=EMBEDDING_BACKENDS,
+        default=None,
+        help="Embedding backend (default: $GOVERNANCE_EMBEDDINGS or 'auto')",
+    )
+    parser.add_argument(
+        "--vector-store",
+        choices=sorted(VECTOR_STORE_BACKENDS),
+        default=None,
+        help="Vector store backend (default: $GOVERNANCE_VECTOR_STORE or 'chroma')",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Chunks per embedding/write batch; bounds peak memory (default: $GOVERNANCE_INDEX_BATCH_SIZE or 256)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parallel read/split workers (default: $GOVERNANCE_INDEX_WORKERS or min(8, CPUs))",
+    )
+    parser.add_argument(
+        "--repo",
+        default=CENTRAL_SHARD,
+        help="Repository shard to index (default: the governance repo itself)",
+    )
+    parser.add_argument(
+        "--root",
+        default=None,
+        help="Local clone of --repo; registers it (or moves it) before indexing",
+    )
+    parser.add_argument(
+        "--ann",
+        action="store_true",
+        help="Also build the approximate nearest-neighbor index (IVF + quantized codes; numpy vector store only)",
+    )
+    parser.add_argument(
+        "--ann-nlist",
+        type=int,
+        default=None,
+        help="IVF lists (default: about sqrt(chunks))",
+    )
+    parser.add_argument(
+        "--ann-quantization",
+        choices=QUANTIZATIONS,
+        default="pq",
+        help="Vector codes: pq (product quantization, smallest) or int8 (default: pq)",
+    )
+    parser.add_argument(
+        "--ann-subspaces",
+        type=int,
+        default=None,
+        help="PQ subspaces, i.e. code bytes per vector; must divide the dimension (default: dimension / 16)",
+    )
+    parser.add_argument(
+        "--benchmark-embeddings",
+        action="store_true",
+        help="Only measure embedding throughput in chunks/sec; do not update the index",
+    )
+    args = parser.parse_args()
+
+    # Root of the repo is one level up from mcp-server; GOVERNANCE_REPO_ROOT overrides it, as for the server
+    repo_root = os.path.abspath(os.environ.get("GOVERNANCE_REPO_ROOT") or os.path.join(os.path.dirname(__file__), "../"))
+
+    # Initialize search engine (will create/load DB in mcp-server/chroma_db, or $GOVERNANCE_INDEX_DIR;
+    # onboarded repositories get their own shard under chroma_db/shards/)
+    db_path = os.environ.get("GOVERNANCE_INDEX_DIR") or os.path.join(os.path.dirname(__file__), "chroma_db")
+    search_engine = ShardedSearch(
+        db_path,
+        repo_root,
+        embedding_backend=args.embeddings,
+        vector_store_backend=args.vector_store,
+    )
+    if args.root:
+        search_engine.add_repo(args.repo, args.root)
+    elif args.repo not in search_engine.repos:
+        parser.error(f"Unknown repository {args.repo}; pass --root to register it")
+
+    print(f"Initializing Semantic Search for {args.repo}: {search_engine.repos[args.repo]}")
+
+    if args.benchmark_embeddings:
+        benchmark_embeddings(search_engine, search_engine.repos[args.repo])
+        return
+
+    # Index documents (only new or changed files are embedded; other shards are untouched)
+    stats = search_engine.index_repo(args.repo, batch_size=args.batch_size, workers=args.workers)
+    if stats.get("rebuild"):
+        print(f"Rebuilt the index: {stats['rebuild']}")
+    print(
+        f"Files: {stats['added']} added, {stats['updated']} updated, "
+        f"{stats['deleted']} deleted, {stats['skipped']} unchanged ({stats['chunks']} chunks embedded)"
+    )
+
+    timings = dict(stats["timings"])
+    wall_seconds = timings.pop("wall_seconds")
+    print(f"\n{'Stage':<10} {'Seconds':>9} {'Items':>8} {'Items/sec':>10}")
+    for stage, timing in timings.items():
+        rate = f"{timing['items_per_sec']:.0f}" if timing["items_per_sec"] is not None else "-"
+        print(f"{stage:<10} {timing['seconds']:>9.3f} {timing['items']:>8} {rate:>10}")
+    print(f"Total wall time: {wall_seconds:.3f}s")
+
+    if args.ann:
+        try:
+            ann = search_engine.shard(args.repo).build_ann_index(
+                nlist=args.ann_nlist, quantization=args.ann_quantization, subspaces=args.ann_subspaces
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        print(
+            f"\nANN index: {ann['rows']} vectors in {ann['nlist']} lists, {ann['quantization']} codes of "
+            f"{ann['code_bytes_per_vector']} bytes; {ann['memory_bytes'] / 2**20:.1f} MiB vs "
+            f"{ann['vector_bytes'] / 2**20:.1f} MiB of float32 vectors"
+        )
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,320 @@
+import json
+import os
+import shutil
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Approximate nearest-neighbor index kept next to vectors.npy in a numpy vector store
+ANN_DIRNAME = "ann"
+ANN_FORMAT_VERSION = 1
+QUANTIZATIONS = ("pq", "int8")
+# Query-time knobs: inverted lists scanned per query, and candidates re-scored exactly
+ANN_NPROBE_ENV_VAR = "GOVERNANCE_ANN_NPROBE"
+ANN_RERANK_ENV_VAR = "GOVERNANCE_ANN_RERANK"
+DEFAULT_NPROBE = 16
+DEFAULT_RERANK = 100
+
+KMEANS_ITERATIONS = 12
+# k-means trains on a sample of this many points per centroid (IVF) ...
+TRAIN_POINTS_PER_LIST = 64
+# ... and at least this many points (product quantizer codebooks)
+MIN_TRAIN_POINTS = 16384
+# PQ codebook size; codes are one uint8 per subspace
+PQ_CODEWORDS = 256
+# Rows per block when assigning and encoding, to bound temporary memory
+BLOCK_ROWS = 16384
+
+
+def default_nlist(rows: int) -> int:
+    """About sqrt(rows) inverted lists: ~1000 lists of ~1000 vectors at a million chunks."""
+    return max(1, min(rows, int(round(np.sqrt(rows)))))
+
+
+def default_subspaces(dim: int) -> int:
+    """PQ subspaces of (about) 16 dimensions: 96 one-byte codes for 1536-dim vectors."""
+    for subspaces in range(max(1, dim // 16), dim + 1):
+        if dim % subspaces == 0:
+            return subspaces
+    return dim
+
+
+def _nearest(data: np.ndarray, centroids: np.ndarray, spherical: bool) -> np.ndarray:
+    """Index of the closest centroid per row (highest dot product for unit vectors, else L2)."""
+    assignments = np.empty(len(data), dtype=np.int32)
+    sq_norms = None if spherical else (centroids * centroids).sum(axis=1)
+    for start in range(0, len(data), BLOCK_ROWS):
+        scores = np.asarray(data[start:start + BLOCK_ROWS], dtype=np.float32) @ centroids.T
+        if spherical:
+            assignments[start:start + len(scores)] = scores.argmax(axis=1)
+        else:
+            assignments[start:start + len(scores)] = (sq_norms - 2 * scores).argmin(axis=1)
+    return assignments
+
+
+def _kmeans(data: np.ndarray, k: int, iterations: int, rng: np.random.Generator, spherical: bool) -> np.ndarray:
+    k = min(k, len(data))
+    centroids = data[rng.choice(len(data), k, replace=False)].astype(np.float32)
+    for _ in range(iterations):
+        assignments = _nearest(data, centroids, spherical)
+        counts = np.bincount(assignments, minlength=k)
+        # Per-cluster sums in one pass over the rows sorted by cluster
+        order = np.argsort(assignments, kind="stable")
+        empty = counts == 0
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[~empty]
+        centroids = np.zeros_like(centroids)
+        centroids[~empty] = np.add.reduceat(data[order], starts, axis=0) / counts[~empty, None]
+        # Re-seed empty clusters with random points
+        if empty.any():
+            centroids[empty] = data[rng.choice(len(data), int(empty.sum()), replace=False)]
+        if spherical:
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            centroids /= np.where(norms == 0, 1.0, norms)
+    return centroids
+
+
+class Int8Quantizer:
+    """Per-dimension symmetric int8 scalar quantization (4x smaller than float32)."""
+
+    kind = "int8"
+
+    def __init__(self, scale: np.ndarray):
+        self.scale = scale.astype(np.float32)
+
+    @classmethod
+    def train(cls, sample: np.ndarray, **kwargs: Any) -> "Int8Quantizer":
+        scale = np.abs(sample).max(axis=0) / 127.0
+        return cls(np.where(scale == 0, 1.0, scale))
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.clip(np.rint(vectors / self.scale), -127, 127).astype(np.int8)
+
+    def score(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        return codes.astype(np.float32) @ (query * self.scale)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {"scale": self.scale}
+
+
+class ProductQuantizer:
+    """
+    Product quantization: each vector is split into subspaces and every
+    subvector is replaced by the index of its nearest codeword (one byte).
+    Dot products are estimated from a per-query lookup table (asymmetric
+    distance computation), so candidates are scored without decoding.
+    """
+
+    kind = "pq"
+
+    def __init__(self, codebooks: np.ndarray):
+        # (subspaces, codewords, subspace dim)
+        self.codebooks = codebooks.astype(np.float32)
+
+    @classmethod
+    def train(
+        cls, sample: np.ndarray, subspaces: Optional[int] = None, iterations: int = KMEANS_ITERATIONS,
+        rng: Optional[np.random.Generator] = None, **kwargs: Any,
+    ) -> "ProductQuantizer":
+        dim = sample.shape[1]
+        subspaces = subspaces or default_subspaces(dim)
+        if dim % subspaces:
+            raise ValueError(f"{subspaces} PQ subspaces do not divide the {dim} dimensions")
+        rng = rng or np.random.default_rng(0)
+        parts = sample.reshape(len(sample), subspaces, dim // subspaces)
+        codewords = min(PQ_CODEWORDS, len(sample))
+        codebooks = np.stack([
+            _kmeans(np.ascontiguousarray(parts[:, j]), codewords, iterations, rng, spherical=False)
+            for j in range(subspaces)
+        ])
+        return cls(codebooks)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        subspaces, _, width = self.codebooks.shape
+        parts = vectors.reshape(len(vectors), subspaces, width)
+        return np.stack(
+            [_nearest(np.ascontiguousarray(parts[:, j]), self.codebooks[j], spherical=False) for j in range(subspaces)],
+            axis=1,
+        ).astype(np.uint8)
+
+    def score(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        subspaces, _, width = self.codebooks.shape
+        # table[j, c] = <query subvector j, codeword c of subspace j>
+        table = np.einsum("jcw,jw->jc", self.codebooks, query.reshape(subspaces, width))
+        return table[np.arange(subspaces), codes].sum(axis=1)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {"codebooks": self.codebooks}
+
+
+QUANTIZERS = {"pq": ProductQuantizer, "int8": Int8Quantizer}
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index over the L2-normalized rows of a vector matrix.
+
+    Rows are partitioned by their nearest coarse centroid (spherical k-means)
+    and their residual from it is stored as a compact code (product-quantized
+    or int8) in row order. A
+    query scans the nprobe closest lists, scores their codes approximately,
+    and re-scores the best ``rerank`` candidates exactly against the float32
+    matrix, which can stay memory-mapped on disk: only the candidates' rows
+    are read. The index is immutable; ``update`` returns a new one.
+    """
+
+    def __init__(self, centroids: np.ndarray, assignments: np.ndarray, codes: np.ndarray, quantizer):
+        self.centroids = centroids
+        self.assignments = assignments
+        self.codes = codes
+        self.quantizer = quantizer
+        # Rows grouped by list: order[offsets[l]:offsets[l + 1]] are the rows of list l
+        self.order = np.argsort(assignments, kind="stable").astype(np.int32)
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=len(centroids)))])
+
+    def __len__(self) -> int:
+        return len(self.assignments)
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def train(
+        cls,
+        vectors: np.ndarray,
+        nlist: Optional[int] = None,
+        quantization: str = "pq",
+        subspaces: Optional[int] = None,
+        iterations: int = KMEANS_ITERATIONS,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """Train centroids and the quantizer on a sample, then assign and encode every row."""
+        if quantization not in QUANTIZERS:
+            raise ValueError(f"Unknown quantization '{quantization}'. Expected one of: {', '.join(QUANTIZERS)}")
+        rows = len(vectors)
+        if not rows:
+            raise ValueError("Cannot train an ANN index on an empty matrix")
+        nlist = min(nlist or default_nlist(rows), rows)
+        rng = np.random.default_rng(seed)
+        size = min(rows, max(nlist * TRAIN_POINTS_PER_LIST, MIN_TRAIN_POINTS))
+        sample = np.asarray(vectors[np.sort(rng.choice(rows, size, replace=False))], dtype=np.float32)
+
+        centroids = _kmeans(sample, nlist, iterations, rng, spherical=True)
+        # Codes encode the residual from the row's centroid, which varies far less than the row itself
+        residuals = sample - centroids[_nearest(sample, centroids, spherical=True)]
+        quantizer = QUANTIZERS[quantization].train(residuals, subspaces=subspaces, iterations=iterations, rng=rng)
+        index = cls(centroids, np.zeros(0, dtype=np.int32), np.zeros((0, 0), dtype=np.uint8), quantizer)
+        assignments, codes = index._assign_and_encode(vectors)
+        return cls(centroids, assignments, codes, quantizer)
+
+    def _assign_and_encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        assignments, codes = [], []
+        for start in range(0, len(vectors), BLOCK_ROWS):
+            block = np.asarray(vectors[start:start + BLOCK_ROWS], dtype=np.float32)
+            nearest = _nearest(block, self.centroids, spherical=True)
+            assignments.append(nearest)
+            codes.append(self.quantizer.encode(block - self.centroids[nearest]))
+        if not assignments:
+            return np.zeros(0, dtype=np.int32), self.codes[:0]
+        return np.concatenate(assignments), np.concatenate(codes)
+
+    def update(self, keep: np.ndarray, new_vectors: np.ndarray) -> "IVFIndex":
+        """
+        The index of a rewritten matrix: rows ``keep`` of the old one, then
+        ``new_vectors``. New rows are assigned and encoded with the existing
+        centroids and quantizer (retrain after large changes).
+        """
+        assignments, codes = self._assign_and_encode(new_vectors)
+        return IVFIndex(
+            self.centroids,
+            np.concatenate([self.assignments[keep], assignments]),
+            np.concatenate([np.asarray(self.codes[keep]), codes]),
+            self.quantizer,
+        )
+
+    def search(
+        self, query: np.ndarray, k: int, vectors: np.ndarray,
+        nprobe: int = DEFAULT_NPROBE, rerank: int = DEFAULT_RERANK, dead: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rows and dot-product scores of the (approximate) top k, best first.
+        rerank=0 returns the quantized scores without touching ``vectors``.
+        dead is a boolean mask of deleted rows, which are never returned.
+        """
+        nprobe = max(1, min(nprobe, self.nlist))
+        coarse = self.centroids @ query
+        lists = np.argpartition(-coarse, nprobe - 1)[:nprobe] if nprobe < self.nlist else np.arange(self.nlist)
+        rows = np.concatenate([self.order[self.offsets[l]:self.offsets[l + 1]] for l in lists])
+        if dead is not None:
+            rows = rows[~dead[rows]]
+        if not len(rows) or k <= 0:
+            return rows[:0], np.zeros(0, dtype=np.float32)
+
+        # <query, row> ~ <query, centroid> + <query, quantized residual>
+        approx = coarse[self.assignments[rows]] + self.quantizer.score(np.asarray(self.codes[rows]), query)
+        depth = min(max(rerank, k), len(rows))
+        top = np.argpartition(-approx, depth - 1)[:depth] if depth < len(rows) else np.arange(len(rows))
+        candidates = rows[top]
+        if rerank > 0:
+            # Sorted rows turn the re-scoring gather into forward reads of the memory map
+            candidates = np.sort(candidates)
+            scores = np.asarray(vectors[candidates], dtype=np.float32) @ query
+        else:
+            scores = approx[top]
+        best = np.argsort(-scores, kind="stable")[:k]
+        return candidates[best], scores[best]
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the index (codes, centroids, list layout), excluding the float32 matrix."""
+        return int(
+            self.codes.nbytes + self.centroids.nbytes + self.assignments.nbytes + self.order.nbytes
+            + sum(array.nbytes for array in self.quantizer.arrays().values())
+        )
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "rows": len(self),
+            "nlist": self.nlist,
+            "quantization": self.quantizer.kind,
+            "code_bytes_per_vector": int(self.codes.shape[1]) if self.codes.ndim == 2 else 0,
+            "memory_bytes": self.memory_bytes(),
+        }
+
+    def save(self, directory: str):
+        """Write the index to directory atomically (a temp directory swapped in by rename)."""
+        tmp_dir = f"{directory}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        arrays = {"centroids": self.centroids, "assignments": self.assignments, "codes": self.codes}
+        arrays.update(self.quantizer.arrays())
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.asarray(array))
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"version": ANN_FORMAT_VERSION, "quantization": self.quantizer.kind, "rows": len(self)}, f)
+        old_dir = f"{directory}.old"
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if os.path.exists(directory):
+            os.rename(directory, old_dir)
+        os.rename(tmp_dir, directory)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: str, rows: Optional[int] = None) -> Optional["IVFIndex"]:
+        """The saved index, or None if there is none or it does not cover exactly ``rows`` rows."""
+        meta_path = os.path.join(directory, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != ANN_FORMAT_VERSION or (rows is not None and meta.get("rows") != rows):
+            return None
+
+        def array(name, mmap_mode=None):
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+
+        if meta["quantization"] == "pq":
+            quantizer = ProductQuantizer(array("codebooks"))
+        else:
+            quantizer = Int8Quantizer(array("scale"))
+        # Codes are memory-mapped like the float32 matrix; the OS pages them in on first use
+        return cls(array("centroids"), array("assignments"), array("codes", mmap_mode="r"), quantizer)
@@ -0,0 +1,303 @@
+import hashlib
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+try:
+    from metrics import span
+    from sections import Section, find_section, outline
+except ImportError:
+    from .metrics import span
+    from .sections import Section, find_section, outline
+
+# Categories served through governance:// URIs
+CATEGORIES = ["workflows", "standards", "policies", "templates"]
+
+# Outline entries: level, title, anchor, line and byte ranges
+Heading = Section
+
+# Re-index attempts for a document that keeps changing while a range of it is read
+READ_ATTEMPTS = 3
+
+
+@dataclass
+class DocumentEntry:
+    """Metadata for one governance document, as indexed by the catalog."""
+
+    category: str
+    name: str
+    path: str
+    size: int
+    mtime: float
+    title: str
+    headings: List[Heading] = field(default_factory=list)
+    front_matter: Dict[str, Any] = field(default_factory=dict)
+    # Strong validator: hash of the content the outline and line index were built from
+    etag: str = ""
+    # Byte offset of the start of every line, plus the file size at the end
+    line_starts: array = field(default_factory=lambda: array("Q", [0]))
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts) - 1
+
+    @property
+    def uri(self) -> str:
+        return f"governance://{self.category}/{self.name}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "uri": self.uri,
+            "category": self.category,
+            "name": self.name,
+            "title": self.title,
+            "size": self.size,
+            "mtime": self.mtime,
+            "etag": self.etag,
+            "lines": self.line_count,
+            "headings": [h.title for h in self.headings],
+            "front_matter": self.front_matter,
+        }
+
+
+def parse_document(data: bytes) -> Tuple[str, List[Heading], Dict[str, Any]]:
+    """Extract the title, heading outline (skipping code fences) and YAML front matter of a markdown file."""
+    front_matter: Dict[str, Any] = {}
+    if data.startswith(b"---\n"):
+        end = data.find(b"\n---", 4)
+        if end != -1:
+            try:
+                loaded = yaml.safe_load(data[4:end].decode("utf-8", errors="replace"))
+                if isinstance(loaded, dict):
+                    front_matter = loaded
+            except yaml.YAMLError:
+                pass
+
+    headings = outline(data)
+    title = next((h.title for h in headings if h.level == 1), None)
+    title = front_matter.get("title") or title or ""
+    return str(title), headings, front_matter
+
+
+def line_index(data: bytes) -> array:
+    """Byte offset of the start of every line, followed by the total size."""
+    starts = array("Q", [0])
+    position = data.find(b"\n")
+    while position != -1:
+        starts.append(position + 1)
+        position = data.find(b"\n", position + 1)
+    if starts[-1] != len(data):
+        starts.append(len(data))
+    return starts
+
+
+class DocumentCatalog:
+    """
+    In-memory index of the governance documents with a bounded content cache.
+
+    Metadata for every document is built once; listings are served from a
+    precomputed list and contents from an LRU cache capped at ``max_bytes``.
+    Changes are picked up by mtime polling: at most once every
+    ``poll_interval`` seconds an access rescans the category directories and
+    invalidates the entries of added, changed or removed files.
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        categories: Optional[List[str]] = None,
+        max_bytes: int = 8 * 1024 * 1024,
+        poll_interval: float = 2.0,
+    ):
+        self.base_path = base_path
+        self.categories = categories or list(CATEGORIES)
+        self.max_bytes = max_bytes
+        self.poll_interval = poll_interval
+        self._entries: Dict[Tuple[str, str], DocumentEntry] = {}
+        self._uris: List[str] = []
+        self._contents: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.RLock()
+        self._last_scan = 0.0
+        self.stats = {"hits": 0, "misses": 0, "ranged_reads": 0, "invalidations": 0, "scans": 0}
+        self.refresh(force=True)
+
+    def _scan(self) -> Dict[Tuple[str, str], os.stat_result]:
+        found = {}
+        for category in self.categories:
+            cat_path = os.path.join(self.base_path, category)
+            if not os.path.isdir(cat_path):
+                continue
+            with os.scandir(cat_path) as it:
+                for entry in it:
+                    if entry.name.endswith(".md") and entry.is_file():
+                        found[(category, entry.name[:-3])] = entry.stat()
+        return found
+
+    def refresh(self, force: bool = False):
+        """Rescan the category directories if the poll interval has elapsed (or force is set)."""
+        now = time.monotonic()
+        if not force and now - self._last_scan < self.poll_interval:
+            return
+        with self._lock:
+            self._last_scan = now
+            self.stats["scans"] += 1
+            found = self._scan()
+            changed = False
+            for key in list(self._entries):
+                if key not in found:
+                    self._invalidate(key)
+                    del self._entries[key]
+                    changed = True
+            for key, stat in found.items():
+                entry = self._entries.get(key)
+                if entry and entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+                    continue
+                if entry:
+                    self._invalidate(key)
+                self._entries[key] = self._build_entry(key, stat)
+                changed = True
+            if changed:
+                self._uris = sorted(entry.uri for entry in self._entries.values())
+
+    def _build_entry(self, key: Tuple[str, str], stat: os.stat_result) -> DocumentEntry:
+        category, name = key
+        path = os.path.join(self.base_path, category, f"{name}.md")
+        with span("file_read"), open(path, "rb") as f:
+            data = f.read()
+        title, headings, front_matter = parse_document(data)
+        self._store(key, data)
+        return DocumentEntry(
+            category, name, path, len(data), stat.st_mtime, title, headings, front_matter,
+            etag=f'"{hashlib.sha256(data).hexdigest()[:20]}"',
+            line_starts=line_index(data),
+        )
+
+    def _invalidate(self, key: Tuple[str, str]):
+        data = self._contents.pop(key, None)
+        if data is not None:
+            self._cached_bytes -= len(data)
+        self.stats["invalidations"] += 1
+
+    def _store(self, key: Tuple[str, str], data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        previous = self._contents.pop(key, None)
+        if previous is not None:
+            self._cached_bytes -= len(previous)
+        self._contents[key] = data
+        self._cached_bytes += len(data)
+        while self._cached_bytes > self.max_bytes:
+            _, evicted = self._contents.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+
+    def list_uris(self) -> List[str]:
+        """All document URIs, from the precomputed listing."""
+        self.refresh()
+        return list(self._uris)
+
+    def entries(self) -> List[DocumentEntry]:
+        self.refresh()
+        return sorted(self._entries.values(), key=lambda e: e.uri)
+
+    def get(self, category: str, name: str) -> Optional[DocumentEntry]:
+        self.refresh()
+        return self._entries.get((category, name))
+
+    def read_bytes(self, category: str, name: str) -> Optional[bytes]:
+        """Raw document content, from memory after first access; None if the document does not exist."""
+        self.refresh()
+        key = (category, name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data = self._contents.get(key)
+            if data is not None:
+                self._contents.move_to_end(key)
+                self.stats["hits"] += 1
+                return data
+            self.stats["misses"] += 1
+            with span("file_read"), open(entry.path, "rb") as f:
+                data = f.read()
+            self._store(key, data)
+            return data
+
+    def read(self, category: str, name: str) -> Optional[str]:
+        data = self.read_bytes(category, name)
+        return data.decode("utf-8") if data is not None else None
+
+    def read_range(self, category: str, name: str, start: int, end: int) -> Optional[Tuple[DocumentEntry, bytes]]:
+        """
+        Bytes [start, end) of a document and the entry they belong to. Served from
+        the content cache when the document is cached, otherwise with a seek and a
+        bounded read, so large documents are never loaded whole.
+        """
+        self.refresh()
+        key = (category, name)
+        for _ in range(READ_ATTEMPTS):
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    return None
+                lo, hi = max(0, start), min(end, entry.size)
+                data = self._contents.get(key)
+                if data is not None:
+                    self._contents.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry, data[lo:hi]
+            stat = os.stat(entry.path)
+            if stat.st_mtime == entry.mtime and stat.st_size == entry.size:
+                self.stats["ranged_reads"] += 1
+                with span("file_read"), open(entry.path, "rb") as f:
+                    f.seek(lo)
+                    return entry, f.read(max(0, hi - lo))
+            # Changed since the offsets were computed: re-index it before slicing
+            self.refresh(force=True)
+        raise RuntimeError(f"{category}/{name} kept changing while it was read")
+
+    def line_range(self, entry: DocumentEntry, start_line: int, end_line: Optional[int] = None) -> Tuple[int, int]:
+        """Byte range of lines start_line..end_line (1-based, inclusive; end defaults to the last line)."""
+        last = entry.line_count
+        start_line = min(max(1, start_line), last + 1)
+        end_line = last if end_line is None else min(max(start_line, end_line), last)
+        return entry.line_starts[start_line - 1], entry.line_starts[end_line]
+
+    def line_at(self, entry: DocumentEntry, offset: int) -> int:
+        """1-based line containing a byte offset."""
+        return max(1, bisect_right(entry.line_starts, offset) if offset < entry.size else entry.line_count)
+
+    def read_section(self, category: str, name: str, section: str) -> Optional[Tuple[Section, str]]:
+        """
+        One section (with its subsections) of a document, located through the
+        precomputed outline by anchor, title or path; None if either is missing.
+        """
+        for _ in range(READ_ATTEMPTS):
+            entry = self.get(category, name)
+            found = find_section(entry.headings, section) if entry else None
+            if found is None:
+                return None
+            result = self.read_range(category, name, found.offset, found.end_offset)
+            if result is None:
+                return None
+            if result[0] is entry:
+                return found, result[1].decode("utf-8", errors="replace")
+            # The document changed under us; resolve the section against the new outline
+        raise RuntimeError(f"{category}/{name} kept changing while it was read")
+
+    def cache_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "documents": len(self._entries),
+                "cached_documents": len(self._contents),
+                "cached_bytes": self._cached_bytes,
+                "max_bytes": self.max_bytes,
+            }
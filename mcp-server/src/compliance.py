@@ -0,0 +1,654 @@
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import yaml
+
+try:
+    from conventions import COMMIT_SCAN_WORKERS_ENV_VAR, ConventionRules, ConventionScanner, ConventionStore, read_git_head
+    from history import ComplianceHistory
+except ImportError:
+    from .conventions import COMMIT_SCAN_WORKERS_ENV_VAR, ConventionRules, ConventionScanner, ConventionStore, read_git_head
+    from .history import ComplianceHistory
+
+# Default locations, relative to the governance repo root
+RULES_PATH = os.path.join("github-settings", "branch-protection-rules.yaml")
+
+# Selects where repository snapshots come from: a fixture JSON file shaped like
+# the GitHub API, or a directory of local repository clones.
+COMPLIANCE_SOURCE_ENV_VAR = "GOVERNANCE_COMPLIANCE_SOURCE"
+# SQLite file holding per-repository results between runs
+COMPLIANCE_DB_ENV_VAR = "GOVERNANCE_COMPLIANCE_DB"
+COMPLIANCE_DB_FILENAME = "compliance.sqlite"
+
+# Severity levels from roles/compliance-checker and the health score penalty for each
+SEVERITY_PENALTIES = {"P0": 40, "P1": 15, "P2": 5, "P3": 1}
+
+# Rule catalogue: id -> (severity, remediation)
+RULES = {
+    "branch-protection-missing": ("P0", "Enable branch protection as defined in branch-protection-rules.yaml."),
+    "required-reviews": ("P1", "Raise the required approving review count."),
+    "dismiss-stale-reviews": ("P1", "Enable dismissal of stale reviews on new pushes."),
+    "code-owner-reviews": ("P1", "Require review from code owners."),
+    "required-status-checks": ("P1", "Add the missing required status checks."),
+    "strict-status-checks": ("P1", "Require branches to be up to date before merging."),
+    "enforce-admins": ("P1", "Apply branch protection to administrators."),
+    "force-pushes-allowed": ("P1", "Disallow force pushes."),
+    "deletions-allowed": ("P1", "Disallow branch deletion."),
+    "linear-history": ("P2", "Require linear history."),
+    "conversation-resolution": ("P2", "Require all PR conversations to be resolved before merging."),
+    "pre-commit-hook-missing": ("P1", "Run scripts/onboard-repo.sh to install the governance pre-commit hook."),
+    "codeowners-missing": ("P2", "Add a CODEOWNERS file; code owner reviews are required."),
+    "contributing-missing": ("P2", "Add a CONTRIBUTING.md."),
+    "pr-template-missing": ("P3", "Add .github/pull_request_template.md from templates/pull-request-template.md."),
+    "readme-missing": ("P3", "Add a README.md."),
+    # From the git history of local clones (see conventions.py)
+    "commit-message-format": ("P2", "Write commit subjects as <type>(<scope>): <description> (standards/conventional-commits.md)."),
+    "commit-description-style": ("P3", "Start commit descriptions in lower case, without a trailing period."),
+    "commit-description-length": ("P3", "Keep commit descriptions within the length limit of the commit standard."),
+    "branch-naming": ("P2", "Name branches <type>/<name> as in workflows/git-branching-strategy.md."),
+}
+
+# Files looked for in each repository (and where)
+FILE_CANDIDATES = {
+    "readme": ["README.md"],
+    "contributing": ["CONTRIBUTING.md", ".github/CONTRIBUTING.md", "docs/CONTRIBUTING.md"],
+    "codeowners": ["CODEOWNERS", ".github/CODEOWNERS", "docs/CODEOWNERS"],
+    "pr_template": [
+        ".github/pull_request_template.md",
+        ".github/PULL_REQUEST_TEMPLATE.md",
+        "pull_request_template.md",
+        "docs/pull_request_template.md",
+    ],
+}
+
+
+@dataclass
+class Violation:
+    rule: str
+    severity: str
+    message: str
+    branch: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"rule": self.rule, "severity": self.severity, "message": self.message, "branch": self.branch}
+
+
+@dataclass
+class RepoSnapshot:
+    """What the engine knows about one repository: branch protection settings and key files."""
+
+    name: str
+    # branch -> protection settings; None means the branch exists but is unprotected.
+    # The mapping itself is None when protection is unknown (a clone without an export)
+    branches: Optional[Dict[str, Optional[Dict[str, Any]]]] = field(default_factory=dict)
+    files: Set[str] = field(default_factory=set)
+    head: Optional[str] = None
+    # None when unknown (e.g. fixture data without hook information)
+    pre_commit_hook: Optional[bool] = None
+    # (rule, message) pairs from the commit history and branch name scan
+    conventions: List[Tuple[str, str]] = field(default_factory=list)
+
+    def fingerprint(self) -> str:
+        """Hash of everything the evaluation depends on."""
+        payload = json.dumps(
+            {
+                "branches": self.branches,
+                "files": sorted(self.files),
+                "head": self.head,
+                "pre_commit_hook": self.pre_commit_hook,
+                "conventions": self.conventions,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class RepoResult:
+    name: str
+    violations: List[Violation]
+    # checks that could not be evaluated because the source lacks the data
+    unknown: List[str] = field(default_factory=list)
+
+    @property
+    def compliant(self) -> bool:
+        return not self.violations
+
+    @property
+    def score(self) -> int:
+        return max(0, 100 - sum(SEVERITY_PENALTIES[v.severity] for v in self.violations))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "compliant": self.compliant,
+            "score": self.score,
+            "issues": [v.message for v in self.violations],
+            "violations": [v.to_dict() for v in self.violations],
+            "unknown": list(self.unknown),
+        }
+
+
+def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class RuleSet:
+    """
+    Branch protection rules from branch-protection-rules.yaml, with per-repo overrides and exceptions.
+
+    The version combines the file's hash with the exceptions active today, so
+    cached results are re-evaluated when an exception expires.
+    """
+
+    def __init__(self, config: Dict[str, Any], version: str, today: Optional[datetime.date] = None):
+        self.config = config
+        self.today = today or datetime.date.today()
+        self._overrides = {repo["name"]: repo.get("branches", {}) for repo in config.get("repositories") or []}
+        self._exceptions: Dict[str, List[Dict[str, Any]]] = {}
+        for exception in config.get("exceptions") or []:
+            if self._active(exception):
+                self._exceptions.setdefault(exception["repository"], []).append(exception)
+        active = sorted(
+            f"{repo}:{exception.get('branch')}:{exception.get('expires')}"
+            for repo, exceptions in self._exceptions.items()
+            for exception in exceptions
+        )
+        self.version = f"{version}-{hashlib.sha256(json.dumps(active).encode('utf-8')).hexdigest()[:8]}"
+
+    def _active(self, exception: Dict[str, Any]) -> bool:
+        expires = exception.get("expires")
+        return not expires or datetime.date.fromisoformat(str(expires)) >= self.today
+
+    @classmethod
+    def load(cls, path: str, today: Optional[datetime.date] = None) -> "RuleSet":
+        with open(path, "rb") as f:
+            raw = f.read()
+        config = yaml.safe_load(raw) or {}
+        return cls(config, hashlib.sha256(raw).hexdigest()[:16], today=today)
+
+    def branch_rules(self, repo_name: str) -> Dict[str, Dict[str, Any]]:
+        """Effective protection rules per branch for a repository."""
+        rules = {}
+        for branch, settings in (self.config.get("branches") or {}).items():
+            protection = settings.get("protection") or {}
+            override = (self._overrides.get(repo_name, {}).get(branch) or {}).get("protection")
+            if override:
+                protection = _deep_merge(protection, override)
+            for exception in self._exceptions.get(repo_name, []):
+                if exception.get("branch") != branch:
+                    continue
+                protection = _deep_merge(protection, exception.get("override") or {})
+            rules[branch] = protection
+        return rules
+
+
+def _enabled(value: Any) -> bool:
+    """Settings are plain booleans in our YAML and {"enabled": bool} objects in the GitHub API."""
+    if isinstance(value, dict):
+        return bool(value.get("enabled"))
+    return bool(value)
+
+
+def _status_contexts(checks: Optional[Dict[str, Any]]) -> Set[str]:
+    if not checks:
+        return set()
+    contexts = set(checks.get("contexts") or [])
+    contexts.update(check["context"] for check in checks.get("checks") or [] if check.get("context"))
+    return contexts
+
+
+def _check_branch(branch: str, desired: Dict[str, Any], actual: Optional[Dict[str, Any]]) -> List[Violation]:
+    def violation(rule: str, message: str) -> Violation:
+        return Violation(rule, RULES[rule][0], f"{message} on '{branch}'", branch)
+
+    if actual is None:
+        return [violation("branch-protection-missing", "Missing branch protection")]
+
+    violations = []
+    wanted_reviews = desired.get("required_pull_request_reviews")
+    if wanted_reviews:
+        reviews = actual.get("required_pull_request_reviews") or {}
+        wanted = wanted_reviews.get("required_approving_review_count", 0)
+        have = reviews.get("required_approving_review_count", 0)
+        if have < wanted:
+            violations.append(violation("required-reviews", f"Requires {have} approving review(s), expected {wanted}"))
+        if wanted_reviews.get("dismiss_stale_reviews") and not reviews.get("dismiss_stale_reviews"):
+            violations.append(violation("dismiss-stale-reviews", "Stale reviews are not dismissed"))
+        if wanted_reviews.get("require_code_owner_reviews") and not reviews.get("require_code_owner_reviews"):
+            violations.append(violation("code-owner-reviews", "Code owner review not required"))
+
+    wanted_checks = desired.get("required_status_checks")
+    if wanted_checks:
+        checks = actual.get("required_status_checks") or {}
+        missing = sorted(_status_contexts(wanted_checks) - _status_contexts(checks))
+        if missing:
+            violations.append(violation("required-status-checks", f"Missing required checks {', '.join(missing)}"))
+        if wanted_checks.get("strict") and not checks.get("strict"):
+            violations.append(violation("strict-status-checks", "Branches need not be up to date before merging"))
+
+    if desired.get("enforce_admins") and not _enabled(actual.get("enforce_admins")):
+        violations.append(violation("enforce-admins", "Protection not enforced for admins"))
+    if desired.get("allow_force_pushes") is False and _enabled(actual.get("allow_force_pushes")):
+        violations.append(violation("force-pushes-allowed", "Force pushes allowed"))
+    if desired.get("allow_deletions") is False and _enabled(actual.get("allow_deletions")):
+        violations.append(violation("deletions-allowed", "Branch deletion allowed"))
+    if desired.get("required_linear_history") and not _enabled(actual.get("required_linear_history")):
+        violations.append(violation("linear-history", "Linear history not required"))
+    if desired.get("required_conversation_resolution") and not _enabled(actual.get("required_conversation_resolution")):
+        violations.append(violation("conversation-resolution", "Conversation resolution not required"))
+    return violations
+
+
+def _has_file(snapshot: RepoSnapshot, kind: str) -> bool:
+    return any(path in snapshot.files for path in FILE_CANDIDATES[kind])
+
+
+def evaluate_repository(snapshot: RepoSnapshot, rules: RuleSet) -> RepoResult:
+    """Check one repository against the branch protection rules and repository standards."""
+    violations: List[Violation] = []
+    unknown: List[str] = []
+    branch_rules = rules.branch_rules(snapshot.name)
+    if snapshot.branches is None:
+        unknown.append("branch-protection")
+    else:
+        for branch, desired in branch_rules.items():
+            if branch == "main" or branch in snapshot.branches:
+                violations.extend(_check_branch(branch, desired, snapshot.branches.get(branch)))
+
+    def file_violation(rule: str, message: str):
+        violations.append(Violation(rule, RULES[rule][0], message))
+
+    if snapshot.pre_commit_hook is False:
+        file_violation("pre-commit-hook-missing", "Governance pre-commit hook not installed")
+    requires_owners = any(
+        (desired.get("required_pull_request_reviews") or {}).get("require_code_owner_reviews")
+        for desired in branch_rules.values()
+    )
+    if requires_owners and not _has_file(snapshot, "codeowners"):
+        file_violation("codeowners-missing", "Missing CODEOWNERS")
+    if not _has_file(snapshot, "contributing"):
+        file_violation("contributing-missing", "Missing CONTRIBUTING.md")
+    if not _has_file(snapshot, "pr_template"):
+        file_violation("pr-template-missing", "Missing pull request template")
+    if not _has_file(snapshot, "readme"):
+        file_violation("readme-missing", "Missing README.md")
+    for rule, message in snapshot.conventions:
+        file_violation(rule, message)
+    return RepoResult(snapshot.name, violations, unknown)
+
+
+class FixtureSource:
+    """
+    Repository snapshots from a JSON file standing in for the GitHub API:
+    {"repositories": [{"name", "head", "branches": {branch: {"protection": {...} | null}}, "files", "pre_commit_hook"}]}
+    """
+
+    def __init__(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            self._repos = {repo["name"]: repo for repo in json.load(f).get("repositories", [])}
+
+    def list_repositories(self) -> List[str]:
+        return sorted(self._repos)
+
+    def load(self, name: str) -> RepoSnapshot:
+        repo = self._repos[name]
+        return RepoSnapshot(
+            name=name,
+            branches={branch: (data or {}).get("protection") for branch, data in (repo.get("branches") or {}).items()},
+            files=set(repo.get("files") or []),
+            head=repo.get("head"),
+            pre_commit_hook=repo.get("pre_commit_hook"),
+        )
+
+
+class LocalCloneSource:
+    """
+    Repository snapshots from a directory of local clones (one subdirectory per repo).
+
+    Branch protection is read from an exported ``.github/branch-protection.json``
+    ({branch: {"protection": {...} | null}}); without it, protection is unknown
+    and the branch protection checks are skipped (listed under ``unknown`` in
+    the result) rather than reported as violations. With a ConventionStore, the commit
+    message and branch naming violations of its last scan are included.
+    """
+
+    def __init__(self, root: str, conventions: Optional[ConventionStore] = None):
+        self.root = root
+        self.conventions = conventions
+
+    def list_repositories(self) -> List[str]:
+        return sorted(
+            entry.name for entry in os.scandir(self.root)
+            if entry.is_dir() and not entry.name.startswith(".")
+        )
+
+    def load(self, name: str) -> RepoSnapshot:
+        path = os.path.join(self.root, name)
+        files = {
+            candidate
+            for candidates in FILE_CANDIDATES.values()
+            for candidate in candidates
+            if os.path.isfile(os.path.join(path, candidate))
+        }
+        branches = None
+        settings_path = os.path.join(path, ".github", "branch-protection.json")
+        if os.path.exists(settings_path):
+            with open(settings_path, "r", encoding="utf-8") as f:
+                branches = {branch: (data or {}).get("protection") for branch, data in json.load(f).items()}
+        git_dir = os.path.join(path, ".git")
+        return RepoSnapshot(
+            name=name,
+            branches=branches,
+            files=files,
+            head=read_git_head(path),
+            pre_commit_hook=os.path.isfile(os.path.join(git_dir, "hooks", "pre-commit")) if os.path.isdir(git_dir) else None,
+            conventions=self.conventions.violations(name) if self.conventions is not None else [],
+        )
+
+
+def open_source(location: str, conventions: Optional[ConventionStore] = None):
+    """
+    A FixtureSource for a .json file, otherwise a LocalCloneSource for a
+    directory (with the scan results in ``conventions``, if given).
+    """
+    return FixtureSource(location) if location.endswith(".json") else LocalCloneSource(location, conventions)
+
+
+RESULT_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    repo TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    ruleset TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    violations INTEGER NOT NULL,
+    compliant INTEGER NOT NULL,
+    rules TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS aggregates (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS rule_counts (rule TEXT PRIMARY KEY, count INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS repo_rules (rule TEXT NOT NULL, repo TEXT NOT NULL, PRIMARY KEY (rule, repo));
+"""
+
+AGGREGATE_KEYS = ("total", "compliant", "violations", "score_total")
+
+
+class ResultStore:
+    """
+    Persistent per-repository compliance results (SQLite).
+
+    Each row is keyed on the snapshot fingerprint (head commit, settings and files)
+    and the rule set version, so unchanged repositories are not re-evaluated.
+    Org-wide aggregates and per-rule counts are adjusted by the difference between
+    a repository's old and new result instead of being recomputed.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(RESULT_STORE_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def fingerprints(self) -> Dict[str, Tuple[str, str]]:
+        """repo -> (snapshot fingerprint, rule set version) of every stored result."""
+        with self._lock:
+            rows = self._conn.execute("SELECT repo, fingerprint, ruleset FROM results").fetchall()
+        return {repo: (fingerprint, ruleset) for repo, fingerprint, ruleset in rows}
+
+    def _adjust(self, row: Tuple[int, int, int, str], sign: int):
+        score, violations, compliant, rules = row
+        for key, value in zip(AGGREGATE_KEYS, (1, compliant, violations, score)):
+            self._conn.execute(
+                "INSERT INTO aggregates (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+                (key, sign * value),
+            )
+        for rule in json.loads(rules):
+            self._conn.execute(
+                "INSERT INTO rule_counts (rule, count) VALUES (?, ?) "
+                "ON CONFLICT(rule) DO UPDATE SET count = count + excluded.count",
+                (rule, sign),
+            )
+
+    def _remove(self, repo: str):
+        row = self._conn.execute(
+            "SELECT score, violations, compliant, rules FROM results WHERE repo = ?", (repo,)
+        ).fetchone()
+        if row is None:
+            return
+        self._adjust(row, -1)
+        self._conn.execute("DELETE FROM results WHERE repo = ?", (repo,))
+        self._conn.execute("DELETE FROM repo_rules WHERE repo = ?", (repo,))
+
+    def apply(self, results: Iterable[Tuple[str, RepoResult]], removed: Iterable[str], ruleset: str):
+        """Store new ``(fingerprint, result)`` pairs and drop removed repos, in one transaction."""
+        with self._lock, self._conn:
+            for repo in removed:
+                self._remove(repo)
+            for fingerprint, result in results:
+                self._remove(result.name)
+                rules = sorted({v.rule for v in result.violations})
+                row = (result.score, len(result.violations), int(result.compliant), json.dumps(rules))
+                self._conn.execute(
+                    "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (result.name, fingerprint, ruleset, *row, json.dumps(result.to_dict())),
+                )
+                self._conn.executemany(
+                    "INSERT INTO repo_rules (rule, repo) VALUES (?, ?)", [(rule, result.name) for rule in rules]
+                )
+                self._adjust(row, 1)
+            self._conn.execute("DELETE FROM rule_counts WHERE count <= 0")
+
+    def summary(self, top_rules: int = 5) -> Dict[str, Any]:
+        """Report data without the repository rows, read from the maintained aggregates."""
+        with self._lock:
+            totals = dict.fromkeys(AGGREGATE_KEYS, 0)
+            totals.update(self._conn.execute("SELECT key, value FROM aggregates").fetchall())
+            rule_counts = dict(self._conn.execute("SELECT rule, count FROM rule_counts").fetchall())
+            rule_examples = {
+                rule: [repo for (repo,) in self._conn.execute(
+                    "SELECT repo FROM repo_rules WHERE rule = ? ORDER BY repo LIMIT 3", (rule,)
+                )]
+                for rule in rule_counts
+            }
+        total = totals["total"]
+        return {
+            "health_score": round(totals["score_total"] / total) if total else 100,
+            "active_violations": totals["violations"],
+            "compliant_repos": totals["compliant"],
+            "total_repos": total,
+            "rule_counts": rule_counts,
+            "recommendations": recommendations_for(rule_counts, rule_examples, top_rules),
+        }
+
+    def iter_results(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stored repository results in name order, streamed from the database.
+        Reads on a connection of their own (a consistent WAL snapshot), so a
+        slow consumer never holds up writers.
+        """
+        conn = sqlite3.connect(self.path)
+        try:
+            for (payload,) in conn.execute("SELECT payload FROM results ORDER BY repo"):
+                yield json.loads(payload)
+        finally:
+            conn.close()
+
+
+class ComplianceEngine:
+    """
+    Evaluates every repository from a snapshot source concurrently and aggregates the results.
+
+    With a ResultStore, only repositories whose snapshot fingerprint or the rule
+    set version changed since the last run are re-evaluated.
+    """
+
+    def __init__(self, rules: RuleSet, source, max_workers: int = 16, store: Optional[ResultStore] = None):
+        self.rules = rules
+        self.source = source
+        self.max_workers = max_workers
+        self.store = store
+        self.last_refresh: Dict[str, int] = {}
+
+    def _evaluate(self, name: str) -> RepoResult:
+        return evaluate_repository(self.source.load(name), self.rules)
+
+    def evaluate_all(self) -> Iterator[RepoResult]:
+        """Yield results in repository order, loading and checking repos on a thread pool."""
+        names = self.source.list_repositories()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from executor.map(self._evaluate, names)
+
+    def refresh(self) -> Dict[str, int]:
+        """Re-evaluate changed repositories into the store; returns evaluated/unchanged/removed counts."""
+        known = self.store.fingerprints()
+        names = self.source.list_repositories()
+
+        def check(name: str) -> Tuple[str, Optional[RepoResult]]:
+            snapshot = self.source.load(name)
+            fingerprint = snapshot.fingerprint()
+            if known.get(name) == (fingerprint, self.rules.version):
+                return fingerprint, None
+            return fingerprint, evaluate_repository(snapshot, self.rules)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            changed = [(fingerprint, result) for fingerprint, result in executor.map(check, names) if result]
+        removed = set(known) - set(names)
+        self.store.apply(changed, removed, self.rules.version)
+        self.last_refresh = {"evaluated": len(changed), "unchanged": len(names) - len(changed), "removed": len(removed)}
+        return self.last_refresh
+
+    def report_data(self) -> Dict[str, Any]:
+        """
+        Evaluate everything and return report data in the shape ComplianceReporter
+        expects. With a store, "repositories" is a generator streamed from it.
+        """
+        if self.store is None:
+            return summarize(self.evaluate_all())
+        self.refresh()
+        data = self.store.summary()
+        data["repositories"] = self.store.iter_results()
+        return data
+
+
+def summarize(results: Iterable[RepoResult], top_rules: int = 5) -> Dict[str, Any]:
+    """Aggregate repo results in one pass: health score, violation counts and recommendations."""
+    repositories = []
+    rule_counts: Dict[str, int] = {}
+    rule_examples: Dict[str, List[str]] = {}
+    score_total = 0
+    violations = 0
+    compliant = 0
+    for result in results:
+        repositories.append(result.to_dict())
+        score_total += result.score
+        violations += len(result.violations)
+        compliant += result.compliant
+        for rule in {v.rule for v in result.violations}:
+            rule_counts[rule] = rule_counts.get(rule, 0) + 1
+            examples = rule_examples.setdefault(rule, [])
+            if len(examples) < 3:
+                examples.append(result.name)
+
+    return {
+        "health_score": round(score_total / len(repositories)) if repositories else 100,
+        "active_violations": violations,
+        "compliant_repos": compliant,
+        "total_repos": len(repositories),
+        "repositories": repositories,
+        "rule_counts": rule_counts,
+        "recommendations": recommendations_for(rule_counts, rule_examples, top_rules),
+    }
+
+
+def recommendations_for(rule_counts: Dict[str, int], rule_examples: Dict[str, List[str]], top: int = 5) -> List[str]:
+    """One recommendation per most-violated rule, most severe first."""
+    ranked = sorted(rule_counts, key=lambda rule: (RULES[rule][0], -rule_counts[rule], rule))
+    recommendations = []
+    for rule in ranked[:top]:
+        examples = ", ".join(f"'{name}'" for name in rule_examples.get(rule, []))
+        more = "" if rule_counts[rule] <= len(rule_examples.get(rule, [])) else ", ..."
+        recommendations.append(
+            f"[{RULES[rule][0]}] {RULES[rule][1]} ({rule_counts[rule]} repo(s): {examples}{more})"
+        )
+    return recommendations
+
+
+def main():
+    import argparse
+    import sys
+
+    try:
+        from reporting import ComplianceReporter
+    except ImportError:
+        from .reporting import ComplianceReporter
+
+    parser = argparse.ArgumentParser(description="Evaluate repositories against the governance rules.")
+    parser.add_argument("source", help="Fixture JSON file or directory of local repository clones")
+    parser.add_argument("--rules", default=os.path.join(os.path.dirname(__file__), "../..", RULES_PATH))
+    parser.add_argument("--format", choices=ComplianceReporter.FORMATS, default="markdown")
+    parser.add_argument("--output", help="Write the report here instead of stdout")
+    parser.add_argument("--workers", type=int, default=16, help="Repositories evaluated concurrently")
+    parser.add_argument(
+        "--db", default=os.environ.get(COMPLIANCE_DB_ENV_VAR),
+        help="Result store for incremental runs; each run is also recorded in its compliance history",
+    )
+    parser.add_argument(
+        "--conventions", action="store_true",
+        help="Also check commit messages and branch names of local clones (incremental with --db)",
+    )
+    parser.add_argument("--scan-workers", type=int, help=f"History scan processes (default: {COMMIT_SCAN_WORKERS_ENV_VAR} or CPU count)")
+    args = parser.parse_args()
+
+    conventions = None
+    if args.conventions and not args.source.endswith(".json"):
+        conventions = ConventionStore(args.db or ":memory:")
+        governance_root = os.path.join(os.path.dirname(os.path.abspath(args.rules)), "..")
+        scanner = ConventionScanner(ConventionRules.load(governance_root), conventions, args.scan_workers)
+        stats = scanner.scan_directory(args.source)
+        print(f"Scanned the history of {stats['scanned']} repositories ({stats['commits']} new commits)", file=sys.stderr)
+    store = ResultStore(args.db) if args.db else None
+    source = open_source(args.source, conventions)
+    engine = ComplianceEngine(RuleSet.load(args.rules), source, max_workers=args.workers, store=store)
+    if store is not None:
+        stats = engine.refresh()
+        print(f"Evaluated {stats['evaluated']} repositories, {stats['unchanged']} unchanged", file=sys.stderr)
+        ComplianceHistory(args.db).record({**store.summary(), "repositories": store.iter_results()})
+        data = {**store.summary(), "repositories": store.iter_results()}
+    elif args.format == "csv":
+        # Rows only: stream results straight through without holding the whole org
+        data = {"repositories": (result.to_dict() for result in engine.evaluate_all())}
+    else:
+        data = engine.report_data()
+
+    stream = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        ComplianceReporter().write_report(data, stream, args.format)
+    finally:
+        if args.output:
+            stream.close()
+
+
+if __name__ == "__main__":
+    main()
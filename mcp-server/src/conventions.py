@@ -0,0 +1,450 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Commit message and branch naming checks over the git history of local clones.
+# This module stays light on imports so process-pool workers start quickly.
+
+# Standards the rules are read from, relative to the governance repo root
+COMMIT_STANDARD_PATH = os.path.join("standards", "conventional-commits.md")
+BRANCH_STANDARD_PATH = os.path.join("workflows", "git-branching-strategy.md")
+
+# Worker processes running `git log` (one repository per task)
+COMMIT_SCAN_WORKERS_ENV_VAR = "GOVERNANCE_COMMIT_SCAN_WORKERS"
+
+# Used when a standard cannot be read or parsed
+DEFAULT_COMMIT_TYPES = ("feat", "fix", "docs", "style", "refactor", "perf", "test", "chore", "ci", "build", "revert")
+DEFAULT_BRANCH_PREFIXES = ("feature", "feature-group", "epic", "fix", "bugfix", "hotfix", "chore", "docs", "refactor", "perf", "test")
+DEFAULT_MAX_DESCRIPTION = 72
+# Long-lived branches from the branching strategy; everything else needs a <type>/ prefix
+LONG_LIVED_BRANCHES = ("main", "development")
+
+# Offending commits or branches kept per repository and rule
+EXAMPLES_PER_RULE = 3
+EXAMPLE_SUBJECT_CHARS = 60
+
+COMMIT_RULES = ("commit-message-format", "commit-description-style", "commit-description-length")
+BRANCH_RULE = "branch-naming"
+
+# What the violation message says about the offending commits
+COMMIT_RULE_MESSAGES = {
+    "commit-message-format": "not in Conventional Commits format",
+    "commit-description-style": "with a capitalized description or a trailing period",
+    "commit-description-length": "with an over-long description",
+}
+
+
+def _section(text: str, heading: str) -> str:
+    """The body of a markdown section, up to the next heading of the same or a higher level."""
+    match = re.search(rf"^(#+) {re.escape(heading)}\s*$", text, re.MULTILINE)
+    if not match:
+        return ""
+    end = re.compile(rf"^#{{1,{len(match.group(1))}}} ", re.MULTILINE).search(text, match.end())
+    return text[match.end():end.start() if end else len(text)]
+
+
+class ConventionRules:
+    """
+    Commit subject and branch name rules, compiled into one regex each.
+
+    Loaded from standards/conventional-commits.md (the allowed types and the
+    description length) and workflows/git-branching-strategy.md (the branch
+    prefixes in its naming convention table). The version is a hash of the
+    parsed rules, so prose edits to the standards do not force a rescan.
+    """
+
+    def __init__(
+        self,
+        types: Sequence[str] = DEFAULT_COMMIT_TYPES,
+        branch_prefixes: Sequence[str] = DEFAULT_BRANCH_PREFIXES,
+        max_description: int = DEFAULT_MAX_DESCRIPTION,
+    ):
+        self.types = tuple(types)
+        self.branch_prefixes = tuple(branch_prefixes)
+        self.max_description = max_description
+        self.version = hashlib.sha256(
+            json.dumps([self.types, self.branch_prefixes, max_description, LONG_LIVED_BRANCHES]).encode("utf-8")
+        ).hexdigest()[:16]
+        type_pattern = "|".join(map(re.escape, self.types))
+        self._header = re.compile(rf"^(?:{type_pattern})(?:\([^()\s]+\))?!?: (?P<description>\S.*)$")
+        prefix_pattern = "|".join(map(re.escape, self.branch_prefixes))
+        long_lived = "|".join(map(re.escape, LONG_LIVED_BRANCHES))
+        self._branch = re.compile(rf"^(?:{long_lived}|(?:{prefix_pattern})/[a-z0-9]+(?:[-.][a-z0-9]+)*)$")
+
+    @classmethod
+    def load(cls, repo_root: str) -> "ConventionRules":
+        def read(relative_path: str) -> str:
+            try:
+                with open(os.path.join(repo_root, relative_path), "r", encoding="utf-8") as f:
+                    return f.read()
+            except OSError:
+                return ""
+
+        commits = read(COMMIT_STANDARD_PATH)
+        types = re.findall(r"^- \*\*([a-z]+)\*\*:", _section(commits, "Type"), re.MULTILINE)
+        length = re.search(r"Maximum (\d+) characters", _section(commits, "Description"))
+        branches = _section(read(BRANCH_STANDARD_PATH), "Naming Convention Reference")
+        prefixes = []
+        for row in branches.splitlines():
+            cells = row.split("|")
+            if len(cells) > 2:
+                prefixes += [p for p in re.findall(r"`([a-z][a-z-]*)/<name>`", cells[2]) if p not in prefixes]
+        return cls(
+            types or DEFAULT_COMMIT_TYPES,
+            prefixes or DEFAULT_BRANCH_PREFIXES,
+            int(length.group(1)) if length else DEFAULT_MAX_DESCRIPTION,
+        )
+
+    def check_subject(self, subject: str) -> List[str]:
+        """Rules a commit subject breaks (empty when it complies)."""
+        match = self._header.match(subject)
+        if match is None:
+            return ["commit-message-format"]
+        description = match.group("description")
+        broken = []
+        # "Add x" is capitalized; an acronym such as "API returns 404" is not
+        capitalized = description[0].isupper() and not description[1:2].isupper()
+        if capitalized or description.endswith("."):
+            broken.append("commit-description-style")
+        if len(description) > self.max_description:
+            broken.append("commit-description-length")
+        return broken
+
+    def branch_ok(self, branch: str) -> bool:
+        return self._branch.match(branch) is not None
+
+
+def read_git_head(repo_path: str) -> Optional[str]:
+    """Resolve HEAD of a local clone to a commit SHA without invoking git."""
+    git_dir = os.path.join(repo_path, ".git")
+    try:
+        with open(os.path.join(git_dir, "HEAD"), "r") as f:
+            head = f.read().strip()
+    except OSError:
+        return None
+    if not head.startswith("ref: "):
+        return head
+    ref = head[5:]
+    ref_path = os.path.join(git_dir, ref)
+    if os.path.exists(ref_path):
+        with open(ref_path, "r") as f:
+            return f.read().strip()
+    packed = os.path.join(git_dir, "packed-refs")
+    if os.path.exists(packed):
+        with open(packed, "r") as f:
+            for line in f:
+                parts = line.strip().split(" ")
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    return None
+
+
+def list_branches(repo_path: str) -> List[str]:
+    """Local and remote-tracking branch names of a clone (remote prefix stripped), without invoking git."""
+    git_dir = os.path.join(repo_path, ".git")
+    refs = set()
+    for namespace in ("refs/heads", "refs/remotes"):
+        root = os.path.join(git_dir, namespace)
+        for directory, _, files in os.walk(root):
+            for name in files:
+                refs.add(os.path.relpath(os.path.join(directory, name), git_dir).replace(os.sep, "/"))
+    try:
+        with open(os.path.join(git_dir, "packed-refs"), "r") as f:
+            for line in f:
+                parts = line.strip().split(" ")
+                if len(parts) == 2 and parts[1].startswith(("refs/heads/", "refs/remotes/")):
+                    refs.add(parts[1])
+    except OSError:
+        pass
+
+    branches = set()
+    for ref in refs:
+        if ref.startswith("refs/heads/"):
+            branches.add(ref[len("refs/heads/"):])
+        else:
+            # refs/remotes/<remote>/<branch>
+            parts = ref.split("/", 3)
+            if len(parts) == 4 and parts[3] != "HEAD":
+                branches.add(parts[3])
+    return sorted(branches)
+
+
+_worker_rules: Optional[ConventionRules] = None
+
+
+def _init_worker(rules: ConventionRules):
+    global _worker_rules
+    _worker_rules = rules
+
+
+def scan_history(path: str, since: Optional[str], head: str, rules: Optional[ConventionRules] = None) -> Dict[str, Any]:
+    """
+    Check the subjects of the non-merge commits reachable from ``head`` but
+    not from ``since`` (all of them without ``since``, or when ``since`` is
+    no longer an ancestor because history was rewritten). Streams ``git log``
+    so memory stays flat however long the history is.
+    """
+    rules = rules or _worker_rules
+    full = since is None
+    if since is not None:
+        ancestor = subprocess.run(
+            ["git", "-C", path, "merge-base", "--is-ancestor", since, head], capture_output=True
+        )
+        full = ancestor.returncode != 0
+    counts: Dict[str, int] = {}
+    examples: Dict[str, List[str]] = {}
+    commits = 0
+    # stderr goes to a file: a pipe nobody reads until stdout ends could fill up and stall git
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(
+            ["git", "-C", path, "log", "--no-merges", "--format=%h%x00%s", head if full else f"{since}..{head}"],
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+        with process.stdout:
+            for line in process.stdout:
+                sha, _, subject = line.rstrip("\n").partition("\0")
+                commits += 1
+                for rule in rules.check_subject(subject):
+                    counts[rule] = counts.get(rule, 0) + 1
+                    kept = examples.setdefault(rule, [])
+                    if len(kept) < EXAMPLES_PER_RULE:
+                        kept.append(f"{sha} {subject[:EXAMPLE_SUBJECT_CHARS]}")
+        returncode = process.wait()
+        stderr.seek(0)
+        error = stderr.read().decode("utf-8", errors="replace").strip()
+    if returncode != 0:
+        return {"head": head, "full": full, "commits": 0, "counts": {}, "examples": {}, "error": error or "git log failed"}
+    return {"head": head, "full": full, "commits": commits, "counts": counts, "examples": examples, "error": None}
+
+
+def _scan_task(task: Tuple[str, str, Optional[str], str]) -> Tuple[str, Dict[str, Any]]:
+    name, path, since, head = task
+    return name, scan_history(path, since, head)
+
+
+CONVENTION_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS convention_scans (
+    repo TEXT PRIMARY KEY,
+    head TEXT NOT NULL,
+    rules TEXT NOT NULL,
+    commits INTEGER NOT NULL,
+    scanned_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS convention_violations (
+    repo TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    examples TEXT NOT NULL,
+    PRIMARY KEY (repo, rule)
+);
+"""
+
+
+class ConventionStore:
+    """
+    Per-repository scan state (SQLite): the last scanned commit, the rule
+    version it was scanned with and the running commit count, plus violation
+    counts and a few examples per rule. Incremental scans add to the counts;
+    branch names are re-checked on every scan and replace their row.
+    """
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(CONVENTION_STORE_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def state(self) -> Dict[str, Tuple[str, str]]:
+        """repo -> (last scanned commit, rule version) of every scanned repository."""
+        with self._lock:
+            rows = self._conn.execute("SELECT repo, head, rules FROM convention_scans").fetchall()
+        return {repo: (head, rules) for repo, head, rules in rows}
+
+    def _add(self, repo: str, rule: str, count: int, examples: List[str]):
+        row = self._conn.execute(
+            "SELECT count, examples FROM convention_violations WHERE repo = ? AND rule = ?", (repo, rule)
+        ).fetchone()
+        if row is not None:
+            # Newest first: the new commits' examples go ahead of the kept ones
+            count += row[0]
+            examples = (examples + json.loads(row[1]))[:EXAMPLES_PER_RULE]
+        self._conn.execute(
+            "INSERT OR REPLACE INTO convention_violations VALUES (?, ?, ?, ?)", (repo, rule, count, json.dumps(examples))
+        )
+
+    def apply(
+        self,
+        scans: Iterable[Tuple[str, Dict[str, Any]]],
+        branches: Dict[str, List[str]],
+        removed: Iterable[str],
+        rules_version: str,
+    ):
+        """Record history scans, the offending branch names of every listed repo and removed repos, in one transaction."""
+        now = time.time()
+        with self._lock, self._conn:
+            for repo in removed:
+                self._conn.execute("DELETE FROM convention_scans WHERE repo = ?", (repo,))
+                self._conn.execute("DELETE FROM convention_violations WHERE repo = ?", (repo,))
+            for repo, scan in scans:
+                commits = scan["commits"]
+                if scan["full"]:
+                    self._conn.execute(
+                        f"DELETE FROM convention_violations WHERE repo = ? AND rule IN ({','.join('?' * len(COMMIT_RULES))})",
+                        (repo, *COMMIT_RULES),
+                    )
+                else:
+                    row = self._conn.execute("SELECT commits FROM convention_scans WHERE repo = ?", (repo,)).fetchone()
+                    commits += row[0] if row else 0
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO convention_scans VALUES (?, ?, ?, ?, ?)",
+                    (repo, scan["head"], rules_version, commits, now),
+                )
+                for rule, count in scan["counts"].items():
+                    self._add(repo, rule, count, scan["examples"][rule])
+            for repo, names in branches.items():
+                self._conn.execute("DELETE FROM convention_violations WHERE repo = ? AND rule = ?", (repo, BRANCH_RULE))
+                if names:
+                    self._add(repo, BRANCH_RULE, len(names), names[:EXAMPLES_PER_RULE])
+
+    def violations(self, repo: str) -> List[Tuple[str, str]]:
+        """``(rule, message)`` pairs for one repository, in rule order."""
+        with self._lock:
+            scanned = self._conn.execute("SELECT commits FROM convention_scans WHERE repo = ?", (repo,)).fetchone()
+            rows = self._conn.execute(
+                "SELECT rule, count, examples FROM convention_violations WHERE repo = ? ORDER BY rule", (repo,)
+            ).fetchall()
+        violations = []
+        for rule, count, examples in rows:
+            examples = json.loads(examples)
+            more = ", ..." if count > len(examples) else ""
+            if rule == BRANCH_RULE:
+                listed = ", ".join(f"'{name}'" for name in examples)
+                violations.append((rule, f"{count} branch name(s) outside the naming convention: {listed}{more}"))
+            else:
+                listed = "; ".join(f"'{example}'" for example in examples)
+                total = scanned[0] if scanned else count
+                violations.append((rule, f"{count} of {total} commit(s) {COMMIT_RULE_MESSAGES[rule]}: {listed}{more}"))
+        return violations
+
+    def totals(self) -> Dict[str, Any]:
+        """Org-wide counts: repositories and commits scanned, and violations per rule."""
+        with self._lock:
+            repos, commits = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(commits), 0) FROM convention_scans").fetchone()
+            rules = dict(self._conn.execute(
+                "SELECT rule, SUM(count) FROM convention_violations GROUP BY rule ORDER BY rule"
+            ).fetchall())
+        return {"repositories": repos, "commits": commits, "violations": rules}
+
+
+class ConventionScanner:
+    """
+    Scans the commit history and branch names of many local clones.
+
+    Each repository's HEAD and branches are read from .git without running
+    git, so a repository whose HEAD is the last scanned commit costs a few
+    file reads. The others are scanned on a process pool, one repository per
+    task, from the last scanned commit onwards (from the start if the rules
+    changed or history was rewritten).
+    """
+
+    def __init__(self, rules: ConventionRules, store: ConventionStore, max_workers: Optional[int] = None):
+        self.rules = rules
+        self.store = store
+        self.max_workers = max_workers or int(os.environ.get(COMMIT_SCAN_WORKERS_ENV_VAR) or os.cpu_count() or 1)
+        self.last_scan: Dict[str, Any] = {}
+
+    def scan(self, repos: Dict[str, str]) -> Dict[str, Any]:
+        """Scan ``{name: clone path}``; returns scanned/unchanged/removed/failed repo counts and new commits."""
+        known = self.store.state()
+        tasks = []
+        branches = {}
+        for name, path in sorted(repos.items()):
+            branches[name] = [branch for branch in list_branches(path) if not self.rules.branch_ok(branch)]
+            head = read_git_head(path)
+            last = known.get(name)
+            if head is None or last == (head, self.rules.version):
+                continue
+            since = last[0] if last and last[1] == self.rules.version else None
+            tasks.append((name, path, since, head))
+
+        scans = []
+        failed = {}
+        if tasks:
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(tasks)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.rules,),
+            ) as pool:
+                for name, scan in pool.map(_scan_task, tasks):
+                    if scan["error"]:
+                        failed[name] = scan["error"]
+                    else:
+                        scans.append((name, scan))
+        removed = set(known) - set(repos)
+        self.store.apply(scans, branches, removed, self.rules.version)
+        self.last_scan = {
+            "scanned": len(scans),
+            "unchanged": len(repos) - len(tasks),
+            "removed": len(removed),
+            "failed": failed,
+            "commits": sum(scan["commits"] for _, scan in scans),
+        }
+        return self.last_scan
+
+    def scan_directory(self, root: str) -> Dict[str, Any]:
+        """Scan every clone in a directory of local clones (one subdirectory per repository)."""
+        return self.scan({
+            entry.name: entry.path for entry in os.scandir(root)
+            if entry.is_dir() and not entry.name.startswith(".")
+        })
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check commit subjects and branch names of local clones.")
+    parser.add_argument("root", help="Directory of local repository clones")
+    parser.add_argument("--governance-root", default=os.path.join(os.path.dirname(__file__), "../.."))
+    parser.add_argument("--db", default=":memory:", help="Scan state for incremental runs")
+    parser.add_argument("--workers", type=int, help=f"Worker processes (default: {COMMIT_SCAN_WORKERS_ENV_VAR} or CPU count)")
+    args = parser.parse_args()
+
+    scanner = ConventionScanner(ConventionRules.load(args.governance_root), ConventionStore(args.db), args.workers)
+    start = time.perf_counter()
+    stats = scanner.scan_directory(args.root)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Scanned {stats['scanned']} repositories ({stats['commits']} new commits), "
+        f"{stats['unchanged']} unchanged, in {elapsed:.2f}s"
+    )
+    for name, error in sorted(stats["failed"].items()):
+        print(f"  failed {name}: {error}")
+    totals = scanner.store.totals()
+    print(f"{totals['commits']} commits in {totals['repositories']} repositories")
+    for rule, count in totals["violations"].items():
+        print(f"  {rule}: {count}")
+
+
+if __name__ == "__main__":
+    main()
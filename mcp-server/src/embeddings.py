@@ -0,0 +1,148 @@
+import os
+import re
+import sys
+import time
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# Selects the embedding backend used by SemanticSearch: "auto", "openai" or "local".
+# "auto" uses OpenAI when OPENAI_API_KEY is set and the local backend otherwise.
+EMBEDDINGS_ENV_VAR = "GOVERNANCE_EMBEDDINGS"
+EMBEDDING_DIM_ENV_VAR = "GOVERNANCE_EMBEDDING_DIM"
+EMBEDDING_BACKENDS = ("auto", "openai", "local")
+
+# Words, numbers and compound identifiers such as "ci-tests", "feature/login" or "v1.2"
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_./][a-z0-9]+)*")
+COMPOUND_SEPARATORS = re.compile(r"[-_./]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; compound identifiers are kept whole and also split into their parts."""
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        token = match.group(0)
+        tokens.append(token)
+        if not token.isalnum():
+            tokens.extend(COMPOUND_SEPARATORS.split(token))
+    return tokens
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Local, network-free embeddings using signed feature hashing.
+
+    Unigrams and bigrams are hashed into a fixed number of dimensions with
+    sublinear term-frequency weighting and L2 normalization. The embedder is
+    stateless, so vectors are identical across processes and machines.
+    """
+
+    def __init__(self, dim: int = 1024, batch_size: int = 2048, ngrams: int = 2):
+        self.dim = dim
+        self.batch_size = batch_size
+        self.ngrams = ngrams
+        self._feature_cache: Dict[str, Tuple[int, float]] = {}
+
+    def _feature(self, term: str) -> Tuple[int, float]:
+        feature = self._feature_cache.get(term)
+        if feature is None:
+            h = zlib.crc32(term.encode("utf-8"))
+            feature = (h % self.dim, 1.0 if h & 0x80000000 else -1.0)
+            if len(self._feature_cache) < 1_000_000:
+                self._feature_cache[term] = feature
+        return feature
+
+    def _terms(self, text: str) -> List[str]:
+        tokens = tokenize(text)
+        terms = list(tokens)
+        for n in range(2, self.ngrams + 1):
+            terms.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Encode texts into a (len(texts), dim) float32 matrix, one vectorized pass per batch."""
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.vstack([
+            self._encode_batch(texts[start:start + self.batch_size])
+            for start in range(0, len(texts), self.batch_size)
+        ])
+
+    def _encode_batch(self, texts: Sequence[str]) -> np.ndarray:
+        columns: List[int] = []
+        signs: List[float] = []
+        lengths = np.empty(len(texts), dtype=np.int64)
+        for i, text in enumerate(texts):
+            terms = self._terms(text)
+            lengths[i] = len(terms)
+            for term in terms:
+                column, sign = self._feature(term)
+                columns.append(column)
+                signs.append(sign)
+
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+        flat = rows * self.dim + np.asarray(columns, dtype=np.int64)
+        counts = np.bincount(flat, weights=np.asarray(signs), minlength=len(texts) * self.dim)
+        matrix = counts.reshape(len(texts), self.dim).astype(np.float32)
+
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.encode([text])[0].tolist()
+
+
+def load_embeddings(backend: Optional[str] = None) -> Optional[Embeddings]:
+    """
+    Build the configured embedding backend.
+    Falls back to the GOVERNANCE_EMBEDDINGS environment variable, then "auto".
+    Returns None when the OpenAI backend is selected but cannot be initialized.
+    """
+    backend = (backend or os.environ.get(EMBEDDINGS_ENV_VAR) or "auto").lower()
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}'. Expected one of: {', '.join(EMBEDDING_BACKENDS)}")
+
+    if backend == "auto":
+        backend = "openai" if os.environ.get("OPENAI_API_KEY") else "local"
+
+    if backend == "local":
+        return HashingEmbeddings(dim=int(os.environ.get(EMBEDDING_DIM_ENV_VAR, "1024")))
+
+    try:
+        from langchain_openai import OpenAIEmbeddings
+        return OpenAIEmbeddings()
+    except Exception as e:
+        print(f"Warning: Could not initialize OpenAI Embeddings: {e}", file=sys.stderr)
+        return None
+
+
+def describe_embeddings(embeddings: Optional[Embeddings]) -> Optional[str]:
+    """Identify an embedding backend so indexes built with a different one can be detected."""
+    if embeddings is None:
+        return None
+    if isinstance(embeddings, HashingEmbeddings):
+        return f"local-hashing:{embeddings.dim}:{embeddings.ngrams}"
+    model = getattr(embeddings, "model", None)
+    if model:
+        return f"{type(embeddings).__name__}:{model}"
+    size = getattr(embeddings, "size", None)
+    return f"{type(embeddings).__name__}:{size}" if size else type(embeddings).__name__
+
+
+def measure_throughput(embeddings: Embeddings, texts: List[str]) -> Dict[str, float]:
+    """Embed texts once and report throughput in chunks/sec."""
+    start = time.perf_counter()
+    embeddings.embed_documents(texts)
+    elapsed = time.perf_counter() - start
+    return {
+        "chunks": len(texts),
+        "seconds": elapsed,
+        "chunks_per_sec": len(texts) / elapsed if elapsed > 0 else float("inf"),
+    }
@@ -0,0 +1,309 @@
+import datetime
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Days covered by trend queries unless asked otherwise
+DEFAULT_TREND_DAYS = 90
+DEFAULT_REGRESSION_DAYS = 7
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history_runs (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    health_score INTEGER NOT NULL,
+    active_violations INTEGER NOT NULL,
+    compliant_repos INTEGER NOT NULL,
+    total_repos INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_runs_ts ON history_runs (ts);
+CREATE TABLE IF NOT EXISTS history_repos (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS history_rules (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS history_repo_outcomes (
+    repo INTEGER NOT NULL,
+    run INTEGER NOT NULL,
+    score INTEGER,
+    violations INTEGER NOT NULL,
+    PRIMARY KEY (repo, run)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS history_repo_outcomes_run ON history_repo_outcomes (run);
+CREATE TABLE IF NOT EXISTS history_rule_outcomes (
+    repo INTEGER NOT NULL,
+    rule INTEGER NOT NULL,
+    run INTEGER NOT NULL,
+    violated INTEGER NOT NULL,
+    PRIMARY KEY (repo, rule, run)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS history_rule_outcomes_rule ON history_rule_outcomes (rule, run);
+CREATE INDEX IF NOT EXISTS history_rule_outcomes_run ON history_rule_outcomes (run);
+CREATE TABLE IF NOT EXISTS history_daily (
+    day TEXT PRIMARY KEY,
+    runs INTEGER NOT NULL,
+    health_score INTEGER NOT NULL,
+    min_health_score INTEGER NOT NULL,
+    max_health_score INTEGER NOT NULL,
+    active_violations INTEGER NOT NULL,
+    compliant_repos INTEGER NOT NULL,
+    total_repos INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history_daily_rules (
+    day TEXT NOT NULL,
+    rule INTEGER NOT NULL,
+    repos INTEGER NOT NULL,
+    PRIMARY KEY (day, rule)
+) WITHOUT ROWID;
+"""
+
+
+def _day(ts: float) -> str:
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).date().isoformat()
+
+
+class ComplianceHistory:
+    """
+    Append-only history of compliance report runs (SQLite).
+
+    Every run adds a row with the org-wide summary. Per-repository outcomes
+    (score, violation count) and per-repository, per-rule outcomes (violated
+    or resolved) are only appended when they change, so a run in which few
+    repositories changed costs a few rows however large the org is. The state
+    at any run is the latest outcome at or before it. Repository and rule
+    names are stored once and referenced by id.
+
+    Daily rollups (the summary and repositories per rule at the day's last
+    run) are maintained as runs are recorded, so trend queries read one row
+    per day instead of rescanning the history.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(HISTORY_SCHEMA)
+        # Latest outcomes, for working out what a new run changed, as of run _last_run;
+        # reloaded when another writer (server or command line) has recorded runs since
+        self._outcomes: Optional[Dict[int, Tuple[int, int]]] = None
+        self._last_run: Optional[int] = None
+        self._rules: Dict[int, Set[int]] = {}
+        self._ids: Dict[Tuple[str, str], int] = {}
+
+    def close(self):
+        self._conn.close()
+
+    def _id(self, table: str, name: str) -> int:
+        key = (table, name)
+        if key not in self._ids:
+            self._conn.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+            self._ids[key] = self._conn.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()[0]
+        return self._ids[key]
+
+    def _load_latest(self):
+        self._outcomes = {
+            repo: (score, violations)
+            for repo, _, score, violations in self._conn.execute(
+                "SELECT repo, MAX(run), score, violations FROM history_repo_outcomes GROUP BY repo"
+            )
+            if score is not None
+        }
+        self._rules = {}
+        for repo, rule, _, violated in self._conn.execute(
+            "SELECT repo, rule, MAX(run), violated FROM history_rule_outcomes GROUP BY repo, rule"
+        ):
+            if violated:
+                self._rules.setdefault(repo, set()).add(rule)
+
+    def record(self, data: Dict[str, Any], timestamp: Optional[float] = None) -> int:
+        """
+        Append one report run (the data ComplianceEngine.report_data returns);
+        returns its run id. Runs must be recorded in time order.
+        """
+        ts = time.time() if timestamp is None else timestamp
+        with self._lock:
+            try:
+                return self._record(data, ts)
+            except BaseException:
+                # The transaction was rolled back; reload the latest outcomes on the next run
+                self._outcomes = None
+                self._ids.clear()
+                raise
+
+    def _record(self, data: Dict[str, Any], ts: float) -> int:
+        day = _day(ts)
+        with self._conn:
+            # Take the write lock first, so no other writer records a run between the check and the insert
+            self._conn.execute("BEGIN IMMEDIATE")
+            latest, last = self._conn.execute("SELECT MAX(id), MAX(ts) FROM history_runs").fetchone()
+            if last is not None and ts < last:
+                raise ValueError("Compliance history is append-only: runs must be recorded in time order")
+            if self._outcomes is None or latest != self._last_run:
+                self._load_latest()
+            run = self._conn.execute(
+                "INSERT INTO history_runs (ts, day, health_score, active_violations, compliant_repos, total_repos) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (ts, day, data["health_score"], data["active_violations"], data["compliant_repos"], data["total_repos"]),
+            ).lastrowid
+            self._last_run = run
+
+            repo_rows = []
+            rule_rows = []
+            seen = set()
+            for repo in data["repositories"]:
+                repo_id = self._id("history_repos", repo["name"])
+                seen.add(repo_id)
+                outcome = (repo["score"], len(repo["violations"]))
+                if self._outcomes.get(repo_id) != outcome:
+                    self._outcomes[repo_id] = outcome
+                    repo_rows.append((repo_id, run, *outcome))
+                rules = {self._id("history_rules", violation["rule"]) for violation in repo["violations"]}
+                previous = self._rules.get(repo_id, set())
+                if rules != previous:
+                    rule_rows += [(repo_id, rule, run, 1) for rule in rules - previous]
+                    rule_rows += [(repo_id, rule, run, 0) for rule in previous - rules]
+                    self._rules[repo_id] = rules
+            # Repositories no longer reported: a tombstone, and their rules resolved
+            for repo_id in set(self._outcomes) - seen:
+                del self._outcomes[repo_id]
+                repo_rows.append((repo_id, run, None, 0))
+                rule_rows += [(repo_id, rule, run, 0) for rule in self._rules.pop(repo_id, set())]
+            self._conn.executemany("INSERT INTO history_repo_outcomes VALUES (?, ?, ?, ?)", repo_rows)
+            self._conn.executemany("INSERT INTO history_rule_outcomes VALUES (?, ?, ?, ?)", rule_rows)
+
+            score = data["health_score"]
+            self._conn.execute(
+                "INSERT INTO history_daily VALUES (?, 1, ?, ?, ?, ?, ?, ?) ON CONFLICT(day) DO UPDATE SET "
+                "runs = runs + 1, health_score = excluded.health_score, "
+                "min_health_score = MIN(min_health_score, excluded.min_health_score), "
+                "max_health_score = MAX(max_health_score, excluded.max_health_score), "
+                "active_violations = excluded.active_violations, compliant_repos = excluded.compliant_repos, "
+                "total_repos = excluded.total_repos",
+                (day, score, score, score, data["active_violations"], data["compliant_repos"], data["total_repos"]),
+            )
+            rule_repos: Dict[int, int] = {}
+            for rules in self._rules.values():
+                for rule in rules:
+                    rule_repos[rule] = rule_repos.get(rule, 0) + 1
+            self._conn.execute("DELETE FROM history_daily_rules WHERE day = ?", (day,))
+            self._conn.executemany(
+                "INSERT INTO history_daily_rules VALUES (?, ?, ?)", [(day, rule, n) for rule, n in rule_repos.items()]
+            )
+        return run
+
+    def score_trend(self, days: int = DEFAULT_TREND_DAYS, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """The health score and summary at the last run of each day, over the last ``days`` days."""
+        start = _day((time.time() if now is None else now) - days * 86400)
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM history_daily WHERE day > ? ORDER BY day", (start,))
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
+
+    def _run_at(self, ts: float) -> Optional[int]:
+        return self._conn.execute("SELECT MAX(id) FROM history_runs WHERE ts <= ?", (ts,)).fetchone()[0]
+
+    def _changed_scores(self, baseline: int, latest: int) -> List[Tuple[int, Optional[int], Optional[int]]]:
+        """(repo, score at baseline, score at latest) of the repositories whose outcome changed in between."""
+        score_at = "SELECT score FROM history_repo_outcomes WHERE repo = changed.repo AND run <= ? ORDER BY run DESC LIMIT 1"
+        return self._conn.execute(
+            f"SELECT repo, ({score_at}), ({score_at}) FROM "
+            "(SELECT DISTINCT repo FROM history_repo_outcomes WHERE run > ? AND run <= ?) AS changed",
+            (baseline, latest, baseline, latest),
+        ).fetchall()
+
+    def _rules_at(self, repo: int, run: int) -> Set[int]:
+        rows = self._conn.execute(
+            "SELECT rule, MAX(run), violated FROM history_rule_outcomes WHERE repo = ? AND run <= ? GROUP BY rule",
+            (repo, run),
+        )
+        return {rule for rule, _, violated in rows if violated}
+
+    def _names(self, table: str) -> Dict[int, str]:
+        return dict(self._conn.execute(f"SELECT id, name FROM {table}"))
+
+    def regressions(
+        self, days: int = DEFAULT_REGRESSION_DAYS, limit: int = 20, now: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Repositories whose score dropped between the last run ``days`` days ago
+        (or the first run, if the history is shorter) and the latest run,
+        biggest drop first, with the rules they newly violate.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            latest = self._run_at(now)
+            if latest is None:
+                return {"since": None, "until": None, "regressed_repos": 0, "regressed": []}
+            baseline = self._run_at(now - days * 86400)
+            if baseline is None:
+                baseline = self._conn.execute("SELECT MIN(id) FROM history_runs").fetchone()[0]
+            # Only repositories with an outcome recorded since the baseline can have regressed
+            dropped = sorted(
+                ((then - now, repo, then, now) for repo, then, now in self._changed_scores(baseline, latest)
+                 if then is not None and now is not None and now < then),
+                reverse=True,
+            )
+            rules = self._names("history_rules")
+            regressed = [
+                {
+                    "repo": self._conn.execute("SELECT name FROM history_repos WHERE id = ?", (repo,)).fetchone()[0],
+                    "score_then": then,
+                    "score_now": now,
+                    "new_rules": sorted(rules[rule] for rule in self._rules_at(repo, latest) - self._rules_at(repo, baseline)),
+                }
+                for _, repo, then, now in dropped[:limit]
+            ]
+            stamps = dict(self._conn.execute("SELECT id, ts FROM history_runs WHERE id IN (?, ?)", (baseline, latest)))
+        return {
+            "since": datetime.datetime.fromtimestamp(stamps[baseline], datetime.timezone.utc).isoformat(),
+            "until": datetime.datetime.fromtimestamp(stamps[latest], datetime.timezone.utc).isoformat(),
+            "regressed_repos": len(dropped),
+            "regressed": regressed,
+        }
+
+    def top_rules(self, days: int = DEFAULT_TREND_DAYS, limit: int = 10, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Rules violated most over the last ``days`` days, by repository-days
+        (repositories violating the rule, summed over the days), with how many
+        times a repository newly violated them and how many violate them now.
+        """
+        now = time.time() if now is None else now
+        since = now - days * 86400
+        with self._lock:
+            ranked = self._conn.execute(
+                "SELECT rule, SUM(repos), COUNT(*) FROM history_daily_rules WHERE day > ? "
+                "GROUP BY rule ORDER BY SUM(repos) DESC, rule LIMIT ?",
+                (_day(since), limit),
+            ).fetchall()
+            first_run = self._conn.execute("SELECT MIN(id) FROM history_runs WHERE ts > ?", (since,)).fetchone()[0]
+            opened = {
+                rule: self._conn.execute(
+                    "SELECT COUNT(*) FROM history_rule_outcomes WHERE rule = ? AND run >= ? AND violated = 1",
+                    (rule, first_run),
+                ).fetchone()[0] if first_run is not None else 0
+                for rule, _, _ in ranked
+            }
+            last_day = self._conn.execute("SELECT MAX(day) FROM history_daily").fetchone()[0]
+            current = dict(self._conn.execute("SELECT rule, repos FROM history_daily_rules WHERE day = ?", (last_day,)))
+            names = self._names("history_rules")
+        return [
+            {
+                "rule": names[rule],
+                "repo_days": repo_days,
+                "days": days_seen,
+                "newly_violated": opened[rule],
+                "current_repos": current.get(rule, 0),
+            }
+            for rule, repo_days, days_seen in ranked
+        ]
+
+    def trends(
+        self, days: int = DEFAULT_TREND_DAYS, regression_days: int = DEFAULT_REGRESSION_DAYS, limit: int = 10,
+        now: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        return {
+            "score": self.score_trend(days, now),
+            "regressions": self.regressions(regression_days, limit, now),
+            "top_rules": self.top_rules(days, limit, now),
+        }
@@ -0,0 +1,163 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Job lifecycle states
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class Job:
+    """A unit of background work with progress reporting and cooperative cancellation."""
+
+    id: str
+    kind: str
+    status: str = PENDING
+    progress: Dict[str, Any] = field(default_factory=dict)
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (COMPLETED, FAILED, CANCELLED)
+
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def report(self, update: Dict[str, Any]):
+        """Merge a progress update from the worker."""
+        self.progress = {**self.progress, **update}
+
+    def to_dict(self) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": dict(self.progress),
+            "result": self.result,
+            "error": self.error,
+            "elapsed_seconds": round(end - self.started_at, 3) if self.started_at else 0.0,
+        }
+
+
+class JobManager:
+    """
+    Runs jobs on a worker thread pool and keeps their status for polling.
+
+    The callable receives its Job, so it can report progress and poll
+    cancel_requested(). A job that raises after cancellation was requested
+    is marked cancelled rather than failed.
+    """
+
+    def __init__(self, max_workers: int = 1, history: int = 50):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="governance-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._history = history
+
+    def submit(self, kind: str, fn: Callable[[Job], Any]) -> Job:
+        job = Job(id=uuid.uuid4().hex[:12], kind=kind)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job: Job, fn: Callable[[Job], Any]):
+        if job.cancel_requested():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(job)
+            job.status = COMPLETED
+        except Exception as e:
+            job.error = str(e)
+            job.status = CANCELLED if job.cancel_requested() else FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if job.done]
+        for job in sorted(finished, key=lambda j: j.created_at)[:max(0, len(self._jobs) - self._history)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def latest(self, kind: Optional[str] = None) -> Optional[Job]:
+        jobs = [job for job in self._jobs.values() if kind is None or job.kind == kind]
+        return max(jobs, key=lambda j: j.created_at, default=None)
+
+    def active(self, kind: Optional[str] = None) -> List[Job]:
+        return [job for job in self._jobs.values() if not job.done and (kind is None or job.kind == kind)]
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation; returns False if the job is unknown or already finished."""
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return False
+        job._cancel_event.set()
+        return True
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+class ReadWriteLock:
+    """
+    Writer-preferring readers/writer lock.
+
+    Many readers may hold it together; a writer waits for current readers to
+    finish and blocks new ones, so a pending write is never starved.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
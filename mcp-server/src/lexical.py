@@ -0,0 +1,174 @@
+import heapq
+import json
+import math
+import os
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from embeddings import tokenize
+except ImportError:
+    from .embeddings import tokenize
+
+# Format of the base file; older bases (with chunk text and postings) still load
+LEXICAL_INDEX_VERSION = 2
+
+
+class BM25Index:
+    """
+    Inverted index with Okapi BM25 scoring over the same chunks as the vector store.
+
+    Postings map each term to ``{chunk_id: term_frequency}`` so a query only
+    touches the postings of its own terms. Chunks are added and removed by
+    their stable IDs, which keeps the index in step with incremental reindexing.
+
+    On disk the index is a base file of per-chunk term counts plus an
+    append-only log of the adds and removes since (``<path>.log``): a save
+    appends only what changed, and the base is rewritten once the log outgrows
+    it. Postings are rebuilt from the term counts on load. Chunk text is kept
+    only for chunks added with keep_text, i.e. those no vector store holds.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.chunks: Dict[str, Dict[str, Any]] = {}
+        self.total_length = 0
+        # Changes not yet saved; a clear() makes the next save rewrite the base
+        self._pending: List[Dict[str, Any]] = []
+        self._cleared = False
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def add(self, ids: List[str], texts: List[str], metadatas: Optional[List[dict]] = None, keep_text: bool = False):
+        """Index chunks, replacing any existing chunk with the same ID; keep_text stores their text too."""
+        metadatas = metadatas or [{} for _ in texts]
+        self.remove([chunk_id for chunk_id in ids if chunk_id in self.chunks])
+        for chunk_id, text, metadata in zip(ids, texts, metadatas):
+            chunk = {"terms": dict(Counter(tokenize(text))), "metadata": metadata}
+            if keep_text:
+                chunk["text"] = text
+            self._insert(chunk_id, chunk)
+            self._pending.append({"add": chunk_id, **chunk})
+
+    def _insert(self, chunk_id: str, chunk: Dict[str, Any]):
+        chunk["length"] = sum(chunk["terms"].values())
+        for term, tf in chunk["terms"].items():
+            self.postings.setdefault(term, {})[chunk_id] = tf
+        self.chunks[chunk_id] = chunk
+        self.total_length += chunk["length"]
+
+    def remove(self, ids: List[str]):
+        """Drop chunks from the index; unknown IDs are ignored."""
+        removed = []
+        for chunk_id in ids:
+            chunk = self.chunks.pop(chunk_id, None)
+            if chunk is None:
+                continue
+            removed.append(chunk_id)
+            self.total_length -= chunk["length"]
+            for term in chunk["terms"]:
+                postings = self.postings.get(term)
+                if postings is None:
+                    continue
+                postings.pop(chunk_id, None)
+                if not postings:
+                    del self.postings[term]
+        if removed:
+            self._pending.append({"remove": removed})
+
+    def clear(self):
+        self.postings = {}
+        self.chunks = {}
+        self.total_length = 0
+        self._pending = []
+        self._cleared = True
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Return the top-k ``(chunk_id, score)`` pairs for the query terms."""
+        n = len(self.chunks)
+        if not n or k <= 0:
+            return []
+        avg_length = self.total_length / n
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1.0 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, tf in postings.items():
+                norm = self.k1 * (1.0 - self.b + self.b * self.chunks[chunk_id]["length"] / avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    @staticmethod
+    def _stored(chunk: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in chunk.items() if key != "length"}
+
+    def save(self, path: str):
+        """Persist the changes since the last save: appended to the log, or compacted into the base."""
+        log_path = f"{path}.log"
+        log_size = os.path.getsize(log_path) if os.path.exists(log_path) else 0
+        base_size = os.path.getsize(path) if os.path.exists(path) else 0
+        if not self._cleared and base_size and log_size <= base_size:
+            if self._pending:
+                with open(log_path, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(change) + "\n" for change in self._pending)
+            self._pending = []
+            return
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": LEXICAL_INDEX_VERSION,
+                "k1": self.k1,
+                "b": self.b,
+                "chunks": {chunk_id: self._stored(chunk) for chunk_id, chunk in self.chunks.items()},
+            }, f)
+        os.replace(tmp_path, path)
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        self._pending = []
+        self._cleared = False
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """Load a persisted index (the base, then its log), or return an empty one if there is none."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(k1=data["k1"], b=data["b"])
+        for chunk_id, chunk in data["chunks"].items():
+            if "terms" not in chunk:
+                # Written before term counts were stored: recount them from the text
+                chunk = {"terms": dict(Counter(tokenize(chunk["text"]))), "metadata": chunk["metadata"], "text": chunk["text"]}
+            index._insert(chunk_id, chunk)
+        log_path = f"{path}.log"
+        if os.path.exists(log_path):
+            with open(log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except ValueError:
+                        # A save cut short leaves a partial last line; the changes before it stand
+                        break
+                    if "remove" in change:
+                        index.remove(change["remove"])
+                    else:
+                        chunk_id = change.pop("add")
+                        index.remove([chunk_id])
+                        index._insert(chunk_id, change)
+            index._pending = []
+        return index
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse several ranked ID lists; each appearance contributes 1 / (k + rank)."""
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking, start=1):
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,296 @@
+import contextvars
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+# Histogram bucket upper bounds: latencies in seconds, payloads in bytes
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Slow-call profiler (off unless GOVERNANCE_SLOW_CALLS is set): keeps the N slowest
+# calls with their span breakdown. A fraction of calls can be traced to cut its cost,
+# and each newly recorded slow call can be appended to a JSON lines file.
+SLOW_CALLS_ENV_VAR = "GOVERNANCE_SLOW_CALLS"
+SLOW_CALL_SAMPLE_ENV_VAR = "GOVERNANCE_SLOW_CALL_SAMPLE"
+SLOW_CALL_LOG_ENV_VAR = "GOVERNANCE_SLOW_CALL_LOG"
+
+# Argument values are truncated to this many characters in slow-call records
+ARGUMENT_PREVIEW_CHARS = 200
+
+# Spans of the call being traced by the slow-call profiler (None when not traced)
+_trace: contextvars.ContextVar[Optional[List[Dict[str, Any]]]] = contextvars.ContextVar("governance_trace", default=None)
+
+
+class Histogram:
+    """Fixed-bucket histogram; quantiles are interpolated within their bucket and clamped to the observed range."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min or self.count == 1:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            if n and cumulative + n >= rank:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(max(lower + (upper - lower) * (rank - cumulative) / n, self.min), self.max)
+            cumulative += n
+        return self.max
+
+    def summary(self, scale: float = 1.0, digits: int = 3) -> Dict[str, Any]:
+        def scaled(value):
+            return round(value * scale, digits) if value is not None else None
+
+        return {
+            "p50": scaled(self.quantile(0.5)),
+            "p95": scaled(self.quantile(0.95)),
+            "p99": scaled(self.quantile(0.99)),
+            "mean": scaled(self.sum / self.count if self.count else None),
+            "max": scaled(self.max if self.count else None),
+        }
+
+    def prometheus(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, n in zip(list(self.bounds) + ["+Inf"], self.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class CallStats:
+    """Counters and histograms for one tool (or resource scheme)."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.request_bytes = Histogram(SIZE_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.calls, 4) if self.calls else 0.0,
+            "latency_ms": self.latency.summary(scale=1000),
+            "request_bytes": self.request_bytes.summary(digits=0),
+            "response_bytes": self.response_bytes.summary(digits=0),
+        }
+
+
+class SlowCallProfiler:
+    """Keeps the slowest traced calls, with their spans and argument previews."""
+
+    def __init__(self, keep: int, sample_rate: float = 1.0, log_path: Optional[str] = None):
+        self.keep = keep
+        self.sample_rate = sample_rate
+        self.log_path = log_path
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def offer(self, record: Dict[str, Any]):
+        item = (record["seconds"], next(self._sequence), record)
+        with self._lock:
+            if len(self._heap) < self.keep:
+                heapq.heappush(self._heap, item)
+            elif item[0] > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+            else:
+                return
+            if self.log_path:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+
+    def slowest(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [record for _, _, record in sorted(self._heap, reverse=True)]
+
+
+def payload_size(value: Any) -> int:
+    """Approximate size in bytes of tool arguments or results (text content, JSON otherwise)."""
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value.encode("utf-8") if isinstance(value, str) else value)
+    if isinstance(value, tuple) and len(value) == 2 and isinstance(value[1], dict):
+        # FastMCP results: (content blocks, structured content); count the content once
+        return payload_size(value[0])
+    if isinstance(value, (list, tuple)):
+        return sum(payload_size(item) for item in value)
+    for attribute in ("text", "content"):
+        if hasattr(value, attribute):
+            return payload_size(getattr(value, attribute))
+    return len(json.dumps(value, default=str).encode("utf-8"))
+
+
+def _preview(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    preview = {}
+    for key, value in (arguments or {}).items():
+        text = value if isinstance(value, str) else json.dumps(value, default=str)
+        preview[key] = text if len(text) <= ARGUMENT_PREVIEW_CHARS else f"{text[:ARGUMENT_PREVIEW_CHARS]}… ({len(text)} chars)"
+    return preview
+
+
+class Metrics:
+    """
+    In-process instrumentation for the server: per-tool call counts, error
+    rates, latency and payload size histograms, and named sub-span timings
+    (embedding a query, vector search, an LLM call, a file read). Recording
+    is a few counter updates under one lock, cheap enough to leave on.
+    """
+
+    def __init__(self, profiler: Optional[SlowCallProfiler] = None):
+        self.started = time.time()
+        self.tools: Dict[str, CallStats] = {}
+        self.spans: Dict[str, Histogram] = {}
+        self.profiler = profiler
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "Metrics":
+        keep = int(os.environ.get(SLOW_CALLS_ENV_VAR, "0"))
+        profiler = None
+        if keep > 0:
+            profiler = SlowCallProfiler(
+                keep,
+                sample_rate=float(os.environ.get(SLOW_CALL_SAMPLE_ENV_VAR, "1.0")),
+                log_path=os.environ.get(SLOW_CALL_LOG_ENV_VAR) or None,
+            )
+        return cls(profiler)
+
+    def record_span(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.spans.get(name)
+            if histogram is None:
+                histogram = self.spans[name] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+        trace = _trace.get()
+        if trace is not None:
+            trace.append({"span": name, "ms": round(seconds * 1000, 3)})
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(name, time.perf_counter() - started)
+
+    @contextmanager
+    def tool_call(self, tool: str, arguments: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Time one tool call. The caller stores the tool's result under "result"
+        in the yielded dict so the response size can be recorded; an exception
+        counts as an error.
+        """
+        call: Dict[str, Any] = {}
+        trace = [] if self.profiler is not None and self.profiler.sampled() else None
+        token = _trace.set(trace)
+        started = time.perf_counter()
+        error = None
+        try:
+            yield call
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            seconds = time.perf_counter() - started
+            _trace.reset(token)
+            request_bytes = payload_size(arguments) if arguments else 0
+            response_bytes = payload_size(call.get("result"))
+            with self._lock:
+                stats = self.tools.get(tool)
+                if stats is None:
+                    stats = self.tools[tool] = CallStats()
+                stats.calls += 1
+                stats.errors += error is not None
+                stats.latency.observe(seconds)
+                stats.request_bytes.observe(request_bytes)
+                stats.response_bytes.observe(response_bytes)
+            if trace is not None:
+                self.profiler.offer({
+                    "tool": tool,
+                    "seconds": round(seconds, 4),
+                    "started_at": round(time.time() - seconds, 3),
+                    "error": error,
+                    "request_bytes": request_bytes,
+                    "response_bytes": response_bytes,
+                    "arguments": _preview(arguments),
+                    "spans": trace,
+                })
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = {
+                "uptime_seconds": round(time.time() - self.started, 2),
+                "tools": {name: stats.to_dict() for name, stats in sorted(self.tools.items())},
+                "spans": {
+                    name: {"count": histogram.count, "total_ms": round(histogram.sum * 1000, 3), "latency_ms": histogram.summary(scale=1000)}
+                    for name, histogram in sorted(self.spans.items())
+                },
+            }
+        if self.profiler is not None:
+            snapshot["slow_calls"] = self.profiler.slowest()
+        return snapshot
+
+    def prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            tools = sorted(self.tools.items())
+            for metric, kind, help_text in (
+                ("governance_tool_calls_total", "counter", "Tool calls."),
+                ("governance_tool_errors_total", "counter", "Tool calls that raised an error."),
+            ):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+                for name, stats in tools:
+                    value = stats.calls if metric == "governance_tool_calls_total" else stats.errors
+                    lines.append(f'{metric}{{tool="{name}"}} {value}')
+            for metric, attribute, help_text in (
+                ("governance_tool_latency_seconds", "latency", "Tool call latency."),
+                ("governance_tool_request_bytes", "request_bytes", "Tool call argument size."),
+                ("governance_tool_response_bytes", "response_bytes", "Tool call result size."),
+            ):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+                for name, stats in tools:
+                    lines += getattr(stats, attribute).prometheus(metric, f'tool="{name}"')
+            lines += ["# HELP governance_span_seconds Sub-span latency.", "# TYPE governance_span_seconds histogram"]
+            for name, histogram in sorted(self.spans.items()):
+                lines += histogram.prometheus("governance_span_seconds", f'span="{name}"')
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry used by the server and the modules it instruments
+metrics = Metrics.from_env()
+span = metrics.span
@@ -0,0 +1,154 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from sections import SECTION_CHUNK_CHARS, outline, split_markdown
+except ImportError:
+    from .sections import SECTION_CHUNK_CHARS, outline, split_markdown
+
+# Building blocks for the streaming indexing pipeline used by SemanticSearch.index_documents.
+# This module stays light on imports so process-pool workers start quickly.
+
+
+class MarkdownSectionSplitter:
+    """The splitter used to chunk governance documents for indexing (see sections.split_markdown)."""
+
+    def __init__(self, max_chars: int = SECTION_CHUNK_CHARS):
+        self.max_chars = max_chars
+
+    def split_text(self, text: str) -> List[str]:
+        return [chunk for chunk, _ in split_markdown(text, self.max_chars)]
+
+
+def make_text_splitter() -> MarkdownSectionSplitter:
+    return MarkdownSectionSplitter()
+
+
+def split_document(path: str, text: str) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    Split one document into ``(chunk_text, metadata)`` pairs along its headings,
+    and compute its outline; safe to run in a worker process.
+    """
+    chunks = [(chunk, {"source": path, **metadata}) for chunk, metadata in split_markdown(text)]
+    return chunks, [section.to_dict() for section in outline(text.encode("utf-8"))]
+
+
+def read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def timed_call(fn: Callable, *args: Any) -> Tuple[Any, float]:
+    """Run fn and return its result with the time it took, measured where it ran."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def bounded_map(
+    fn: Callable,
+    items: Iterable[Tuple],
+    executor: Optional[Executor] = None,
+    max_in_flight: int = 16,
+) -> Iterator[Tuple[Tuple, Any, float]]:
+    """
+    Lazily map fn over argument tuples, yielding ``(args, result, seconds)`` in input order.
+
+    With an executor, at most max_in_flight calls are outstanding, so memory
+    stays bounded however large the input is. Without one, calls run inline.
+    """
+    if executor is None:
+        for args in items:
+            result, seconds = timed_call(fn, *args)
+            yield args, result, seconds
+        return
+
+    pending = deque()
+    for args in items:
+        pending.append((args, executor.submit(timed_call, fn, *args)))
+        if len(pending) >= max_in_flight:
+            done_args, future = pending.popleft()
+            yield (done_args, *future.result())
+    while pending:
+        done_args, future = pending.popleft()
+        yield (done_args, *future.result())
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most size items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class StageTimings:
+    """Accumulates per-stage work time and item counts for a pipeline run."""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._started = time.perf_counter()
+
+    def add(self, stage: str, seconds: float, items: int = 1):
+        totals = self.stages.setdefault(stage, {"seconds": 0.0, "items": 0})
+        totals["seconds"] += seconds
+        totals["items"] += items
+
+    def summary(self) -> Dict[str, Any]:
+        """Seconds, items and items/sec per stage, plus total wall-clock time."""
+        report = {}
+        for stage, totals in self.stages.items():
+            seconds = totals["seconds"]
+            report[stage] = {
+                "seconds": round(seconds, 4),
+                "items": int(totals["items"]),
+                "items_per_sec": round(totals["items"] / seconds, 1) if seconds > 0 else None,
+            }
+        report["wall_seconds"] = round(time.perf_counter() - self._started, 4)
+        return report
+
+
+class StagingArea:
+    """
+    On-disk spill area for embedded chunk batches.
+
+    Batches are written as they are produced, so peak memory is bounded by
+    the batch size, and read back one at a time when the diff is applied.
+    """
+
+    def __init__(self, parent_directory: str):
+        os.makedirs(parent_directory, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix=".staging-", dir=parent_directory)
+        self._count = 0
+
+    def append(self, ids: Sequence[str], texts: Sequence[str], metadatas: Sequence[dict], vectors: Optional[Any]):
+        prefix = os.path.join(self.directory, f"batch-{self._count:06d}")
+        with open(f"{prefix}.json", "w", encoding="utf-8") as f:
+            json.dump({"ids": list(ids), "texts": list(texts), "metadatas": list(metadatas)}, f)
+        if vectors is not None:
+            with open(f"{prefix}.npy", "wb") as f:
+                np.save(f, np.asarray(vectors, dtype=np.float32))
+        self._count += 1
+
+    def batches(self) -> Iterator[Tuple[List[str], List[str], List[dict], Optional[np.ndarray]]]:
+        for n in range(self._count):
+            prefix = os.path.join(self.directory, f"batch-{n:06d}")
+            with open(f"{prefix}.json", "r", encoding="utf-8") as f:
+                records = json.load(f)
+            vectors = np.load(f"{prefix}.npy") if os.path.exists(f"{prefix}.npy") else None
+            yield records["ids"], records["texts"], records["metadatas"], vectors
+
+    def cleanup(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -1,18 +1,348 @@
-from typing import List
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.prompts import ChatPromptTemplate
+
 try:
-    from langchain_openai import ChatOpenAI
-    from langchain.prompts import ChatPromptTemplate
-    from langchain.schema.output_parser import StrOutputParser
+    from cache import TTLCache
+    from metrics import span
 except ImportError:
-    ChatOpenAI = None
+    from .cache import TTLCache
+    from .metrics import span
+
+# Selects the chat model: "openai" (default) or "fake" (offline, deterministic; for tests)
+LLM_ENV_VAR = "GOVERNANCE_LLM"
+LLM_BACKENDS = ("openai", "fake")
+# Maximum LLM requests in flight at once
+LLM_CONCURRENCY_ENV_VAR = "GOVERNANCE_LLM_CONCURRENCY"
+# SQLite file caching responses between runs
+LLM_CACHE_ENV_VAR = "GOVERNANCE_LLM_CACHE"
+LLM_CACHE_FILENAME = "llm_cache.sqlite"
+
+SUGGEST_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert in organizational governance and software engineering best practices. Analyze the provided policy and suggest improvements."),
+    ("user", "Context: {context}\n\nCurrent Policy:\n{policy_content}\n\nPlease suggest specific updates to improve clarity, coverage, and enforcement.")
+])
+
+VIOLATIONS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are a Governance Analyst. Review the following list of compliance violations and suggest policy changes to prevent them."),
+    ("user", "Violations:\n{violations}\n\nSuggest 3-5 policy updates or new standards to address these recurring issues.")
+])
+
+
+class FakePolicyLLM(BaseChatModel):
+    """Offline chat model: a deterministic answer derived from the prompt, after an optional delay."""
+
+    model_name: str = "fake-policy-llm"
+    temperature: float = 0.0
+    latency: float = 0.0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-policy-llm"
+
+    def _respond(self, messages: List[BaseMessage]) -> ChatResult:
+        self.calls += 1
+        prompt = "\n".join(str(message.content) for message in messages)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+        text = f"Suggested updates (fake-{digest}): tighten the wording, add an owner and an enforcement check."
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(messages)
+
+
+def load_llm(backend: Optional[str] = None):
+    """Chat model for the backend (GOVERNANCE_LLM when not given); None if unavailable."""
+    backend = (backend or os.environ.get(LLM_ENV_VAR) or "openai").lower()
+    if backend not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{backend}'. Choose from: {', '.join(LLM_BACKENDS)}")
+    if backend == "fake":
+        return FakePolicyLLM()
+    try:
+        # Imported here: langchain_openai is slow to import and only this backend needs it
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(model="gpt-4-turbo-preview", temperature=0.7)
+    except Exception as e:
+        print(f"Warning: Could not initialize ChatOpenAI: {e}", file=sys.stderr)
+        return None
+
+
+class ResponseCache:
+    """
+    Persistent LLM response cache (SQLite), keyed on prompt hash, model and temperature.
+    The database file is only created when the first response is stored.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self, create: bool) -> Optional[sqlite3.Connection]:
+        if self._conn is None and (create or os.path.exists(self.path)):
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            conn = self._connection(create=False)
+            row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone() if conn else None
+        return row[0] if row else None
+
+    def set(self, key: str, model: str, response: str):
+        with self._lock:
+            conn = self._connection(create=True)
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, model, response, time.time()))
+
+    def __len__(self) -> int:
+        with self._lock:
+            conn = self._connection(create=False)
+            return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] if conn else 0
+
+
+# Violation clustering: near-identical violations are collapsed into weighted groups
+# before analysis, so the prompt stays bounded however many violations come in.
+MAX_PROMPT_CLUSTERS = 40
+CLUSTER_SIMILARITY = 0.5
+MINHASH_PERMUTATIONS = 32
+LSH_BANDS = 16
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+# "<repo>: <message>" prefixes (but not severities such as "P1: ...")
+_REPO_PREFIX = re.compile(r"^\s*\[?([\w./-]+)\]?\s*:\s+(.+)$")
+_SEVERITY = re.compile(r"^P[0-3]$", re.IGNORECASE)
+_QUOTED = re.compile(r"'[^']*'|\"[^\"]*\"|`[^`]*`")
+_SHA = re.compile(r"\b[0-9a-f]{7,40}\b")
+_NUMBER = re.compile(r"\b\d+(\.\d+)?\b")
+_NON_WORD = re.compile(r"[^\w<>]+")
+
+
+def split_violation(violation: str):
+    """Split "repo: message" into (repo, message); repo is None without a prefix."""
+    match = _REPO_PREFIX.match(violation)
+    if match and not _SEVERITY.match(match.group(1)):
+        return match.group(1), match.group(2).strip()
+    return None, violation.strip()
+
+
+def normalize_violation(message: str) -> str:
+    """Template of a violation: lowercased, with names, SHAs and numbers replaced by placeholders."""
+    text = _QUOTED.sub(" <name> ", message.lower())
+    text = _SHA.sub(" <sha> ", text)
+    text = _NUMBER.sub(" <n> ", text)
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+@dataclass
+class ViolationCluster:
+    representative: str
+    count: int = 0
+    repos: set = field(default_factory=set)
+    examples: List[str] = field(default_factory=list)
+    variants: int = 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "representative": self.representative,
+            "count": self.count,
+            "repositories": len(self.repos),
+            "examples": self.examples,
+            "variants": self.variants,
+        }
+
+
+class _MinHasher:
+    def __init__(self, permutations: int = MINHASH_PERMUTATIONS, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        # Coefficients below 2**31 keep a * x + b inside uint64 for 32-bit shingle hashes
+        self.a = rng.integers(1, 2**31, size=permutations, dtype=np.uint64)
+        self.b = rng.integers(0, 2**31, size=permutations, dtype=np.uint64)
+
+    def signature(self, template: str) -> np.ndarray:
+        tokens = template.split() or [""]
+        grams = set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+        shingles = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+        return ((shingles[:, None] * self.a + self.b) % _MERSENNE_PRIME).min(axis=0)
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_violations(violations: List[str], similarity: float = CLUSTER_SIMILARITY) -> List[ViolationCluster]:
+    """
+    Group violations by normalized template, then merge near-duplicate templates
+    with MinHash/LSH. Linear in the number of violations; the LSH pass only sees
+    distinct templates. Returns clusters, largest first.
+    """
+    groups: Dict[str, ViolationCluster] = {}
+    for violation in violations:
+        repo, message = split_violation(violation)
+        template = normalize_violation(message)
+        group = groups.get(template)
+        if group is None:
+            group = groups[template] = ViolationCluster(representative=message)
+        group.count += 1
+        if repo is not None:
+            if repo not in group.repos and len(group.examples) < 3:
+                group.examples.append(repo)
+            group.repos.add(repo)
+
+    templates = list(groups)
+    hasher = _MinHasher()
+    signatures = [hasher.signature(template) for template in templates]
+    parent = list(range(len(templates)))
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    buckets: Dict[tuple, int] = {}
+    for i, signature in enumerate(signatures):
+        for band in range(LSH_BANDS):
+            key = (band, signature[band * rows:(band + 1) * rows].tobytes())
+            j = buckets.setdefault(key, i)
+            if j != i and np.mean(signatures[i] == signatures[j]) >= similarity:
+                parent[_find(parent, i)] = _find(parent, j)
+
+    merged: Dict[int, List[ViolationCluster]] = {}
+    for i, template in enumerate(templates):
+        merged.setdefault(_find(parent, i), []).append(groups[template])
+
+    clusters = []
+    for members in merged.values():
+        members.sort(key=lambda group: -group.count)
+        cluster = ViolationCluster(representative=members[0].representative, variants=len(members))
+        for group in members:
+            cluster.count += group.count
+            cluster.repos |= group.repos
+            cluster.examples.extend(repo for repo in group.examples if repo not in cluster.examples)
+        cluster.examples = cluster.examples[:3]
+        clusters.append(cluster)
+    clusters.sort(key=lambda cluster: (-cluster.count, cluster.representative))
+    return clusters
+
+
+def format_clusters(clusters: List[ViolationCluster], max_clusters: int = MAX_PROMPT_CLUSTERS) -> str:
+    """Prompt text for the largest clusters, with a one-line tail for the rest."""
+    lines = []
+    for cluster in clusters[:max_clusters]:
+        where = f" across {len(cluster.repos)} repos (e.g. {', '.join(cluster.examples)})" if cluster.repos else ""
+        lines.append(f"- [{cluster.count}x{where}] {cluster.representative[:300]}")
+    rest = clusters[max_clusters:]
+    if rest:
+        lines.append(f"- ... and {sum(c.count for c in rest)} more violations in {len(rest)} smaller groups")
+    return "\n".join(lines)
+
 
 class PolicyRecommender:
-    def __init__(self):
+    """
+    LLM-backed policy reviews.
+
+    Responses are cached (persistently when a cache path is given) and identical
+    requests in flight at the same time share one call. At most max_concurrency
+    requests run concurrently.
+    """
+
+    def __init__(self, backend: Optional[str] = None, cache_path: Optional[str] = None, max_concurrency: Optional[int] = None):
+        self.llm = load_llm(backend)
+        self.max_concurrency = max_concurrency or int(os.environ.get(LLM_CONCURRENCY_ENV_VAR, "4"))
+        self.cache = ResponseCache(cache_path) if cache_path else None
+        # Hot responses in memory in front of the persistent cache
+        self._memory_cache = TTLCache(maxsize=512, ttl=24 * 3600)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+        self.stats = {"llm_calls": 0, "cache_hits": 0, "shared_in_flight": 0, "errors": 0}
+        self._parser = StrOutputParser()
+
+    def _model_key(self) -> str:
+        model = getattr(self.llm, "model_name", None) or getattr(self.llm, "model", None) or type(self.llm).__name__
+        return f"{model}@{getattr(self.llm, 'temperature', None)}"
+
+    def _limiter(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _complete(self, prompt: ChatPromptTemplate, variables: Dict[str, str]) -> str:
+        """Run one prompt through the cache, in-flight deduplication and the concurrency limit."""
+        messages = prompt.format_messages(**variables)
+        model = self._model_key()
+        rendered = "\n".join(f"{message.type}: {message.content}" for message in messages)
+        key = hashlib.sha256(f"{model}\n{rendered}".encode("utf-8")).hexdigest()
+
+        cached = self._memory_cache.get(key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+        call = self._in_flight.get(key)
+        if call is not None:
+            self.stats["shared_in_flight"] += 1
+        else:
+            # The call runs on its own, so a cancelled caller never cancels it for the others waiting on it
+            call = asyncio.ensure_future(self._call(key, model, messages))
+            self._in_flight[key] = call
+            call.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(call)
+
+    async def _call(self, key: str, model: str, messages) -> str:
+        # The SQLite cache is read and written off the event loop, like the other blocking work
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                self.stats["cache_hits"] += 1
+                self._memory_cache.set(key, cached)
+                return cached
         try:
-            self.llm = ChatOpenAI(model="gpt-4-turbo-preview", temperature=0.7)
-        except Exception as e:
-            print(f"Warning: Could not initialize ChatOpenAI: {e}")
-            self.llm = None
+            async with self._limiter():
+                self.stats["llm_calls"] += 1
+                with span("llm_call"):
+                    response = self._parser.invoke(await self.llm.ainvoke(messages))
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        self._memory_cache.set(key, response)
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.set, key, model, response)
+        return response
+
+    def _finished(self, key: str, call: asyncio.Future) -> None:
+        del self._in_flight[key]
+        # Errors are not cached; retrieve it here so a failure nobody else awaited is not logged
+        if not call.cancelled():
+            call.exception()
 
     async def suggest_updates(self, policy_content: str, context: str = "") -> str:
         """
@@ -21,33 +351,40 @@ class PolicyRecommender:
         if not self.llm:
             return "Error: OpenAI API Key not found. Cannot generate recommendations."
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are an expert in organizational governance and software engineering best practices. Analyze the provided policy and suggest improvements."),
-            ("user", "Context: {context}\n\nCurrent Policy:\n{policy_content}\n\nPlease suggest specific updates to improve clarity, coverage, and enforcement.")
-        ])
-
-        chain = prompt | self.llm | StrOutputParser()
-        
         try:
-            return await chain.ainvoke({"policy_content": policy_content, "context": context})
+            return await self._complete(SUGGEST_PROMPT, {"policy_content": policy_content, "context": context})
         except Exception as e:
             return f"Error generating recommendations: {e}"
 
+    async def suggest_updates_batch(self, documents: Dict[str, str]) -> Dict[str, str]:
+        """
+        Review many policies at once ({name: content} -> {name: suggestions}).
+        Requests run concurrently up to max_concurrency; unchanged documents are served from the cache.
+        """
+        names = list(documents)
+        results = await asyncio.gather(
+            *(self.suggest_updates(documents[name], context=f"Reviewing {name}") for name in names)
+        )
+        return dict(zip(names, results))
+
     async def analyze_violations(self, violations: List[str]) -> str:
         """
         Analyze a list of violations to suggest systemic policy changes.
+        Violations are clustered first, so only weighted representatives reach the prompt.
         """
         if not self.llm:
             return "Error: OpenAI API Key not found."
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are a Governance Analyst. Review the following list of compliance violations and suggest policy changes to prevent them."),
-            ("user", "Violations:\n{violations}\n\nSuggest 3-5 policy updates or new standards to address these recurring issues.")
-        ])
-
-        chain = prompt | self.llm | StrOutputParser()
-        
         try:
-            return await chain.ainvoke({"violations": "\n".join(violations)})
+            clusters = await asyncio.to_thread(cluster_violations, violations)
+            return await self._complete(VIOLATIONS_PROMPT, {"violations": format_clusters(clusters)})
         except Exception as e:
             return f"Error analyzing violations: {e}"
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "cached_responses": len(self.cache) if self.cache is not None else len(self._memory_cache),
+            "in_flight": len(self._in_flight),
+            "max_concurrency": self.max_concurrency,
+        }
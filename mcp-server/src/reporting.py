@@ -1,7 +1,16 @@
+import csv
 import datetime
-from typing import Dict, Any
+import io
+import json
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+# Columns of the CSV report, one row per repository
+CSV_COLUMNS = ["repository", "compliant", "score", "violations", "issues"]
+
 
 class ComplianceReporter:
+    FORMATS = ("markdown", "json", "csv")
+
     def __init__(self):
         pass
 
@@ -9,36 +18,85 @@ class ComplianceReporter:
         """
         Generate a compliance report based on the provided data.
         """
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        if format == "markdown":
-            return self._generate_markdown_report(data, timestamp)
-        else:
+        if format not in self.FORMATS:
             return "Unsupported format"
+        buffer = io.StringIO()
+        self.write_report(data, buffer, format)
+        return buffer.getvalue()
+
+    def write_report(
+        self, data: Dict[str, Any], stream: TextIO, format: str = "markdown", timestamp: Optional[str] = None
+    ):
+        """Stream a report to a file-like object, one repository row at a time."""
+        for piece in self.iter_report(data, format, timestamp):
+            stream.write(piece)
+
+    def iter_report(self, data: Dict[str, Any], format: str = "markdown", timestamp: Optional[str] = None) -> Iterator[str]:
+        """
+        Yield the report in pieces. ``data["repositories"]`` may be any iterable
+        (e.g. a generator of results), so large reports never sit in memory whole.
+        """
+        timestamp = timestamp or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if format == "markdown":
+            return self._iter_markdown(data, timestamp)
+        if format == "json":
+            return self._iter_json(data, timestamp)
+        if format == "csv":
+            return self._iter_csv(data)
+        raise ValueError(f"Unsupported format: {format}")
 
     def _generate_markdown_report(self, data: Dict[str, Any], timestamp: str) -> str:
-        report = f"# Compliance Report\n\n"
-        report += f"**Generated**: {timestamp}\n\n"
-        
-        report += "## Executive Summary\n"
-        report += f"- **Overall Health Score**: {data.get('health_score', 'N/A')}\n"
-        report += f"- **Active Violations**: {data.get('active_violations', 0)}\n"
-        report += f"- **Compliant Repositories**: {data.get('compliant_repos', 0)}/{data.get('total_repos', 0)}\n\n"
-        
-        report += "## Repository Status\n\n"
-        report += "| Repository | Status | Issues |\n"
-        report += "|Data | --- | --- |\n"
-        
+        return "".join(self._iter_markdown(data, timestamp))
+
+    def _iter_markdown(self, data: Dict[str, Any], timestamp: str) -> Iterator[str]:
+        yield "# Compliance Report\n\n"
+        yield f"**Generated**: {timestamp}\n\n"
+
+        yield "## Executive Summary\n"
+        yield f"- **Overall Health Score**: {data.get('health_score', 'N/A')}\n"
+        yield f"- **Active Violations**: {data.get('active_violations', 0)}\n"
+        yield f"- **Compliant Repositories**: {data.get('compliant_repos', 0)}/{data.get('total_repos', 0)}\n\n"
+
+        yield "## Repository Status\n\n"
+        yield "| Repository | Status | Issues |\n"
+        yield "| --- | --- | --- |\n"
+
         for repo in data.get('repositories', []):
             status = "✅" if repo.get('compliant') else "❌"
             issues = ", ".join(repo.get('issues', [])) or "None"
-            report += f"| {repo.get('name')} | {status} | {issues} |\n"
-            
-        report += "\n## Recommendations\n"
+            yield f"| {repo.get('name')} | {status} | {issues} |\n"
+
+        yield "\n## Recommendations\n"
         for rec in data.get('recommendations', []):
-            report += f"- {rec}\n"
-            
-        return report
+            yield f"- {rec}\n"
+
+    def _iter_json(self, data: Dict[str, Any], timestamp: str) -> Iterator[str]:
+        summary = {key: value for key, value in data.items() if key not in ("repositories", "recommendations")}
+        yield json.dumps({"generated": timestamp, **summary})[:-1]
+        yield ', "repositories": ['
+        for i, repo in enumerate(data.get('repositories', [])):
+            yield ("" if i == 0 else ", ") + json.dumps(repo)
+        yield f'], "recommendations": {json.dumps(list(data.get("recommendations", [])))}}}\n'
+
+    def _iter_csv(self, data: Dict[str, Any]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def row(values: List[Any]) -> str:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(values)
+            return buffer.getvalue()
+
+        yield row(CSV_COLUMNS)
+        for repo in data.get('repositories', []):
+            yield row([
+                repo.get('name'),
+                "true" if repo.get('compliant') else "false",
+                repo.get('score', ""),
+                len(repo.get('issues', [])),
+                "; ".join(repo.get('issues', [])),
+            ])
 
 # Mock data provider for demonstration
 def get_mock_compliance_data():
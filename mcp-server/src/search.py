@@ -1,89 +1,556 @@
+import hashlib
+import json
+import multiprocessing
 import os
-from typing import List, Dict, Any
-from langchain_community.document_loaders import DirectoryLoader, TextLoader
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Optional
+from langchain_community.vectorstores import Chroma
+from langchain_core.embeddings import Embeddings
+
 try:
-    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from embeddings import load_embeddings, describe_embeddings
+    from vector_store import NumpyVectorStore
+    from lexical import BM25Index, reciprocal_rank_fusion
+    from cache import TTLCache
+    from jobs import ReadWriteLock
+    from metrics import span
+    from pipeline import (
+        StageTimings, StagingArea, batched, bounded_map, read_text, split_document
+    )
 except ImportError:
-    from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import Chroma
-from langchain_core.documents import Document
+    from .embeddings import load_embeddings, describe_embeddings
+    from .vector_store import NumpyVectorStore
+    from .lexical import BM25Index, reciprocal_rank_fusion
+    from .cache import TTLCache
+    from .jobs import ReadWriteLock
+    from .metrics import span
+    from .pipeline import (
+        StageTimings, StagingArea, batched, bounded_map, read_text, split_document
+    )
+
+# The manifest lives inside the persistence directory, next to the Chroma files,
+# and records what has already been embedded so reindexing only touches the diff.
+MANIFEST_FILENAME = "index_manifest.json"
+# Version 3: section-aware markdown chunks (older indexes are rebuilt)
+MANIFEST_VERSION = 3
+LEXICAL_INDEX_FILENAME = "lexical_index.json"
+# Heading outline of every indexed document, keyed by repo-relative path
+OUTLINES_FILENAME = "outlines.json"
+
+# Selects the vector store: "chroma" (default) or "numpy" (in-process, memory-mapped).
+VECTOR_STORE_ENV_VAR = "GOVERNANCE_VECTOR_STORE"
+VECTOR_STORE_BACKENDS = {"chroma": Chroma, "numpy": NumpyVectorStore}
+
+# "hybrid" fuses the vector and BM25 rankings with reciprocal rank fusion.
+SEARCH_MODES = ("hybrid", "vector", "keyword")
+
+# Indexing pipeline: chunks per embedding batch (which bounds peak memory) and
+# worker count for parallel reads/splits. Splitting moves to a process pool
+# only when enough files changed to pay for starting it.
+EMBED_BATCH_SIZE = 256
+INDEX_BATCH_SIZE_ENV_VAR = "GOVERNANCE_INDEX_BATCH_SIZE"
+INDEX_WORKERS_ENV_VAR = "GOVERNANCE_INDEX_WORKERS"
+PROCESS_POOL_MIN_FILES = 200
+
+# Query cache sizing; a size of 0 disables caching.
+SEARCH_CACHE_SIZE_ENV_VAR = "GOVERNANCE_SEARCH_CACHE_SIZE"
+SEARCH_CACHE_TTL_ENV_VAR = "GOVERNANCE_SEARCH_CACHE_TTL"
+
+
+class IndexingCancelled(Exception):
+    """Raised by index_documents when cancelled before the diff was applied."""
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, used as the cache key."""
+    return " ".join(query.lower().split())
+
+
+def chunk_ids_for(rel_path: str, count: int) -> List[str]:
+    """Stable vector IDs for the chunks of a document, derived from its repo-relative path."""
+    prefix = hashlib.sha1(rel_path.encode("utf-8")).hexdigest()[:16]
+    return [f"{prefix}:{i}" for i in range(count)]
+
+
+def discover_documents(root_dir: str) -> Dict[str, str]:
+    """Map repo-relative paths to absolute paths for every markdown file (hidden paths skipped)."""
+    root = Path(root_dir)
+    found = {}
+    for path in root.glob("**/*.md"):
+        rel_path = path.relative_to(root)
+        if any(part.startswith(".") for part in rel_path.parts) or not path.is_file():
+            continue
+        found[rel_path.as_posix()] = str(path)
+    return found
+
 
 class SemanticSearch:
-    def __init__(self, persistence_directory: str = "./chroma_db"):
+    def __init__(
+        self,
+        persistence_directory: str = "./chroma_db",
+        embedding_backend: Optional[str] = None,
+        vector_store_backend: Optional[str] = None,
+        embeddings: Optional[Any] = None,
+        query_embedding_cache: Optional[TTLCache] = None,
+    ):
+        """
+        embedding_backend selects "openai", "local" or "auto"; when omitted the
+        GOVERNANCE_EMBEDDINGS environment variable is used (default "auto").
+        vector_store_backend selects "chroma" or "numpy"; when omitted the
+        GOVERNANCE_VECTOR_STORE environment variable is used (default "chroma").
+        embeddings and query_embedding_cache let several indexes (the shards
+        of a ShardedSearch) share one embedder and its cached query vectors.
+        """
         self.persistence_directory = persistence_directory
-        try:
-            self.embeddings = OpenAIEmbeddings()
-        except Exception as e:
-            print(f"Warning: Could not initialize OpenAI Embeddings: {e}")
-            self.embeddings = None
-            
+        self.manifest_path = os.path.join(persistence_directory, MANIFEST_FILENAME)
+        self.embeddings = embeddings if embeddings is not None else load_embeddings(embedding_backend)
+
+        self.vector_store_backend = (vector_store_backend or os.environ.get(VECTOR_STORE_ENV_VAR) or "chroma").lower()
+        if self.vector_store_backend not in VECTOR_STORE_BACKENDS:
+            raise ValueError(
+                f"Unknown vector store '{self.vector_store_backend}'. "
+                f"Expected one of: {', '.join(VECTOR_STORE_BACKENDS)}"
+            )
+
         self.vector_store = None
+        # Read-only store for chunk text when searching without embeddings (see _chunk_texts)
+        self._text_store = None
+        self.indexed_embeddings = self._load_manifest().get("embeddings")
+        self.lexical_index_path = os.path.join(persistence_directory, LEXICAL_INDEX_FILENAME)
+        self.lexical_index = BM25Index.load(self.lexical_index_path)
+        self.outlines_path = os.path.join(persistence_directory, OUTLINES_FILENAME)
+        self.outlines = self._load_outlines()
         if self.embeddings:
             self._load_vector_store()
 
+        # Searches read under this lock; index_documents only takes it to apply a finished diff.
+        self._index_lock = ReadWriteLock()
+        # Bumped whenever index_documents changes the index; part of every result cache key.
+        self.generation = 0
+        cache_size = int(os.environ.get(SEARCH_CACHE_SIZE_ENV_VAR, "256"))
+        cache_ttl = float(os.environ.get(SEARCH_CACHE_TTL_ENV_VAR, "300"))
+        if query_embedding_cache is None:
+            query_embedding_cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self.query_embedding_cache = query_embedding_cache
+        self.result_cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+
     def _load_vector_store(self):
         """Load the vector store from disk if it exists."""
-        if os.path.exists(self.persistence_directory):
-            self.vector_store = Chroma(
+        self.vector_store = self._open_vector_store(self.embeddings)
+
+    def _open_vector_store(self, embeddings: Optional[Embeddings]):
+        """The persisted vector store, or None if there is none yet (it is created on index)."""
+        if self.vector_store_backend == "numpy":
+            if NumpyVectorStore.exists(self.persistence_directory):
+                return NumpyVectorStore(persist_directory=self.persistence_directory, embedding_function=embeddings)
+        elif os.path.exists(self.persistence_directory):
+            return Chroma(persist_directory=self.persistence_directory, embedding_function=embeddings)
+        return None
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load the index manifest, or an empty one if none has been written yet."""
+        if not os.path.exists(self.manifest_path):
+            return {"version": MANIFEST_VERSION, "files": {}}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {"version": MANIFEST_VERSION, "files": {}}
+        return manifest
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        """Atomically write the index manifest."""
+        os.makedirs(self.persistence_directory, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _load_outlines(self) -> Dict[str, List[Dict[str, Any]]]:
+        if not os.path.exists(self.outlines_path):
+            return {}
+        with open(self.outlines_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_outlines(self, outlines: Dict[str, List[Dict[str, Any]]]):
+        os.makedirs(self.persistence_directory, exist_ok=True)
+        tmp_path = f"{self.outlines_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(outlines, f)
+        os.replace(tmp_path, self.outlines_path)
+
+    def outline(self, rel_path: str) -> List[Dict[str, Any]]:
+        """Precomputed heading outline (anchors, line and byte ranges) of an indexed document."""
+        return self.outlines.get(rel_path, [])
+
+    def index_documents(
+        self,
+        root_dir: str,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        batch_size: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Incrementally index all markdown files in the governance repo.
+
+        Files whose mtime/size or content hash match the manifest are skipped;
+        only new or changed files are split and embedded, and the vectors of
+        changed or removed files are deleted by their stable chunk IDs.
+        Returns counts of files added, updated, deleted and skipped, plus
+        per-stage timings and throughput.
+
+        Changed files stream through a pipeline: parallel reads, splitting
+        along the markdown heading structure (on a process pool for large
+        diffs), which also yields each document's outline, embedding in fixed-size batches
+        and batched spills to a staging area, so peak memory is bounded by
+        batch_size rather than the corpus. Searches keep using the current
+        index until the staged diff is applied under the write lock.
+        progress receives phase/count/ETA updates; if should_cancel returns
+        True before the diff is applied, IndexingCancelled is raised and the
+        index is left untouched.
+        """
+        report = progress or (lambda update: None)
+        batch_size = batch_size or int(os.environ.get(INDEX_BATCH_SIZE_ENV_VAR, str(EMBED_BATCH_SIZE)))
+        workers = workers or int(os.environ.get(INDEX_WORKERS_ENV_VAR, str(min(8, os.cpu_count() or 1))))
+        timings = StageTimings()
+
+        def check_cancelled():
+            if should_cancel and should_cancel():
+                raise IndexingCancelled("Indexing cancelled; the existing index was left unchanged.")
+
+        manifest = self._load_manifest()
+        previous = manifest["files"]
+        signature = describe_embeddings(self.embeddings)
+        # Progress and stats go to the caller (the reindex job status or the CLI), never
+        # to stdout: inside the server that is the MCP stdio channel
+        rebuild_reason = None
+        if previous and manifest.get("embeddings") != signature:
+            # Vectors from another embedding backend are not comparable, so start over.
+            rebuild_reason = f"embedding backend changed ({manifest.get('embeddings')} -> {signature})"
+            previous = {}
+        if previous and manifest.get("vector_store", "chroma") != self.vector_store_backend:
+            rebuild_reason = f"vector store changed to {self.vector_store_backend}"
+            previous = {}
+        # An index built before the manifest existed (or with another backend)
+        # has no reusable vectors, so it is rebuilt once from scratch.
+        rebuild = not previous
+        if not self.embeddings:
+            print("Warning: No embedding backend available; building the keyword index only.", file=sys.stderr)
+
+        stats = {"added": 0, "updated": 0, "deleted": 0, "skipped": 0, "chunks": 0, "rebuild": rebuild_reason}
+        if rebuild_reason:
+            report({"rebuild": rebuild_reason})
+        files = {}
+        stale_ids = []
+        outlines = {}
+
+        # Stage 1: find files whose mtime/size changed (stat only, no reads)
+        started = time.perf_counter()
+        current = discover_documents(root_dir)
+        candidates = []
+        for rel_path, path in sorted(current.items()):
+            stat = os.stat(path)
+            entry = previous.get(rel_path)
+            if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                files[rel_path] = entry
+                stats["skipped"] += 1
+            else:
+                candidates.append((rel_path, path, stat, entry))
+        for rel_path in previous.keys() - current.keys():
+            stale_ids.extend(previous[rel_path]["chunk_ids"])
+            stats["deleted"] += 1
+        timings.add("discover", time.perf_counter() - started, len(current))
+        report({"phase": "loading", "files_total": len(candidates), "files_loaded": 0, "chunks_embedded": 0})
+
+        def changed_documents(read_pool):
+            """Stage 2: read candidates in parallel, keeping only files whose content changed."""
+            paths = ((path,) for _, path, _, _ in candidates)
+            reads = bounded_map(read_text, paths, read_pool, max_in_flight=workers * 4)
+            for files_loaded, ((rel_path, path, stat, entry), (_, text, seconds)) in enumerate(
+                zip(candidates, reads), start=1
+            ):
+                check_cancelled()
+                timings.add("read", seconds)
+                elapsed = time.perf_counter() - started
+                report({
+                    "files_loaded": files_loaded,
+                    "eta_seconds": elapsed / files_loaded * (len(candidates) - files_loaded),
+                })
+                digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                if entry and entry["sha256"] == digest:
+                    # Touched but unchanged: refresh the stat fields only.
+                    files[rel_path] = {**entry, "mtime": stat.st_mtime, "size": stat.st_size}
+                    stats["skipped"] += 1
+                    continue
+                if entry:
+                    stale_ids.extend(entry["chunk_ids"])
+                    stats["updated"] += 1
+                else:
+                    stats["added"] += 1
+                files[rel_path] = {"mtime": stat.st_mtime, "size": stat.st_size, "sha256": digest}
+                yield path, text
+
+        def chunk_stream(read_pool, split_pool):
+            """Stage 3: split changed documents into chunks with stable IDs."""
+            path_to_rel = {path: rel_path for rel_path, path, _, _ in candidates}
+            splits = bounded_map(split_document, changed_documents(read_pool), split_pool, max_in_flight=workers * 2)
+            for (path, _), (pieces, document_outline), seconds in splits:
+                timings.add("split", seconds)
+                rel_path = path_to_rel[path]
+                outlines[rel_path] = document_outline
+                ids = chunk_ids_for(rel_path, len(pieces))
+                files[rel_path]["chunk_ids"] = ids
+                for chunk_id, (text, metadata) in zip(ids, pieces):
+                    yield chunk_id, text, {**metadata, "chunk_id": chunk_id}
+
+        staging = StagingArea(self.persistence_directory)
+        read_pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 and candidates else None
+        split_pool = None
+        if workers > 1 and len(candidates) >= PROCESS_POOL_MIN_FILES:
+            split_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            # Stages 4 and 5: embed fixed-size batches and spill each one to the staging area
+            for batch in batched(chunk_stream(read_pool, split_pool), batch_size):
+                check_cancelled()
+                ids, texts, metadatas = (list(column) for column in zip(*batch))
+                vectors = None
+                if self.embeddings:
+                    t0 = time.perf_counter()
+                    vectors = self.embeddings.embed_documents(texts)
+                    timings.add("embed", time.perf_counter() - t0, len(texts))
+                t0 = time.perf_counter()
+                staging.append(ids, texts, metadatas, vectors)
+                timings.add("stage", time.perf_counter() - t0, len(texts))
+                stats["chunks"] += len(texts)
+                report({"phase": "embedding", "chunks_embedded": stats["chunks"]})
+        except BaseException:
+            staging.cleanup()
+            raise
+        finally:
+            for pool in (read_pool, split_pool):
+                if pool:
+                    pool.shutdown(wait=False, cancel_futures=True)
+
+        report({key: stats[key] for key in ("added", "updated", "deleted", "skipped")})
+
+        try:
+            check_cancelled()
+            report({"phase": "applying"})
+            with self._index_lock.write():
+                t0 = time.perf_counter()
+                self._text_store = None
+                if rebuild:
+                    if self.vector_store is not None:
+                        self.vector_store.delete_collection()
+                        self.vector_store = None
+                    self.lexical_index.clear()
+
+                # Apply the diff to the keyword index and vector store, one staged batch at a time
+                self.lexical_index.remove(stale_ids)
+                if stale_ids and self.vector_store:
+                    self.vector_store.delete(ids=stale_ids)
+                for ids, texts, metadatas, vectors in staging.batches():
+                    # The vector store holds the text of embedded chunks; only keyword-only chunks keep theirs here
+                    self.lexical_index.add(ids, texts, metadatas, keep_text=vectors is None)
+                    if vectors is not None:
+                        self._write_vectors(ids, texts, metadatas, vectors)
+                if isinstance(self.vector_store, NumpyVectorStore):
+                    # Publish the staged writes as one atomic snapshot
+                    self.vector_store.flush()
+
+                if rebuild or outlines or stats["deleted"]:
+                    kept = {} if rebuild else {path: o for path, o in self.outlines.items() if path in files}
+                    self.outlines = {**kept, **outlines}
+                    self._save_outlines(self.outlines)
+
+                manifest["files"] = files
+                manifest["embeddings"] = signature
+                manifest["vector_store"] = self.vector_store_backend
+                if rebuild or stale_ids or stats["chunks"]:
+                    self.lexical_index.save(self.lexical_index_path)
+                self._save_manifest(manifest)
+                self.indexed_embeddings = signature
+                if stats["added"] or stats["updated"] or stats["deleted"]:
+                    self.generation += 1
+                    self.result_cache.clear()
+                timings.add("write", time.perf_counter() - t0, stats["chunks"])
+        finally:
+            staging.cleanup()
+
+        stats["timings"] = timings.summary()
+        report({"phase": "done"})
+        return stats
+
+    def _write_vectors(self, ids: List[str], texts: List[str], metadatas: List[dict], vectors: List[List[float]]):
+        """Write precomputed embeddings to the vector store, creating it if needed."""
+        if self.vector_store is None:
+            self.vector_store = VECTOR_STORE_BACKENDS[self.vector_store_backend](
                 persist_directory=self.persistence_directory,
                 embedding_function=self.embeddings
             )
+        if isinstance(self.vector_store, NumpyVectorStore):
+            self.vector_store.add_embeddings(texts, vectors, metadatas=metadatas, ids=ids)
         else:
-            # Initialize empty if not found, will be created on index
-            pass
-
-    def index_documents(self, root_dir: str):
-        """Index all markdown files in the governance repo."""
-        print(f"Indexing documents from {root_dir}...")
-        
-        # Load Markdown files
-        loader = DirectoryLoader(
-            root_dir,
-            glob="**/*.md",
-            loader_cls=TextLoader,
-            show_progress=True,
-            use_multithreading=True
-        )
-        documents = loader.load()
-        
-        print(f"Loaded {len(documents)} documents.")
-
-        # Split documents
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            add_start_index=True,
-        )
-        chunks = text_splitter.split_documents(documents)
-        
-        print(f"Split into {len(chunks)} chunks.")
+            # LangChain's Chroma wrapper only accepts raw texts, so upsert the
+            # precomputed embeddings through the underlying collection.
+            self.vector_store._collection.upsert(ids=ids, embeddings=vectors, documents=texts, metadatas=metadatas)
 
-        # Create/Update Vector Store
-        if self.vector_store:
-            self.vector_store.add_documents(chunks)
-        else:
-            self.vector_store = Chroma.from_documents(
-                documents=chunks,
-                embedding=self.embeddings,
-                persist_directory=self.persistence_directory
-            )
-        
-        print("Indexing complete.")
+    def build_ann_index(self, **kwargs) -> Dict[str, Any]:
+        """
+        Build the approximate nearest-neighbor index (IVF with quantized codes,
+        see ann.py) over the vectors of a numpy vector store; kwargs go to
+        IVFIndex.train. Training runs outside the index lock, so searches and
+        re-indexing keep running; the new index is swapped in like any other
+        write, and refused if the vectors changed in the meantime.
+        """
+        if not isinstance(self.vector_store, NumpyVectorStore):
+            raise ValueError("ANN indexes need the numpy vector store with an existing index (GOVERNANCE_VECTOR_STORE=numpy)")
+        with self._index_lock.read():
+            generation = self.generation
+            vector_store, vectors = self.vector_store, self.vector_store.vectors
+        # Not under the read lock: a queued writer blocks new readers, so searches would stall behind training
+        ann = vector_store.train_ann(vectors, **kwargs)
+        with self._index_lock.write():
+            if self.generation != generation or self.vector_store is not vector_store:
+                raise RuntimeError("The index changed while the ANN index was trained; build it again")
+            stats = vector_store.install_ann(ann)
+            self.generation += 1
+            self.result_cache.clear()
+        return stats
 
-    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """Perform semantic search."""
-        if not self.vector_store:
-            return [{"error": "Index not found. Please run indexing first."}]
+    def _vector_ready(self) -> bool:
+        """Whether the vector store exists and was built with the current embedding backend."""
+        return (
+            self.vector_store is not None
+            and self.embeddings is not None
+            and self.indexed_embeddings == describe_embeddings(self.embeddings)
+        )
 
-        results = self.vector_store.similarity_search_with_score(query, k=limit)
-        
-        formatted_results = []
-        for doc, score in results:
-            formatted_results.append({
+    def _embed_query(self, query: str) -> List[float]:
+        """Embed a query, reusing the cached vector for repeated queries."""
+        key = normalize_query(query)
+        vector = self.query_embedding_cache.get(key)
+        if vector is None:
+            with span("embed_query"):
+                vector = self.embeddings.embed_query(query)
+            self.query_embedding_cache.set(key, vector)
+        return vector
+
+    def _vector_search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        vector = self._embed_query(query)
+        with span("vector_search"):
+            results = self.vector_store.similarity_search_by_vector_with_relevance_scores(vector, k=limit)
+        return [
+            {
                 "content": doc.page_content,
                 "source": doc.metadata.get("source", "unknown"),
-                "score": score
+                "section": doc.metadata.get("section", ""),
+                "anchor": doc.metadata.get("anchor", ""),
+                "score": score,
+                "chunk_id": doc.metadata.get("chunk_id"),
+            }
+            for doc, score in results
+        ]
+
+    def _keyword_search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        results = []
+        with span("keyword_search"):
+            hits = self.lexical_index.search(query, k=limit)
+            texts = self._chunk_texts([
+                chunk_id for chunk_id, _ in hits if "text" not in self.lexical_index.chunks[chunk_id]
+            ])
+        for chunk_id, score in hits:
+            chunk = self.lexical_index.chunks[chunk_id]
+            results.append({
+                "content": chunk.get("text", texts.get(chunk_id, "")),
+                "source": chunk["metadata"].get("source", "unknown"),
+                "section": chunk["metadata"].get("section", ""),
+                "anchor": chunk["metadata"].get("anchor", ""),
+                "score": score,
+                "chunk_id": chunk_id,
             })
-            
-        return formatted_results
+        return results
+
+    def _chunk_texts(self, ids: List[str]) -> Dict[str, str]:
+        """Text of embedded chunks by ID, read from the vector store (opened without embeddings if need be)."""
+        if not ids:
+            return {}
+        store = self.vector_store
+        if store is None:
+            if self._text_store is None:
+                self._text_store = self._open_vector_store(None)
+            store = self._text_store
+        if store is None:
+            return {}
+        if isinstance(store, NumpyVectorStore):
+            return {doc.id: doc.page_content for doc in store.get_by_ids(ids)}
+        found = store.get(ids=ids)
+        return dict(zip(found["ids"], found["documents"]))
+
+    def search(self, query: str, limit: int = 5, mode: str = "hybrid") -> List[Dict[str, Any]]:
+        """
+        Search the governance docs.
+
+        mode is "vector" (dense similarity, lower score is closer), "keyword"
+        (BM25, higher is better) or "hybrid" (reciprocal rank fusion of both,
+        higher is better). Without a usable vector index, keyword results are
+        returned regardless of mode.
+        """
+        if mode not in SEARCH_MODES:
+            return [{"error": f"Unknown search mode '{mode}'. Expected one of: {', '.join(SEARCH_MODES)}"}]
+
+        key = (normalize_query(query), limit, mode, self.generation)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        with self._index_lock.read():
+            results = self._search_uncached(query, limit, mode)
+        if not results or "error" not in results[0]:
+            self.result_cache.set(key, results)
+        return list(results)
+
+    def _search_uncached(self, query: str, limit: int, mode: str) -> List[Dict[str, Any]]:
+
+        keyword_ready = len(self.lexical_index) > 0
+        if mode != "keyword" and not self._vector_ready():
+            mode = "keyword"
+        elif mode != "vector" and not keyword_ready and self._vector_ready():
+            mode = "vector"
+        if mode == "keyword" and not keyword_ready:
+            if self.vector_store and self.indexed_embeddings:
+                return [{"error": f"Index was built with embeddings '{self.indexed_embeddings}'. Please re-run indexing."}]
+            return [{"error": "Index not found. Please run indexing first."}]
+
+        if mode == "vector":
+            return self._vector_search(query, limit)
+        if mode == "keyword":
+            return self._keyword_search(query, limit)
+
+        # Hybrid: fuse deeper candidate lists from both retrievers
+        depth = max(limit * 4, 20)
+        candidates = {}
+        rankings = []
+        for results in (self._vector_search(query, depth), self._keyword_search(query, depth)):
+            ranking = []
+            for item in results:
+                key = item["chunk_id"] or item["content"]
+                candidates.setdefault(key, item)
+                ranking.append(key)
+            rankings.append(ranking)
+
+        return [
+            {**candidates[key], "score": score}
+            for key, score in reciprocal_rank_fusion(rankings)[:limit]
+        ]
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters for the query embedding and result caches."""
+        return {
+            "generation": self.generation,
+            "query_embeddings": self.query_embedding_cache.stats(),
+            "results": self.result_cache.stats(),
+        }
@@ -0,0 +1,260 @@
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Markdown structure shared by the catalog (document outlines) and the indexer
+# (section-aware chunks). Kept free of heavy imports for process-pool workers.
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})[ \t]+(.+?)[ \t]*#*[ \t]*$")
+FENCE_PATTERN = re.compile(r"^[ \t]*(```|~~~)")
+TABLE_PATTERN = re.compile(r"^[ \t]*\|")
+
+# Joins heading titles in section paths and citations
+SECTION_SEPARATOR = " › "
+# Target chunk size; tables and code fences are never split, even when larger
+SECTION_CHUNK_CHARS = 1500
+# Sections shorter than this are packed together with the following ones
+SECTION_MIN_CHARS = 800
+
+
+def slugify(title: str) -> str:
+    """GitHub-style heading anchor: lowercase, punctuation dropped, spaces to hyphens."""
+    return re.sub(r"[^\w\- ]", "", title.strip().lower()).replace(" ", "-")
+
+
+class _Anchors:
+    """Hands out unique anchors, suffixing repeats with -1, -2, ... like GitHub."""
+
+    def __init__(self):
+        self._seen: Dict[str, int] = {}
+
+    def __call__(self, title: str) -> str:
+        slug = slugify(title)
+        count = self._seen.get(slug, 0)
+        self._seen[slug] = count + 1
+        return slug if count == 0 else f"{slug}-{count}"
+
+
+@dataclass
+class Section:
+    level: int
+    title: str
+    line: int  # 1-based line number of the heading
+    offset: int  # byte offset of the heading line
+    anchor: str = ""
+    path: List[str] = field(default_factory=list)  # heading titles from the top level down to this one
+    end_line: int = 0  # last line of the section, subsections included
+    end_offset: int = 0  # byte offset where the section (with its subsections) ends
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "level": self.level,
+            "title": self.title,
+            "anchor": self.anchor,
+            "path": SECTION_SEPARATOR.join(self.path),
+            "line": self.line,
+            "end_line": self.end_line,
+            "offset": self.offset,
+            "end_offset": self.end_offset,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Section":
+        path = data.get("path") or ""
+        return cls(
+            level=data["level"],
+            title=data["title"],
+            line=data["line"],
+            offset=data["offset"],
+            anchor=data.get("anchor", ""),
+            path=path.split(SECTION_SEPARATOR) if path else [],
+            end_line=data.get("end_line", 0),
+            end_offset=data.get("end_offset", 0),
+        )
+
+
+def outline(data: bytes) -> List[Section]:
+    """Heading outline of a markdown document (code fences skipped) with byte and line ranges."""
+    sections: List[Section] = []
+    anchors = _Anchors()
+    in_fence = False
+    offset = 0
+    line_no = 0
+    for line_no, raw in enumerate(data.splitlines(keepends=True), start=1):
+        line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            match = HEADING_PATTERN.match(line)
+            if match:
+                title = match.group(2)
+                sections.append(Section(len(match.group(1)), title, line_no, offset, anchors(title)))
+        offset += len(raw)
+
+    # Paths and ranges: a section runs until the next heading at the same or a higher level
+    stack: List[Section] = []
+    for section in sections:
+        while stack and stack[-1].level >= section.level:
+            closed = stack.pop()
+            closed.end_line, closed.end_offset = section.line - 1, section.offset
+        section.path = [s.title for s in stack] + [section.title]
+        stack.append(section)
+    for section in stack:
+        section.end_line, section.end_offset = line_no, offset
+    return sections
+
+
+def find_section(sections: List[Section], key: str) -> Optional[Section]:
+    """Look a section up by anchor, title or full path (case-insensitive)."""
+    key = key.strip().lstrip("#").strip()
+    slug = slugify(key)
+    lowered = key.lower()
+    for section in sections:
+        if section.anchor == key or section.anchor == slug:
+            return section
+    for section in sections:
+        if section.title.lower() == lowered or SECTION_SEPARATOR.join(section.path).lower() == lowered:
+            return section
+    return None
+
+
+def _blocks(lines: List[str]) -> List[Tuple[str, int, int, Optional[Tuple[int, str]]]]:
+    """Split lines into (kind, first_line, end_line, heading) blocks: heading, fence, table or text."""
+    blocks = []
+    i = 0
+    n = len(lines)
+    while i < n:
+        line = lines[i].rstrip("\r\n")
+        if not line.strip():
+            i += 1
+            continue
+        fence = FENCE_PATTERN.match(line)
+        if fence:
+            j = i + 1
+            while j < n and not lines[j].lstrip().startswith(fence.group(1)):
+                j += 1
+            blocks.append(("fence", i, min(j + 1, n), None))
+            i = j + 1
+            continue
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            blocks.append(("heading", i, i + 1, (len(heading.group(1)), heading.group(2))))
+            i += 1
+            continue
+        kind = "table" if TABLE_PATTERN.match(line) else "text"
+        j = i + 1
+        while j < n:
+            nxt = lines[j].rstrip("\r\n")
+            if not nxt.strip() or FENCE_PATTERN.match(nxt) or HEADING_PATTERN.match(nxt):
+                break
+            if (kind == "table") != bool(TABLE_PATTERN.match(nxt)):
+                break
+            j += 1
+        blocks.append((kind, i, j, None))
+        i = j
+    return blocks
+
+
+def _split_long(starts: List[int], first: int, end: int, max_chars: int) -> List[Tuple[int, int]]:
+    """Character ranges of at most max_chars covering lines [first, end), cut at line boundaries when possible."""
+    ranges = []
+    start = starts[first]
+    for i in range(first, end):
+        line_end = starts[i + 1]
+        if line_end - start <= max_chars:
+            continue
+        if starts[i] > start:
+            ranges.append((start, starts[i]))
+            start = starts[i]
+        while line_end - start > max_chars:
+            ranges.append((start, start + max_chars))
+            start += max_chars
+    if starts[end] > start:
+        ranges.append((start, starts[end]))
+    return ranges
+
+
+def split_markdown(
+    text: str, max_chars: int = SECTION_CHUNK_CHARS, min_chars: int = SECTION_MIN_CHARS
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Split a markdown document into ``(chunk_text, metadata)`` pairs along its heading structure.
+
+    Chunks start at headings. A heading with no body of its own is merged
+    into the chunk that follows it, and sections shorter than min_chars are
+    packed with the next ones (the chunk is attributed to their common parent
+    section). Sections longer than max_chars are cut between blocks without
+    overlap; tables and code fences are kept whole. Metadata carries
+    ``start_index``, ``line``, the heading ``section`` path and its ``anchor``.
+    """
+    lines = text.splitlines(keepends=True)
+    starts = [0]
+    for line in lines:
+        starts.append(starts[-1] + len(line))
+
+    chunks: List[Tuple[str, Dict[str, Any]]] = []
+    anchors = _Anchors()
+    stack: List[Tuple[int, str, str]] = []  # (level, title, anchor)
+    current: Optional[Dict[str, Any]] = None
+
+    def start_chunk(position: int) -> Dict[str, Any]:
+        return {"start": position, "end": position, "has_body": False, "path": list(stack)}
+
+    def flush():
+        if current is None:
+            return
+        content = text[current["start"]:current["end"]].strip()
+        if content:
+            path = current["path"]
+            chunks.append((content, {
+                "section": SECTION_SEPARATOR.join(title for _, title, _ in path),
+                "anchor": path[-1][2] if path else "",
+                "heading_level": path[-1][0] if path else 0,
+                "start_index": current["start"],
+                "line": bisect_right(starts, current["start"]),
+            }))
+
+    for kind, first, end, heading in _blocks(lines):
+        if kind == "heading":
+            level, title = heading
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, title, anchors(title)))
+            if current is not None and current["has_body"] and current["end"] - current["start"] >= min_chars:
+                flush()
+                current = None
+            if current is None:
+                current = start_chunk(starts[first])
+            elif not current["has_body"]:
+                # A run of headings without body takes the path of the deepest one
+                current["path"] = list(stack)
+            else:
+                # Small sections are packed together under their common parent
+                common = 0
+                while common < min(len(current["path"]), len(stack)) and current["path"][common] == stack[common]:
+                    common += 1
+                current["path"] = current["path"][:common]
+            current["end"] = starts[end]
+            continue
+
+        if kind in ("fence", "table") or starts[end] - starts[first] <= max_chars:
+            pieces = [(starts[first], starts[end])]
+        else:
+            pieces = _split_long(starts, first, end, max_chars)
+        for piece_start, piece_end in pieces:
+            if current is None:
+                current = start_chunk(piece_start)
+            elif current["has_body"] and piece_end - current["start"] > max_chars:
+                flush()
+                current = start_chunk(piece_start)
+            current["end"] = piece_end
+            current["has_body"] = True
+    flush()
+    return chunks
+
+
+def citation(source: str, section: str) -> str:
+    """Citation label for a search result: the file name, then the section path."""
+    name = source.replace("\\", "/").split("/")[-1]
+    return f"{name}{SECTION_SEPARATOR}{section}" if section else name
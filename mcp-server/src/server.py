@@ -1,10 +1,55 @@
-from mcp.server.fastmcp import FastMCP
-from fastapi import FastAPI
-import uvicorn
+import asyncio
 import os
 
-# Initialize MCP Server
-mcp = FastMCP("governance-mcp")
+# Subsystems are built on first use (or by the optional warm-up), so a client that
+# only reads documents never pays for embeddings, the vector store or LangChain.
+try:
+    from startup import WARMUP_ENV_VAR, Subsystem, Subsystems
+except ImportError:
+    from .startup import WARMUP_ENV_VAR, Subsystem, Subsystems
+subsystems = Subsystems()
+
+try:
+    from metrics import metrics
+    from transport import HTTP_TRANSPORTS, TRANSPORT_ENV_VAR, GovernanceMCP, HttpSettings, serve
+except ImportError:
+    from .metrics import metrics
+    from .transport import HTTP_TRANSPORTS, TRANSPORT_ENV_VAR, GovernanceMCP, HttpSettings, serve
+
+# Initialize MCP Server; host and port only matter when serving over HTTP
+http_settings = HttpSettings.from_env()
+mcp = GovernanceMCP("governance-mcp", host=http_settings.host, port=http_settings.port)
+
+async def use(subsystem: Subsystem):
+    """A subsystem's instance; a first-use build runs off the event loop."""
+    if subsystem.ready:
+        return subsystem.get()
+    return await asyncio.to_thread(subsystem.get)
+
+# Repo root (assuming running from repo root or mcp-server); GOVERNANCE_REPO_ROOT overrides it
+BASE_PATH = os.path.abspath(
+    os.environ.get("GOVERNANCE_REPO_ROOT") or os.path.join(os.path.dirname(__file__), "../../")
+)
+# Search index location; GOVERNANCE_INDEX_DIR overrides it
+INDEX_DIR = os.environ.get("GOVERNANCE_INDEX_DIR") or os.path.join(os.path.dirname(__file__), "../chroma_db")
+
+# In-memory catalog of governance documents; picks up file changes by mtime polling
+try:
+    from sections import citation, find_section
+except ImportError:
+    from .sections import citation, find_section
+
+def build_catalog():
+    try:
+        from catalog import DocumentCatalog
+    except ImportError:
+        from .catalog import DocumentCatalog
+    return DocumentCatalog(
+        BASE_PATH,
+        max_bytes=int(os.environ.get("GOVERNANCE_DOC_CACHE_BYTES", str(8 * 1024 * 1024))),
+    )
+
+catalog_subsystem = subsystems.register("catalog", build_catalog)
 
 @mcp.resource("governance://{category}/{document}")
 async def read_governance_doc(category: str, document: str) -> str:
@@ -12,46 +57,144 @@ async def read_governance_doc(category: str, document: str) -> str:
     # Security check: prevent directory traversal
     if ".." in category or ".." in document:
         raise ValueError("Invalid path")
-    
-    # Construct path (assuming running from repo root or mcp-server)
-    # Adjust path logic as needed based on deployment
-    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
-    file_path = os.path.join(base_path, category, f"{document}.md")
-    
+    catalog = await use(catalog_subsystem)
+
+    if category in catalog.categories:
+        content = catalog.read(category, document)
+        if content is None:
+            return f"Document not found: {category}/{document}"
+        return content
+
+    # Categories outside the catalog are read straight from disk
+    file_path = os.path.join(BASE_PATH, category, f"{document}.md")
     if not os.path.exists(file_path):
         return f"Document not found: {category}/{document}"
-        
+
     with open(file_path, "r") as f:
         return f.read()
 
+@mcp.tool()
+async def read_governance_section(category: str, document: str, section: str) -> str:
+    """
+    Read one section of a governance document (including its subsections)
+    instead of the whole file. section is a heading anchor (as returned by
+    search_governance), a heading title or a "Parent › Child" path.
+    """
+    if ".." in category or ".." in document:
+        raise ValueError("Invalid path")
+    catalog = await use(catalog_subsystem)
+    result = catalog.read_section(category, document, section)
+    if result is None:
+        entry = catalog.get(category, document)
+        if entry is None:
+            return f"Document not found: {category}/{document}"
+        anchors = ", ".join(h.anchor for h in entry.headings)
+        return f"Section not found: {section}. Available sections: {anchors}"
+    return result[1]
+
+@mcp.tool()
+async def read_governance_range(
+    category: str,
+    document: str,
+    section: str = "",
+    start_line: int = 0,
+    end_line: int = 0,
+    start_byte: int = -1,
+    end_byte: int = -1,
+    if_none_match: str = "",
+    if_modified_since: float = 0,
+) -> dict:
+    """
+    Read part of a governance document: a section (anchor, title or path), a
+    line range (1-based, inclusive) or a byte range ([start_byte, end_byte)).
+    Returns the content with its line and byte range and the document's etag
+    and mtime. Pass a previous etag as if_none_match (or its mtime as
+    if_modified_since) to get {"not_modified": true} without content when the
+    document has not changed.
+    """
+    if ".." in category or ".." in document:
+        raise ValueError("Invalid path")
+    catalog = await use(catalog_subsystem)
+    entry = catalog.get(category, document)
+    if entry is None:
+        return {"error": f"Document not found: {category}/{document}"}
+    validators = {"uri": entry.uri, "etag": entry.etag, "mtime": entry.mtime, "size": entry.size}
+    if (if_none_match and if_none_match == entry.etag) or (if_modified_since and entry.mtime <= if_modified_since):
+        return {**validators, "not_modified": True}
+
+    if section:
+        found = find_section(entry.headings, section)
+        if found is None:
+            anchors = ", ".join(h.anchor for h in entry.headings)
+            return {"error": f"Section not found: {section}. Available sections: {anchors}"}
+        start, end = found.offset, found.end_offset
+    elif start_line or end_line:
+        start, end = catalog.line_range(entry, start_line or 1, end_line or None)
+    elif start_byte >= 0 or end_byte >= 0:
+        start, end = max(0, start_byte), entry.size if end_byte < 0 else end_byte
+    else:
+        return {"error": "Pass a section, a line range or a byte range."}
+
+    result = catalog.read_range(category, document, start, end)
+    if result is None:
+        return {"error": f"Document not found: {category}/{document}"}
+    entry, data = result
+    end = start + len(data)
+    return {
+        "uri": entry.uri,
+        "etag": entry.etag,
+        "mtime": entry.mtime,
+        "size": entry.size,
+        "lines": [catalog.line_at(entry, start), catalog.line_at(entry, max(start, end - 1))],
+        "bytes": [start, end],
+        "content": data.decode("utf-8", errors="replace"),
+    }
+
 @mcp.tool()
 async def list_governance_docs() -> list[str]:
     """List all available governance documents."""
-    docs = []
-    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
-    
-    for category in ["workflows", "standards", "policies", "templates"]:
-        cat_path = os.path.join(base_path, category)
-        if os.path.exists(cat_path):
-            for file in os.listdir(cat_path):
-                if file.endswith(".md"):
-                    docs.append(f"governance://{category}/{file.replace('.md', '')}")
-    return docs
+    catalog = await use(catalog_subsystem)
+    return catalog.list_uris()
+
+@mcp.tool()
+async def describe_governance_docs() -> list[dict]:
+    """
+    List governance documents with their metadata: title, size, mtime,
+    headings and front matter.
+    """
+    catalog = await use(catalog_subsystem)
+    return [entry.to_dict() for entry in catalog.entries()]
 
 # Initialize Semantic Search
-try:
-    from search import SemanticSearch
-except ImportError:
-    from .search import SemanticSearch
-search_engine = SemanticSearch(persistence_directory=os.path.join(os.path.dirname(__file__), "../chroma_db"))
+def build_search():
+    try:
+        from shards import ShardedSearch
+    except ImportError:
+        from .shards import ShardedSearch
+    # One index shard per onboarded repository; this repo is the central shard.
+    # The embedding backend is selected with GOVERNANCE_EMBEDDINGS (openai | local | auto)
+    # and the vector store with GOVERNANCE_VECTOR_STORE (chroma | numpy)
+    return ShardedSearch(INDEX_DIR, BASE_PATH)
+
+search_subsystem = subsystems.register("search", build_search)
 
 @mcp.tool()
-async def search_governance(query: str) -> str:
+async def search_governance(query: str, mode: str = "hybrid", repo: str = "") -> str:
     """
-    Perform a semantic search across all governance documentation.
-    Returns relevant snippets with source links.
+    Perform a semantic search across all governance documentation, including
+    the docs of onboarded repositories. Returns relevant snippets cited as
+    "file › section #anchor" (prefixed with the repository for onboarded
+    repos); pass the anchor to read_governance_section to fetch just that section.
+
+    mode: "hybrid" (default, fuses semantic and keyword ranking), "vector"
+    (semantic only) or "keyword" (exact-term BM25, best for names like
+    CODEOWNERS or branch names).
+    repo: limit the search to one repository, or a comma-separated list
+    (see list_governance_repos); all repositories by default.
     """
-    results = search_engine.search(query)
+    search_engine = await use(search_subsystem)
+    repos = [name.strip() for name in repo.split(",") if name.strip()] or None
+    results = await asyncio.to_thread(search_engine.search, query, 5, mode, repos)
     
     if not results:
         return "No matching documents found."
@@ -61,47 +204,209 @@ async def search_governance(query: str) -> str:
 
     response = f"### Search Results for '{query}'\n\n"
     for item in results:
-        source = item['source'].split('/')[-1] # Simple filename
-        response += f"**Source**: {source} (Score: {item['score']:.2f})\n"
+        source = citation(item['source'], item.get('section', ''))
+        if item.get('repo', search_engine.central_repo) != search_engine.central_repo:
+            source = f"{item['repo']}: {source}"
+        anchor = f" #{item['anchor']}" if item.get('anchor') else ""
+        response += f"**Source**: {source}{anchor} (Score: {item['score']:.3f})\n"
         response += f"> {item['content']}...\n\n"
         
     return response
 
 @mcp.tool()
-async def reindex_governance() -> str:
+async def search_cache_stats() -> dict:
     """
-    Trigger a re-indexing of all governance documents.
-    Call this after adding or modifying documentation.
+    Report hit/miss/eviction counters for the shared query embedding cache
+    and each open shard's result cache, along with its index generation.
+    """
+    return (await use(search_subsystem)).cache_stats()
+
+@mcp.tool()
+async def list_governance_repos() -> list[dict]:
+    """
+    List the repositories whose docs are searchable, with their root
+    directory and number of indexed documents.
+    """
+    return (await use(search_subsystem)).describe()
+
+@mcp.tool()
+async def add_governance_repo(name: str, path: str) -> str:
+    """
+    Make an onboarded repository's markdown docs searchable. Registers the
+    local clone at path under name and starts indexing it as a background
+    job; other repositories' indexes are not touched.
     """
-    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
     try:
-        search_engine.index_documents(base_path)
-        return "Successfully re-indexed governance documents."
-    except Exception as e:
-        return f"Failed to re-index: {str(e)}"
+        (await use(search_subsystem)).add_repo(name, path)
+    except ValueError as e:
+        return str(e)
+    return await reindex_governance(repo=name)
+
+# Background jobs (reindexing) run on a worker thread so tool calls keep being served
+try:
+    from jobs import JobManager
+except ImportError:
+    from .jobs import JobManager
+job_manager = JobManager(max_workers=1)
+
+def reindex_kind(repo: str, central_repo: str) -> str:
+    """Job kind of a re-index: one per repository, so different repositories can be queued."""
+    return "reindex" if not repo or repo == central_repo else f"reindex:{repo}"
+
+@mcp.tool()
+async def reindex_governance(repo: str = "") -> str:
+    """
+    Trigger a re-index of the governance documents (or of one onboarded
+    repository's docs) as a background job. Call this after adding or
+    modifying documentation. Returns a job ID; use reindex_status to follow
+    progress and cancel_reindex to stop it. Searches keep using the current
+    index until the new one is swapped in.
+    """
+    search_engine = await use(search_subsystem)
+    repo = repo or search_engine.central_repo
+    if repo not in search_engine.repos:
+        return f"Unknown repository: {repo}. Use add_governance_repo first."
+    kind = reindex_kind(repo, search_engine.central_repo)
+    running = job_manager.active(kind=kind)
+    if running:
+        return f"Re-index job {running[0].id} is already running."
+
+    job = job_manager.submit(
+        kind,
+        lambda job: search_engine.index_repo(repo, progress=job.report, should_cancel=job.cancel_requested),
+    )
+    return f"Started re-index job {job.id} for {repo}."
+
+@mcp.tool()
+async def reindex_status(job_id: str = "", repo: str = "") -> dict:
+    """
+    Report the status of a re-index job (the most recent one for repo, by
+    default the governance docs, if no ID is given): files loaded, chunks
+    embedded, ETA, and the added/updated/deleted/unchanged counts once complete.
+    """
+    if job_id:
+        job = job_manager.get(job_id)
+    else:
+        central_repo = (await use(search_subsystem)).central_repo if repo else ""
+        job = job_manager.latest(kind=reindex_kind(repo, central_repo))
+    if job is None:
+        return {"error": f"No re-index job found{f' with ID {job_id}' if job_id else ''}."}
+    return job.to_dict()
+
+@mcp.tool()
+async def cancel_reindex(job_id: str) -> str:
+    """
+    Cancel a running re-index job. The existing index is left unchanged
+    unless the job had already started applying its changes.
+    """
+    if job_manager.cancel(job_id):
+        return f"Cancellation requested for re-index job {job_id}."
+    return f"Re-index job {job_id} not found or already finished."
 
 # Initialize Reporting
 try:
     from reporting import ComplianceReporter, get_mock_compliance_data
+    from history import DEFAULT_REGRESSION_DAYS, DEFAULT_TREND_DAYS, ComplianceHistory
+    from compliance import (
+        COMPLIANCE_DB_ENV_VAR, COMPLIANCE_DB_FILENAME, COMPLIANCE_SOURCE_ENV_VAR, RULES_PATH,
+        ComplianceEngine, ConventionRules, ConventionScanner, ConventionStore, ResultStore, RuleSet,
+        open_source,
+    )
 except ImportError:
     from .reporting import ComplianceReporter, get_mock_compliance_data
+    from .history import DEFAULT_REGRESSION_DAYS, DEFAULT_TREND_DAYS, ComplianceHistory
+    from .compliance import (
+        COMPLIANCE_DB_ENV_VAR, COMPLIANCE_DB_FILENAME, COMPLIANCE_SOURCE_ENV_VAR, RULES_PATH,
+        ComplianceEngine, ConventionRules, ConventionScanner, ConventionStore, ResultStore, RuleSet,
+        open_source,
+    )
 reporter = ComplianceReporter()
+# Per-repository results persist between runs, so only changed repositories are re-evaluated
+def compliance_db_path() -> str:
+    return os.environ.get(COMPLIANCE_DB_ENV_VAR) or os.path.join(INDEX_DIR, COMPLIANCE_DB_FILENAME)
+
+compliance_store_subsystem = subsystems.register("compliance_store", lambda: ResultStore(compliance_db_path()))
+# Commit message and branch name scans of local clones; the last scanned commit per
+# repository is kept in the same database, so each report only scans new commits
+convention_scanner_subsystem = subsystems.register(
+    "convention_scanner",
+    lambda: ConventionScanner(ConventionRules.load(BASE_PATH), ConventionStore(compliance_db_path())),
+)
+# Every report run is appended to the compliance history, for compliance_trends
+compliance_history_subsystem = subsystems.register("compliance_history", lambda: ComplianceHistory(compliance_db_path()))
+
+def load_compliance_data() -> dict:
+    """
+    Evaluate the repositories from GOVERNANCE_COMPLIANCE_SOURCE (a fixture JSON
+    file or a directory of local clones); mock data when it is not set. The
+    history of local clones is scanned for commit and branch naming violations.
+    The run is recorded in the compliance history.
+    """
+    source = os.environ.get(COMPLIANCE_SOURCE_ENV_VAR)
+    if not source:
+        return get_mock_compliance_data()
+    rules = RuleSet.load(os.path.join(BASE_PATH, RULES_PATH))
+    conventions = None
+    if os.path.isdir(source):
+        scanner = convention_scanner_subsystem.get()
+        scanner.scan_directory(source)
+        conventions = scanner.store
+    store = compliance_store_subsystem.get()
+    data = ComplianceEngine(rules, open_source(source, conventions), store=store).report_data()
+    # The report streams data["repositories"]; the history reads its own pass over the store
+    compliance_history_subsystem.get().record({**data, "repositories": store.iter_results()})
+    return data
 
 @mcp.tool()
-async def generate_compliance_report() -> str:
+async def generate_compliance_report(format: str = "markdown") -> str:
     """
     Generate a comprehensive compliance report for the organization.
-    Currently uses mock data for demonstration.
+    Repositories are checked against github-settings/branch-protection-rules.yaml
+    and the repository standards (CODEOWNERS, CONTRIBUTING.md, PR template,
+    pre-commit hook); local clones also against the commit message and branch
+    naming standards. Uses mock data unless GOVERNANCE_COMPLIANCE_SOURCE is set.
+
+    format: "markdown" (default), "json" or "csv".
     """
-    data = get_mock_compliance_data()
-    return reporter.generate_report(data)
+    if format not in reporter.FORMATS:
+        return f"Unsupported format: {format}. Use one of {', '.join(reporter.FORMATS)}."
+    try:
+        data = await asyncio.to_thread(load_compliance_data)
+    except Exception as e:
+        return f"Error evaluating compliance: {e}"
+    return await asyncio.to_thread(reporter.generate_report, data, format)
+
+@mcp.tool()
+async def compliance_trends(
+    days: int = DEFAULT_TREND_DAYS, regression_days: int = DEFAULT_REGRESSION_DAYS, limit: int = 10
+) -> dict:
+    """
+    Compliance trends from the recorded report runs, without re-evaluating anything:
+    the health score per day over the last `days` days, the repositories whose
+    score dropped over the last `regression_days` days (with the rules they newly
+    violate), and the `limit` most violated rules over the last `days` days.
+    Runs are recorded by generate_compliance_report when GOVERNANCE_COMPLIANCE_SOURCE is set.
+    """
+    history = await use(compliance_history_subsystem)
+    return await asyncio.to_thread(history.trends, days, regression_days, limit)
 
 # Initialize Recommendations
-try:
-    from recommendations import PolicyRecommender
-except ImportError:
-    from .recommendations import PolicyRecommender
-recommender = PolicyRecommender()
+def recommendations_module():
+    """The recommendations module, imported on first use (it pulls in LangChain)."""
+    try:
+        import recommendations
+    except ImportError:
+        from . import recommendations
+    return recommendations
+
+def build_recommender():
+    module = recommendations_module()
+    # The chat model is selected with GOVERNANCE_LLM (openai | fake); responses are cached on disk
+    return module.PolicyRecommender(
+        cache_path=os.environ.get(module.LLM_CACHE_ENV_VAR) or os.path.join(INDEX_DIR, module.LLM_CACHE_FILENAME)
+    )
+
+recommender_subsystem = subsystems.register("recommender", build_recommender)
 
 @mcp.tool()
 async def suggest_policy_updates(category: str, document: str) -> str:
@@ -115,16 +420,92 @@ async def suggest_policy_updates(category: str, document: str) -> str:
         if content.startswith("Document not found"):
             return content
             
+        recommender = await use(recommender_subsystem)
         return await recommender.suggest_updates(content, context=f"Reviewing {document}")
     except Exception as e:
         return f"Error: {e}"
 
+@mcp.tool()
+async def review_policy_category(category: str) -> str:
+    """
+    Suggest updates for every document in a category (e.g. "standards") at once.
+    Documents are reviewed concurrently and unchanged documents come from the
+    response cache, so a rerun only pays for edited documents.
+    """
+    catalog = await use(catalog_subsystem)
+    if category not in catalog.categories:
+        return f"Unknown category: {category}. Use one of {', '.join(catalog.categories)}."
+    documents = {}
+    for entry in catalog.entries():
+        if entry.category == category:
+            content = catalog.read(entry.category, entry.name)
+            if content is not None:
+                documents[entry.name] = content
+    if not documents:
+        return f"No documents found in {category}."
+
+    recommender = await use(recommender_subsystem)
+    suggestions = await recommender.suggest_updates_batch(documents)
+    response = f"# Policy Review: {category}\n\n"
+    for name, text in suggestions.items():
+        response += f"## {name}\n\n{text}\n\n"
+    return response
+
+@mcp.tool()
+async def recommendation_cache_stats() -> dict:
+    """
+    Report LLM call, cache hit and shared in-flight request counters for policy recommendations.
+    """
+    # Counting the cached responses is a SQLite query; keep it off the event loop
+    return await asyncio.to_thread((await use(recommender_subsystem)).cache_stats)
+
 @mcp.tool()
 async def analyze_violation_trends(violations: list[str]) -> str:
     """
     Analyze a list of violations to suggest systemic policy changes.
+    Near-identical violations are grouped first, so any number can be passed.
     """
+    recommender = await use(recommender_subsystem)
     return await recommender.analyze_violations(violations)
 
+@mcp.tool()
+async def cluster_violation_list(violations: list[str], limit: int = 50) -> list[dict]:
+    """
+    Group near-identical violations (no LLM involved). Violations may be prefixed
+    with the repository ("payments-api: Missing CODEOWNERS"). Returns the largest
+    groups with their counts, affected repositories and example repos.
+    """
+    clusters = await asyncio.to_thread(lambda: recommendations_module().cluster_violations(violations))
+    return [cluster.to_dict() for cluster in clusters[:limit]]
+
+@mcp.tool()
+async def startup_report() -> dict:
+    """
+    Report how long the server took to import and to build each subsystem
+    (catalog, search, compliance store, recommender), which ones are built,
+    and which were built by the background warm-up.
+    """
+    return subsystems.report()
+
+@mcp.tool()
+async def server_metrics() -> dict:
+    """
+    Report per-tool call counts, error rates, latency percentiles (p50/p95/p99
+    in ms) and request/response sizes, plus sub-span timings: embed_query,
+    vector_search, keyword_search, llm_call, file_read and queue_wait. With
+    GOVERNANCE_SLOW_CALLS set, also lists the slowest calls with their spans.
+    """
+    return metrics.snapshot()
+
+subsystems.imported()
+
 if __name__ == "__main__":
-    mcp.run()
+    # GOVERNANCE_WARMUP=all (or e.g. "catalog,search") builds subsystems in the
+    # background while the server already answers requests
+    subsystems.warm_up_from_env(os.environ.get(WARMUP_ENV_VAR))
+    transport = os.environ.get(TRANSPORT_ENV_VAR, "stdio")
+    if transport in HTTP_TRANSPORTS:
+        # One long-lived process shared by every client (see transport.py)
+        serve(mcp, subsystems, transport, http_settings)
+    else:
+        mcp.run(transport)
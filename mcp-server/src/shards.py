@@ -0,0 +1,221 @@
+import contextvars
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+try:
+    from embeddings import load_embeddings
+    from lexical import reciprocal_rank_fusion
+    from cache import TTLCache
+    from search import (
+        MANIFEST_FILENAME, SEARCH_CACHE_SIZE_ENV_VAR, SEARCH_CACHE_TTL_ENV_VAR, SEARCH_MODES, SemanticSearch,
+        normalize_query,
+    )
+except ImportError:
+    from .embeddings import load_embeddings
+    from .lexical import reciprocal_rank_fusion
+    from .cache import TTLCache
+    from .search import (
+        MANIFEST_FILENAME, SEARCH_CACHE_SIZE_ENV_VAR, SEARCH_CACHE_TTL_ENV_VAR, SEARCH_MODES, SemanticSearch,
+        normalize_query,
+    )
+
+# The org-governance repo itself; its shard lives directly in the index directory,
+# so an index built before sharding keeps working.
+CENTRAL_SHARD = "org-governance"
+# Other shards live under <index dir>/shards/<repo>, listed in the registry file
+SHARDS_DIRNAME = "shards"
+REPOS_FILENAME = "repos.json"
+# Threads used to fan a query out to the shards
+SHARD_QUERY_WORKERS_ENV_VAR = "GOVERNANCE_SHARD_QUERY_WORKERS"
+
+REPO_NAME_PATTERN = re.compile(r"^[A-Za-z0-9._-]+$")
+
+
+class ShardedSearch:
+    """
+    One search index (shard) per onboarded repository, queried together.
+
+    Each shard is a SemanticSearch with its own manifest, vectors and BM25
+    index, built and refreshed on its own: indexing one repository never
+    touches the others. All shards share one embedding backend and one query
+    embedding cache, so a query is embedded once however many shards it is
+    sent to. Queries fan out to the shards concurrently and the per-shard
+    top-k lists are merged; shards are opened lazily on first use.
+    """
+
+    central_repo = CENTRAL_SHARD
+
+    def __init__(
+        self,
+        index_dir: str,
+        central_root: str,
+        embedding_backend: Optional[str] = None,
+        vector_store_backend: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.index_dir = index_dir
+        self.registry_path = os.path.join(index_dir, REPOS_FILENAME)
+        self.embeddings = load_embeddings(embedding_backend)
+        self.vector_store_backend = vector_store_backend
+        cache_size = int(os.environ.get(SEARCH_CACHE_SIZE_ENV_VAR, "256"))
+        cache_ttl = float(os.environ.get(SEARCH_CACHE_TTL_ENV_VAR, "300"))
+        self.query_embedding_cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self.repos: Dict[str, str] = {CENTRAL_SHARD: os.path.abspath(central_root), **self._load_registry()}
+        self._shards: Dict[str, SemanticSearch] = {}
+        self._lock = threading.Lock()
+        workers = max_workers or int(os.environ.get(SHARD_QUERY_WORKERS_ENV_VAR, "8"))
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shard-query")
+
+    def _load_registry(self) -> Dict[str, str]:
+        if not os.path.exists(self.registry_path):
+            return {}
+        with open(self.registry_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("repos", {})
+
+    def _save_registry(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+        repos = {name: root for name, root in self.repos.items() if name != CENTRAL_SHARD}
+        tmp_path = f"{self.registry_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"repos": repos}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.registry_path)
+
+    def shard_directory(self, repo: str) -> str:
+        if repo == CENTRAL_SHARD:
+            return self.index_dir
+        return os.path.join(self.index_dir, SHARDS_DIRNAME, repo)
+
+    def shard(self, repo: str) -> SemanticSearch:
+        """The search index of one repository, opened on first use."""
+        if repo not in self.repos:
+            raise KeyError(f"Unknown repository: {repo}")
+        with self._lock:
+            engine = self._shards.get(repo)
+            if engine is None:
+                engine = SemanticSearch(
+                    self.shard_directory(repo),
+                    vector_store_backend=self.vector_store_backend,
+                    embeddings=self.embeddings,
+                    query_embedding_cache=self.query_embedding_cache,
+                )
+                self._shards[repo] = engine
+            return engine
+
+    @property
+    def central(self) -> SemanticSearch:
+        return self.shard(CENTRAL_SHARD)
+
+    def add_repo(self, name: str, root_dir: str):
+        """Register a repository; its shard is empty until index_repo runs."""
+        if not REPO_NAME_PATTERN.match(name) or name == CENTRAL_SHARD:
+            raise ValueError(f"Invalid repository name: {name}")
+        if not os.path.isdir(root_dir):
+            raise ValueError(f"Not a directory: {root_dir}")
+        with self._lock:
+            self.repos[name] = os.path.abspath(root_dir)
+            self._shards.pop(name, None)
+            self._save_registry()
+
+    def index_repo(self, repo: str = CENTRAL_SHARD, **kwargs) -> Dict[str, Any]:
+        """Incrementally (re)index one repository's shard; kwargs go to index_documents."""
+        stats = self.shard(repo).index_documents(self.repos[repo], **kwargs)
+        return {"repo": repo, **stats}
+
+    def _resolve_repos(self, repos: Optional[List[str]]) -> List[str]:
+        if not repos:
+            return list(self.repos)
+        unknown = [repo for repo in repos if repo not in self.repos]
+        if unknown:
+            raise KeyError(f"Unknown repository: {', '.join(unknown)}. Known: {', '.join(self.repos)}")
+        return list(dict.fromkeys(repos))
+
+    def search(self, query: str, limit: int = 5, mode: str = "hybrid", repos: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Search the shards of the given repositories (all of them by default)
+        and merge their top-limit results. Results carry a "repo" field.
+
+        Vector distances are comparable across shards and merged by score;
+        hybrid scores are reciprocal-rank based and merged by score too; BM25
+        scores depend on each shard's statistics, so keyword results are
+        merged by reciprocal rank fusion of the per-shard rankings.
+        """
+        if mode not in SEARCH_MODES:
+            return [{"error": f"Unknown search mode '{mode}'. Expected one of: {', '.join(SEARCH_MODES)}"}]
+        try:
+            names = self._resolve_repos(repos)
+        except KeyError as e:
+            return [{"error": e.args[0]}]
+        shards = [(name, self.shard(name)) for name in names]
+
+        if mode != "keyword" and self.embeddings is not None and len(shards) > 1:
+            # Embed once up front; every shard then finds the vector in the shared cache
+            shards[0][1]._embed_query(query)
+
+        if len(shards) == 1:
+            outcomes = [shards[0][1].search(query, limit=limit, mode=mode)]
+        else:
+            # Each shard query runs in a copy of the caller's context, so its spans reach the caller's trace
+            futures = [
+                self._pool.submit(contextvars.copy_context().run, engine.search, query, limit, mode) for _, engine in shards
+            ]
+            outcomes = [future.result() for future in futures]
+
+        per_shard = []
+        errors = []
+        for (name, _), results in zip(shards, outcomes):
+            if results and "error" in results[0]:
+                errors.append(f"{name}: {results[0]['error']}")
+                continue
+            per_shard.append([{**item, "repo": name} for item in results])
+        if not per_shard:
+            return [{"error": errors[0].split(": ", 1)[1] if len(errors) == 1 else "; ".join(errors)}]
+        return self._merge(per_shard, limit, mode)
+
+    @staticmethod
+    def _merge(per_shard: List[List[Dict[str, Any]]], limit: int, mode: str) -> List[Dict[str, Any]]:
+        if len(per_shard) == 1:
+            return per_shard[0][:limit]
+        if mode == "vector":
+            merged = sorted((item for results in per_shard for item in results), key=lambda item: item["score"])
+            return merged[:limit]
+        if mode == "hybrid":
+            merged = sorted((item for results in per_shard for item in results), key=lambda item: -item["score"])
+            return merged[:limit]
+        items = {}
+        rankings = []
+        for results in per_shard:
+            ranking = []
+            for item in results:
+                key = f"{item['repo']}/{item['chunk_id'] or normalize_query(item['content'])}"
+                items[key] = item
+                ranking.append(key)
+            rankings.append(ranking)
+        return [items[key] for key, _ in reciprocal_rank_fusion(rankings)[:limit]]
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """Registered repositories with the size of their shard."""
+        described = []
+        for name, root in self.repos.items():
+            manifest_path = os.path.join(self.shard_directory(name), MANIFEST_FILENAME)
+            documents = 0
+            if os.path.exists(manifest_path):
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    documents = len(json.load(f).get("files", {}))
+            described.append({"repo": name, "root": root, "documents": documents, "central": name == CENTRAL_SHARD})
+        return described
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Shared query embedding cache and per-shard result cache counters."""
+        with self._lock:
+            shards = dict(self._shards)
+        return {
+            "query_embeddings": self.query_embedding_cache.stats(),
+            "shards": {
+                name: {"generation": engine.generation, "results": engine.result_cache.stats()}
+                for name, engine in shards.items()
+            },
+        }
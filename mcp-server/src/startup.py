@@ -0,0 +1,130 @@
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Subsystems warmed in the background at startup: "all", a comma-separated list of
+# names, or unset/empty for none (everything is then built on first use).
+WARMUP_ENV_VAR = "GOVERNANCE_WARMUP"
+
+
+class Subsystem:
+    """
+    A server component built on first use.
+
+    The factory (which should also do the component's heavy imports) runs at
+    most once, under a lock, however many tool calls need the component at
+    the same time. Its duration is recorded for the startup report; a failed
+    build is recorded too and retried on the next use.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self.name = name
+        self._factory = factory
+        self._value: Any = None
+        self._ready = False
+        self._lock = threading.Lock()
+        self.seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self.warmed = False
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def get(self) -> Any:
+        if self._ready:
+            return self._value
+        with self._lock:
+            if not self._ready:
+                started = time.perf_counter()
+                try:
+                    self._value = self._factory()
+                except Exception as e:
+                    self.error = f"{type(e).__name__}: {e}"
+                    raise
+                finally:
+                    self.seconds = time.perf_counter() - started
+                self.error = None
+                self._ready = True
+        return self._value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self._ready,
+            "seconds": round(self.seconds, 4) if self.seconds is not None else None,
+            "warmed": self.warmed,
+            "error": self.error,
+        }
+
+
+class Subsystems:
+    """Registry of lazily built server components, with warm-up and a timing report."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.import_seconds: Optional[float] = None
+        self._subsystems: Dict[str, Subsystem] = {}
+        self._warmup: Optional[threading.Thread] = None
+        self.warmup_names: List[str] = []
+
+    def register(self, name: str, factory: Callable[[], Any]) -> Subsystem:
+        subsystem = Subsystem(name, factory)
+        self._subsystems[name] = subsystem
+        return subsystem
+
+    def __getitem__(self, name: str) -> Subsystem:
+        return self._subsystems[name]
+
+    def imported(self):
+        """Mark the end of module import (everything that is not deferred)."""
+        self.import_seconds = time.perf_counter() - self.started
+
+    def warm_up(self, names: Optional[Iterable[str]] = None, background: bool = True) -> Optional[threading.Thread]:
+        """Build the named subsystems (all by default), on a daemon thread unless background is False."""
+        selected = list(self._subsystems) if names is None else [n for n in names if n in self._subsystems]
+        self.warmup_names = selected
+
+        def run():
+            for name in selected:
+                subsystem = self._subsystems[name]
+                try:
+                    subsystem.get()
+                    subsystem.warmed = True
+                except Exception as e:
+                    print(f"Warning: warm-up of {name} failed: {e}", file=sys.stderr)
+            print(self.format_report(), file=sys.stderr)
+
+        if not background:
+            run()
+            return None
+        self._warmup = threading.Thread(target=run, name="warm-up", daemon=True)
+        self._warmup.start()
+        return self._warmup
+
+    def warm_up_from_env(self, value: Optional[str]) -> Optional[threading.Thread]:
+        """Start the warm-up selected by GOVERNANCE_WARMUP ("all" or a comma-separated list)."""
+        value = (value or "").strip()
+        if not value:
+            return None
+        names: Optional[List[str]] = None if value == "all" else [n.strip() for n in value.split(",") if n.strip()]
+        return self.warm_up(names)
+
+    def pending(self) -> List[str]:
+        """Subsystems selected for warm-up that are not built yet (the server is ready when empty)."""
+        return [name for name in self.warmup_names if not self._subsystems[name].ready]
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "import_seconds": round(self.import_seconds, 4) if self.import_seconds is not None else None,
+            "uptime_seconds": round(time.perf_counter() - self.started, 2),
+            "subsystems": {name: subsystem.to_dict() for name, subsystem in self._subsystems.items()},
+        }
+
+    def format_report(self) -> str:
+        report = self.report()
+        lines = [f"Startup: module import {report['import_seconds']}s"]
+        for name, info in report["subsystems"].items():
+            state = f"{info['seconds']:.3f}s" if info["ready"] else ("failed" if info["error"] else "not built")
+            lines.append(f"  {name:<16} {state}{' (warm-up)' if info['warmed'] else ''}")
+        return "\n".join(lines)
@@ -0,0 +1,198 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from mcp.server.fastmcp import FastMCP
+
+try:
+    from metrics import metrics
+    from startup import Subsystems
+except ImportError:
+    from .metrics import metrics
+    from .startup import Subsystems
+
+# stdio (default: one server process per client), streamable-http or sse (one shared
+# process for every client)
+TRANSPORT_ENV_VAR = "GOVERNANCE_TRANSPORT"
+HTTP_TRANSPORTS = ("streamable-http", "sse")
+HTTP_HOST_ENV_VAR = "GOVERNANCE_HTTP_HOST"
+HTTP_PORT_ENV_VAR = "GOVERNANCE_HTTP_PORT"
+# Threads that run blocking work (search, report rendering, subsystem builds) off the event loop
+HTTP_WORKERS_ENV_VAR = "GOVERNANCE_HTTP_WORKERS"
+# Tool calls running at once; further calls wait up to the queue timeout for a slot
+HTTP_MAX_CONCURRENCY_ENV_VAR = "GOVERNANCE_HTTP_MAX_CONCURRENCY"
+HTTP_QUEUE_TIMEOUT_ENV_VAR = "GOVERNANCE_HTTP_QUEUE_TIMEOUT"
+# Serve the metrics in the Prometheus text format at /metrics
+HTTP_PROMETHEUS_ENV_VAR = "GOVERNANCE_HTTP_PROMETHEUS"
+
+
+@dataclass
+class HttpSettings:
+    host: str = "127.0.0.1"
+    port: int = 8000
+    workers: Optional[int] = None
+    max_concurrency: int = 16
+    queue_timeout: float = 10.0
+    prometheus: bool = False
+
+    @classmethod
+    def from_env(cls) -> "HttpSettings":
+        workers = os.environ.get(HTTP_WORKERS_ENV_VAR)
+        return cls(
+            host=os.environ.get(HTTP_HOST_ENV_VAR, cls.host),
+            port=int(os.environ.get(HTTP_PORT_ENV_VAR, str(cls.port))),
+            workers=int(workers) if workers else None,
+            max_concurrency=int(os.environ.get(HTTP_MAX_CONCURRENCY_ENV_VAR, str(cls.max_concurrency))),
+            queue_timeout=float(os.environ.get(HTTP_QUEUE_TIMEOUT_ENV_VAR, str(cls.queue_timeout))),
+            prometheus=os.environ.get(HTTP_PROMETHEUS_ENV_VAR, "").lower() in ("1", "true", "yes"),
+        )
+
+
+class ServerBusy(RuntimeError):
+    """A tool call waited longer than the queue timeout for a free slot."""
+
+
+class AdmissionLimiter:
+    """
+    Caps the number of tool calls running at once. Calls beyond the cap
+    queue for a slot, and are rejected with ServerBusy after queue_timeout
+    seconds, so a burst of clients gets a fast error instead of an
+    ever-growing latency tail.
+    """
+
+    def __init__(self, limit: int, queue_timeout: float):
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+        self.waiting += 1
+        try:
+            with metrics.span("queue_wait"):
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ServerBusy(
+                f"Server busy: {self.in_flight} tool calls running and {self.waiting - 1} queued. Retry shortly."
+            ) from None
+        finally:
+            self.waiting -= 1
+        self.admitted += 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "queue_timeout": self.queue_timeout,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+class GovernanceMCP(FastMCP):
+    """
+    FastMCP with per-tool metrics (see metrics.py) on every tool call and
+    resource read, and an admission limiter on tool calls when one is set
+    (HTTP serving). Resource reads are recorded as "resource:<scheme>".
+    """
+
+    limiter: Optional[AdmissionLimiter] = None
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]):
+        with metrics.tool_call(name, arguments) as call:
+            if self.limiter is None:
+                call["result"] = await super().call_tool(name, arguments)
+            else:
+                async with self.limiter.slot():
+                    call["result"] = await super().call_tool(name, arguments)
+            return call["result"]
+
+    async def read_resource(self, uri):
+        with metrics.tool_call(f"resource:{str(uri).split('://', 1)[0]}") as call:
+            call["result"] = await super().read_resource(uri)
+            return call["result"]
+
+
+def create_app(server: GovernanceMCP, subsystems: Subsystems, transport: str, settings: HttpSettings):
+    """
+    One ASGI app serving every client: the MCP endpoint (/mcp for
+    streamable-http, /sse and /messages/ for sse) plus /healthz (liveness),
+    /readyz (503 until the subsystems selected for warm-up are built) and,
+    if enabled, /metrics (Prometheus text format).
+    """
+    from fastapi import FastAPI
+    from fastapi.responses import JSONResponse, PlainTextResponse
+
+    if transport not in HTTP_TRANSPORTS:
+        raise ValueError(f"Unknown HTTP transport '{transport}'. Expected one of: {', '.join(HTTP_TRANSPORTS)}")
+    server.limiter = AdmissionLimiter(settings.max_concurrency, settings.queue_timeout)
+    mcp_app = server.streamable_http_app() if transport == "streamable-http" else server.sse_app()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # asyncio.to_thread (search, report rendering, subsystem builds) uses the default executor
+        executor = ThreadPoolExecutor(max_workers=settings.workers, thread_name_prefix="governance-worker")
+        asyncio.get_running_loop().set_default_executor(executor)
+        try:
+            if transport == "streamable-http":
+                async with server.session_manager.run():
+                    yield
+            else:
+                yield
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    app = FastAPI(title=server.name, lifespan=lifespan)
+    started = time.time()
+
+    @app.get("/healthz")
+    async def healthz():
+        return {
+            "status": "ok",
+            "transport": transport,
+            "uptime_seconds": round(time.time() - started, 2),
+            "tool_calls": server.limiter.stats(),
+        }
+
+    if settings.prometheus:
+        @app.get("/metrics", response_class=PlainTextResponse)
+        async def prometheus_metrics():
+            return metrics.prometheus()
+
+    @app.get("/readyz")
+    async def readyz():
+        pending = subsystems.pending()
+        body = {"ready": not pending, "pending": pending, **subsystems.report()}
+        return JSONResponse(body, status_code=503 if pending else 200)
+
+    app.mount("/", mcp_app)
+    return app
+
+
+def serve(server: GovernanceMCP, subsystems: Subsystems, transport: str, settings: Optional[HttpSettings] = None):
+    """Serve all clients from this process over HTTP (blocks until shutdown)."""
+    import uvicorn
+
+    settings = settings or HttpSettings.from_env()
+    app = create_app(server, subsystems, transport, settings)
+    # A single process on purpose: MCP sessions live in memory and the point is one
+    # shared index, embedding client and recommender for every client
+    uvicorn.run(app, host=settings.host, port=settings.port, log_level=server.settings.log_level.lower())
@@ -0,0 +1,450 @@
+import io
+import json
+import os
+import shutil
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+try:
+    from ann import ANN_DIRNAME, ANN_NPROBE_ENV_VAR, ANN_RERANK_ENV_VAR, DEFAULT_NPROBE, DEFAULT_RERANK, IVFIndex
+except ImportError:
+    from .ann import ANN_DIRNAME, ANN_NPROBE_ENV_VAR, ANN_RERANK_ENV_VAR, DEFAULT_NPROBE, DEFAULT_RERANK, IVFIndex
+
+VECTORS_FILENAME = "vectors.npy"
+CHUNKS_FILENAME = "chunks.jsonl"
+# Side table of stores written before flushes appended (one JSON list, rewritten each time)
+LEGACY_CHUNKS_FILENAME = "chunks.json"
+CHUNKS_FORMAT_VERSION = 2
+# Rows copied per block when rewriting the matrix on compaction
+FLUSH_BLOCK_ROWS = 65536
+# A flush rewrites both files (compaction) once this share of the rows is deleted, or once
+# this share was flushed since the ANN index was built (those rows are scanned exactly)
+COMPACT_DEAD_FRACTION = 0.25
+COMPACT_UNINDEXED_FRACTION = 0.1
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    In-process exact vector index backed by a contiguous float32 matrix.
+
+    Embeddings are L2-normalized and saved as ``vectors.npy`` next to a
+    ``chunks.jsonl`` side table of chunk IDs, text and metadata, one line per
+    row. The matrix is memory-mapped read-only at load time, so cold start does
+    not copy it and several server processes share the same pages through the
+    OS page cache.
+
+    Writes (``add_texts``/``delete``) are staged and only become visible to
+    searches after ``flush()``, which appends the new rows to both files and
+    tombstones the removed ones (a ``{"deleted": [rows]}`` line), then swaps
+    the published snapshot in one assignment. The side table line is written
+    last, so a flush cut short leaves the previous rows intact. Once enough
+    rows are dead, a flush compacts instead: both files are rewritten without
+    them and renamed into place.
+
+    With an ANN index (``build_ann``, see ann.py) searches scan quantized
+    codes and only read the re-ranked candidates' rows of the matrix. The
+    index covers the rows that existed when it was built; rows appended since
+    are scanned exactly, and compaction folds them into the index.
+    """
+
+    def __init__(
+        self,
+        persist_directory: str,
+        embedding_function: Embeddings,
+        nprobe: Optional[int] = None,
+        rerank: Optional[int] = None,
+    ):
+        self.persist_directory = persist_directory
+        self.embedding_function = embedding_function
+        self._vectors_path = os.path.join(persist_directory, VECTORS_FILENAME)
+        self._chunks_path = os.path.join(persist_directory, CHUNKS_FILENAME)
+        self._legacy_chunks_path = os.path.join(persist_directory, LEGACY_CHUNKS_FILENAME)
+        self._ann_path = os.path.join(persist_directory, ANN_DIRNAME)
+        self.nprobe = nprobe or int(os.environ.get(ANN_NPROBE_ENV_VAR, str(DEFAULT_NPROBE)))
+        self.rerank = rerank if rerank is not None else int(os.environ.get(ANN_RERANK_ENV_VAR, str(DEFAULT_RERANK)))
+        # Published snapshot: (matrix, records, id -> live row, ANN index or None, deleted-row mask or None).
+        # Rows are never moved outside compaction, so records and the matrix include deleted rows.
+        self._snapshot: Tuple[
+            Optional[np.ndarray], List[Dict[str, Any]], Dict[str, int], Optional[IVFIndex], Optional[np.ndarray]
+        ] = (None, [], {}, None, None)
+        self._staged_adds: List[Tuple[List[str], List[str], List[dict], np.ndarray]] = []
+        self._staged_deletes = set()
+        # Bytes of chunks.jsonl that hold whole lines; appends start there
+        self._chunks_size = 0
+        self._load()
+
+    @staticmethod
+    def exists(persist_directory: str) -> bool:
+        """Whether a persisted index exists in the directory."""
+        return os.path.exists(os.path.join(persist_directory, VECTORS_FILENAME))
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding_function
+
+    def __len__(self) -> int:
+        return len(self._snapshot[2])
+
+    def _load(self):
+        if not self.exists(self.persist_directory):
+            return
+        records, deleted, ann_rows = [], [], 0
+        self._chunks_size = 0
+        if os.path.exists(self._chunks_path):
+            with open(self._chunks_path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A flush cut short leaves a partial last line; the rows before it stand
+                        break
+                    self._chunks_size += len(line)
+                    if "id" in entry:
+                        records.append(entry)
+                    else:
+                        deleted.extend(entry.get("deleted", ()))
+                        ann_rows = entry.get("ann_rows", ann_rows)
+        elif os.path.exists(self._legacy_chunks_path):
+            with open(self._legacy_chunks_path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            ann_rows = len(records)
+        else:
+            return
+        matrix = np.load(self._vectors_path, mmap_mode="r")
+        # Rows appended by a flush that never wrote its side table lines are not published
+        matrix = matrix[:len(records)]
+        dead = None
+        if deleted:
+            dead = np.zeros(len(records), dtype=bool)
+            dead[deleted] = True
+        id_rows = {r["id"]: i for i, r in enumerate(records) if dead is None or not dead[i]}
+        # An index that does not cover exactly the rows it was installed for is stale and ignored
+        ann = IVFIndex.load(self._ann_path, rows=ann_rows) if ann_rows else None
+        self._snapshot = (matrix, records, id_rows, ann, dead)
+
+    @property
+    def vectors(self) -> Optional[np.ndarray]:
+        """The published matrix (read-only); later flushes publish a new one and leave it intact."""
+        return self._snapshot[0]
+
+    @property
+    def ann(self) -> Optional[IVFIndex]:
+        return self._snapshot[3]
+
+    def build_ann(self, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Train and persist an ANN index over the published vectors (kwargs go to
+        IVFIndex.train: nlist, quantization, subspaces) and start using it.
+        """
+        return self.install_ann(self.train_ann(**kwargs))
+
+    def train_ann(self, vectors: Optional[np.ndarray] = None, **kwargs: Any) -> IVFIndex:
+        """
+        Train an ANN index over vectors (by default the published ones) without
+        using it yet (see install_ann).
+        """
+        if vectors is None:
+            vectors = self.vectors
+        if vectors is None or not len(vectors):
+            raise ValueError("No vectors to index; run indexing first")
+        return IVFIndex.train(vectors, **kwargs)
+
+    def install_ann(self, ann: IVFIndex) -> Dict[str, Any]:
+        """Persist an index from train_ann and start using it; rows flushed since training are scanned exactly."""
+        matrix, records, id_rows, _, dead = self._snapshot
+        if len(ann) > len(records):
+            raise ValueError("The ANN index does not match the published vectors; train it again")
+        ann.save(self._ann_path)
+        if os.path.exists(self._chunks_path):
+            self._append_chunks([{"ann_rows": len(ann)}])
+        else:
+            self._write_chunks(records, len(ann), dead)
+            os.replace(f"{self._chunks_path}.tmp", self._chunks_path)
+            os.remove(self._legacy_chunks_path)
+        self._snapshot = (matrix, records, id_rows, IVFIndex.load(self._ann_path, rows=len(ann)), dead)
+        return {**ann.describe(), "vector_bytes": int(matrix.nbytes)}
+
+    def drop_ann(self):
+        """Delete the ANN index; searches go back to the exact scan."""
+        shutil.rmtree(self._ann_path, ignore_errors=True)
+        matrix, records, id_rows, _, dead = self._snapshot
+        self._snapshot = (matrix, records, id_rows, None, dead)
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        encode = getattr(self.embedding_function, "encode", None)
+        if encode is not None:
+            vectors = encode(texts)
+        else:
+            vectors = self.embedding_function.embed_documents(texts)
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        return self.add_embeddings(texts, self._embed(texts), metadatas=metadatas, ids=ids)
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        vectors: np.ndarray,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Stage precomputed embeddings; an existing ID is replaced on flush."""
+        if ids is None:
+            start = len(self) + sum(len(batch[0]) for batch in self._staged_adds)
+            ids = [f"chunk-{start + i}" for i in range(len(texts))]
+        metadatas = metadatas or [{} for _ in texts]
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        self._staged_adds.append((list(ids), list(texts), list(metadatas), vectors))
+        return list(ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        if ids is None:
+            return False
+        self._staged_deletes.update(ids)
+        return True
+
+    def delete_collection(self):
+        """Drop every vector, both staged and persisted."""
+        self._staged_adds = []
+        self._staged_deletes = set()
+        self._snapshot = (None, [], {}, None, None)
+        for path in (self._vectors_path, self._chunks_path, self._legacy_chunks_path):
+            if os.path.exists(path):
+                os.remove(path)
+        shutil.rmtree(self._ann_path, ignore_errors=True)
+
+    def flush(self):
+        """Apply staged writes, persist them (appended, or compacted) and publish the new snapshot."""
+        if not self._staged_adds and not self._staged_deletes:
+            return
+
+        matrix, records, id_rows, ann, dead = self._snapshot
+        replaced = set(self._staged_deletes)
+        for batch_ids, _, _, _ in self._staged_adds:
+            replaced.update(batch_ids)
+        removed = sorted(id_rows[chunk_id] for chunk_id in replaced if chunk_id in id_rows)
+        added = [vectors for _, _, _, vectors in self._staged_adds]
+        new_records = [
+            {"id": chunk_id, "text": text, "metadata": metadata}
+            for batch_ids, texts, metadatas, _ in self._staged_adds
+            for chunk_id, text, metadata in zip(batch_ids, texts, metadatas)
+        ]
+
+        rows = len(records) + len(new_records)
+        dead_rows = len(removed) + (int(dead.sum()) if dead is not None else 0)
+        compact = (
+            matrix is None
+            or not os.path.exists(self._chunks_path)
+            or dead_rows > COMPACT_DEAD_FRACTION * rows
+            or (ann is not None and rows - len(ann) > COMPACT_UNINDEXED_FRACTION * rows)
+            or not self._append_vectors(len(records), added)
+        )
+        if compact:
+            self._compact(removed, new_records, added)
+        else:
+            # Written last and in one go: these lines publish the appended rows
+            self._append_chunks(new_records + ([{"deleted": removed}] if removed else []))
+
+        self._staged_adds = []
+        self._staged_deletes = set()
+        self._load()
+
+    def _append_vectors(self, rows: int, added: List[np.ndarray]) -> bool:
+        """
+        Write added rows after the first ``rows`` of vectors.npy and grow its
+        header in place; False (nothing written) if the file cannot take them.
+        """
+        dim = added[0].shape[1] if added else None
+        with open(self._vectors_path, "r+b") as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            data_offset = f.tell()
+            dim = dim or shape[1]
+            if fortran_order or dtype != np.float32 or shape[1] != dim:
+                return False
+            header = io.BytesIO()
+            grown = {
+                "descr": np.lib.format.dtype_to_descr(dtype),
+                "fortran_order": False,
+                "shape": (rows + sum(map(len, added)), dim),
+            }
+            if version == (1, 0):
+                np.lib.format.write_array_header_1_0(header, grown)
+            else:
+                np.lib.format.write_array_header_2_0(header, grown)
+            if header.tell() != data_offset:
+                return False
+            # Rows past the published ones (from a flush cut short) are overwritten
+            f.seek(data_offset + rows * dim * dtype.itemsize)
+            for vectors in added:
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            f.truncate()
+            f.seek(0)
+            f.write(header.getvalue())
+        return True
+
+    def _append_chunks(self, entries: List[Dict[str, Any]]):
+        """Append side table lines after the last whole one (dropping a partial line a flush cut short left)."""
+        data = "".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8")
+        with open(self._chunks_path, "r+b") as f:
+            f.seek(self._chunks_size)
+            f.write(data)
+            f.truncate()
+        self._chunks_size += len(data)
+
+    def _write_chunks(self, records: List[Dict[str, Any]], ann_rows: int, dead: Optional[np.ndarray] = None):
+        with open(f"{self._chunks_path}.tmp", "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": CHUNKS_FORMAT_VERSION, "ann_rows": ann_rows}) + "\n")
+            f.writelines(json.dumps(record) + "\n" for record in records)
+            if dead is not None and dead.any():
+                f.write(json.dumps({"deleted": np.flatnonzero(dead).tolist()}) + "\n")
+
+    def _compact(self, removed: List[int], new_records: List[Dict[str, Any]], added: List[np.ndarray]):
+        """Rewrite both files with only the live rows, then the added ones, and rename them into place."""
+        matrix, records, _, ann, dead = self._snapshot
+        alive = np.ones(len(records), dtype=bool)
+        if dead is not None:
+            alive &= ~dead
+        alive[removed] = False
+        keep = np.flatnonzero(alive)
+        kept_records = [records[i] for i in keep] + new_records
+
+        if matrix is not None:
+            dim = matrix.shape[1]
+        else:
+            dim = added[0].shape[1] if added else 0
+
+        os.makedirs(self.persist_directory, exist_ok=True)
+        # Stream rows into a memory-mapped temp file (no second in-memory copy of
+        # the matrix), then rename, so processes that still map the old file keep
+        # a consistent view until they reload.
+        new_matrix = np.lib.format.open_memmap(
+            f"{self._vectors_path}.tmp", mode="w+", dtype=np.float32, shape=(len(kept_records), dim)
+        )
+        row = 0
+        for start in range(0, len(keep), FLUSH_BLOCK_ROWS):
+            block = keep[start:start + FLUSH_BLOCK_ROWS]
+            new_matrix[row:row + len(block)] = matrix[block]
+            row += len(block)
+        for vectors in added:
+            new_matrix[row:row + len(vectors)] = vectors
+            row += len(vectors)
+        new_matrix.flush()
+        del new_matrix
+
+        ann_rows = 0
+        if ann is not None:
+            # Carry the indexed rows' codes over and encode the rest with the trained
+            # centroids and quantizer; rebuild with build_ann after large changes
+            indexed = keep[keep < len(ann)]
+            unindexed = [np.asarray(matrix[keep[keep >= len(ann)]], dtype=np.float32), *added]
+            ann = ann.update(indexed, np.concatenate(unindexed))
+            ann.save(self._ann_path)
+            ann_rows = len(ann)
+        self._write_chunks(kept_records, ann_rows)
+        os.replace(f"{self._vectors_path}.tmp", self._vectors_path)
+        os.replace(f"{self._chunks_path}.tmp", self._chunks_path)
+        if os.path.exists(self._legacy_chunks_path):
+            os.remove(self._legacy_chunks_path)
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        """Published chunks by ID; unknown IDs are skipped."""
+        _, records, id_rows, _, _ = self._snapshot
+        found = []
+        for chunk_id in ids:
+            row = id_rows.get(chunk_id)
+            if row is not None:
+                record = records[row]
+                found.append(Document(page_content=record["text"], metadata=record["metadata"], id=record["id"]))
+        return found
+
+    def similarity_search_by_vector_with_relevance_scores(
+        self, embedding: List[float], k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """
+        Top-k by dot product; scores are cosine distances (lower is closer), like
+        Chroma. Uses the ANN index when there is one, unless exact=True is passed;
+        nprobe and rerank override the store's defaults for this query.
+        """
+        matrix, records, id_rows, ann, dead = self._snapshot
+        if matrix is None or not id_rows or k <= 0:
+            return []
+
+        query = _normalize(np.asarray(embedding, dtype=np.float32)[None, :])[0]
+        k = min(k, len(id_rows))
+        if ann is not None and not kwargs.get("exact"):
+            top, top_scores = ann.search(
+                query, k, matrix, nprobe=kwargs.get("nprobe") or self.nprobe, rerank=kwargs.get("rerank", self.rerank),
+                dead=dead,
+            )
+            if len(ann) < len(records):
+                # Rows flushed since the index was built are scanned exactly
+                tail = np.asarray(matrix[len(ann):] @ query)
+                if dead is not None:
+                    tail[dead[len(ann):]] = -np.inf
+                top = np.concatenate([top, np.arange(len(ann), len(records))])
+                top_scores = np.concatenate([top_scores, tail])
+                best = np.argsort(-top_scores, kind="stable")[:k]
+                best = best[np.isfinite(top_scores[best])]
+                top, top_scores = top[best], top_scores[best]
+        else:
+            scores = np.asarray(matrix @ query)
+            if dead is not None:
+                scores[dead] = -np.inf
+            if k < len(records):
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(len(records))
+            top = top[np.argsort(-scores[top], kind="stable")][:k]
+            top_scores = scores[top]
+
+        results = []
+        for row, score in zip(top, top_scores):
+            record = records[row]
+            doc = Document(page_content=record["text"], metadata=record["metadata"], id=record["id"])
+            results.append((doc, float(1.0 - score)))
+        return results
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_relevance_scores(self.embedding_function.embed_query(query), k=k)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_relevance_scores(embedding, k=k)]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k)]
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        persist_directory: str = "./vector_db",
+        **kwargs: Any,
+    ) -> "NumpyVectorStore":
+        store = cls(persist_directory=persist_directory, embedding_function=embedding)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        store.flush()
+        return store
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
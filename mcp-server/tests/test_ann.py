@@ -0,0 +1,156 @@
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+
+def _clustered(rows, dim=64, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vectors = (centers[rng.integers(0, clusters, rows)] + 0.3 * rng.normal(size=(rows, dim))).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("quantization", ["pq", "int8"])
+def test_ivf_index_recall_memory_and_persistence(tmp_path, quantization):
+    """Probing every list with a deep rerank is exact; codes are far smaller than float32."""
+    from ann import IVFIndex
+
+    vectors = _clustered(3000)
+    index = IVFIndex.train(vectors, nlist=20, quantization=quantization, subspaces=8)
+    # Fixed costs (codebooks, centroids) dominate at this size; per-vector codes are 8 or 64 bytes vs 256
+    assert index.describe()["code_bytes_per_vector"] == (8 if quantization == "pq" else 64)
+    assert index.memory_bytes() < vectors.nbytes / (5 if quantization == "pq" else 3)
+
+    queries = _clustered(20, seed=1)
+    for query in queries:
+        exact = np.argsort(-(vectors @ query))[:5]
+        rows, scores = index.search(query, 5, vectors, nprobe=20, rerank=1000)
+        assert list(rows) == list(exact)
+        assert np.allclose(scores, vectors[rows] @ query)
+    recall = np.mean([
+        len(set(index.search(q, 5, vectors, nprobe=4, rerank=50)[0]) & set(np.argsort(-(vectors @ q))[:5])) / 5
+        for q in queries
+    ])
+    assert recall >= 0.75
+
+    index.save(str(tmp_path / "ann"))
+    assert IVFIndex.load(str(tmp_path / "ann"), rows=2999) is None
+    loaded = IVFIndex.load(str(tmp_path / "ann"), rows=3000)
+    assert list(loaded.search(queries[0], 5, vectors)[0]) == list(index.search(queries[0], 5, vectors)[0])
+
+
+def test_numpy_store_keeps_ann_index_in_step_with_flushes(tmp_path):
+    """Searches go through the ANN index; adds and deletes update it; a rebuild of the store drops it."""
+    from embeddings import HashingEmbeddings
+    from vector_store import ANN_DIRNAME, NumpyVectorStore
+
+    embedder = HashingEmbeddings(dim=64)
+    store = NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=embedder, nprobe=8, rerank=50)
+    texts = [f"rule {i} requires {word} reviews" for i, word in enumerate(["two", "signed", "fast", "owner"] * 50)]
+    store.add_texts(texts, ids=[f"doc-{i}" for i in range(len(texts))])
+    store.flush()
+    stats = store.build_ann(nlist=8, quantization="int8")
+    assert (stats["rows"], stats["nlist"]) == (200, 8)
+
+    store.delete(ids=["doc-0", "doc-1"])
+    store.add_texts(["squash merges only on main"], ids=["merge"])
+    store.flush()
+    # The index still covers the rows it was built on; the added row is scanned exactly until compaction
+    assert store.ann is not None and len(store.ann) == 200 and len(store) == 199
+
+    reloaded = NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=embedder, nprobe=8, rerank=50)
+    assert reloaded.ann is not None
+    doc, score = reloaded.similarity_search_with_score("squash merges only on main", k=1)[0]
+    assert doc.id == "merge" and abs(score) < 1e-5
+    approx = [doc.id for doc in reloaded.similarity_search("rule 7 requires owner reviews", k=3)]
+    exact = [doc.id for doc, _ in reloaded.similarity_search_by_vector_with_relevance_scores(
+        embedder.embed_query("rule 7 requires owner reviews"), k=3, exact=True)]
+    assert approx == exact
+
+
+    # Compaction drops the deleted rows and folds the unindexed ones into the index
+    reloaded.add_texts([f"extra rule {i}" for i in range(30)], ids=[f"extra-{i}" for i in range(30)])
+    reloaded.flush()
+    assert len(reloaded.ann) == len(reloaded) == 229 == len(reloaded._snapshot[1])
+    assert reloaded.similarity_search("squash merges only on main", k=1)[0].id == "merge"
+
+    reloaded.delete_collection()
+    assert not os.path.exists(tmp_path / ANN_DIRNAME)
+
+
+def test_search_engine_swaps_in_the_ann_index_under_the_write_lock(tmp_path):
+    """Training runs beside searches; an index re-written meanwhile is not overwritten with a stale one."""
+    from search import SemanticSearch
+
+    docs = tmp_path / "repo"
+    docs.mkdir()
+    for i in range(40):
+        (docs / f"rule-{i}.md").write_text(f"# Rule {i}\n\nRepository {i} requires {i % 4 + 1} reviews.\n")
+    engine = SemanticSearch(str(tmp_path / "db"), embedding_backend="local", vector_store_backend="numpy")
+    engine.index_documents(str(docs))
+
+    engine.search("requires reviews", limit=3)
+    generation = engine.generation
+    assert engine.build_ann_index(nlist=4, quantization="int8")["rows"] == 40
+    assert engine.generation == generation + 1 and len(engine.result_cache) == 0
+
+    # A re-index lands between training and the swap
+    lock = engine._index_lock
+    (docs / "rule-0.md").write_text("# Rule 0\n\nSquash merges only.\n")
+
+    class ReindexBeforeSwap:
+        read = lock.read
+
+        def write(self):
+            engine._index_lock = lock
+            engine.index_documents(str(docs))
+            return lock.write()
+
+    engine._index_lock = ReindexBeforeSwap()
+    with pytest.raises(RuntimeError, match="changed while"):
+        engine.build_ann_index(nlist=4, quantization="int8")
+    # The index kept in step by the re-index stays in place
+    assert len(engine.vector_store.ann) == 40
+    assert engine.search("squash merges", limit=1)[0]["source"].endswith("rule-0.md")
+
+
+def test_searches_and_reindexing_run_while_the_ann_index_trains(tmp_path):
+    """A writer queued during training must not stall searches behind it."""
+    import threading
+    from search import SemanticSearch
+
+    docs = tmp_path / "repo"
+    docs.mkdir()
+    for i in range(40):
+        (docs / f"rule-{i}.md").write_text(f"# Rule {i}\n\nRepository {i} requires {i % 4 + 1} reviews.\n")
+    engine = SemanticSearch(str(tmp_path / "db"), embedding_backend="local", vector_store_backend="numpy")
+    engine.index_documents(str(docs))
+    (docs / "rule-0.md").write_text("# Rule 0\n\nSquash merges only.\n")
+
+    train = engine.vector_store.train_ann
+    during_training = {}
+
+    def train_alongside_writer_and_search(vectors, **kwargs):
+        writer = threading.Thread(target=engine.index_documents, args=(str(docs),))
+        searcher = threading.Thread(
+            target=lambda: during_training.setdefault("results", engine.search("squash merges", limit=1))
+        )
+        writer.start()
+        searcher.start()
+        for thread in (writer, searcher):
+            thread.join(timeout=10)
+        during_training["finished"] = not writer.is_alive() and not searcher.is_alive()
+        return train(vectors, **kwargs)
+
+    engine.vector_store.train_ann = train_alongside_writer_and_search
+    with pytest.raises(RuntimeError, match="changed while"):
+        engine.build_ann_index(nlist=4, quantization="int8")
+    assert during_training["finished"]
+    assert during_training["results"][0]["source"].endswith(".md")
+    # The re-index went through and is searchable
+    assert engine.search("squash merges", limit=1)[0]["source"].endswith("rule-0.md")
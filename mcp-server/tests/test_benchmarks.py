@@ -0,0 +1,29 @@
+import sys
+import os
+
+# Add benchmarks to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../benchmarks")))
+
+
+def test_corpus_is_deterministic(tmp_path):
+    """The same seed and size always produce the same corpus."""
+    from corpus import generate_corpus
+
+    first = generate_corpus(str(tmp_path / "a"), 12, seed=3)
+    second = generate_corpus(str(tmp_path / "b"), 12, seed=3)
+    assert first == second
+    a = sorted(p.read_text() for p in (tmp_path / "a").rglob("*.md"))
+    b = sorted(p.read_text() for p in (tmp_path / "b").rglob("*.md"))
+    assert a == b and len(a) == 12
+
+
+def test_benchmark_smoke(tmp_path):
+    """A tiny offline run produces every result section and compares against itself cleanly."""
+    from run_benchmarks import compare, run_benchmarks
+
+    results = run_benchmarks(docs=20, queries=5, mcp_calls=8, concurrency=4, work_dir=str(tmp_path))
+    assert results["indexing"]["documents"] == 20
+    assert set(results["query_latency_ms"]) == {"hybrid", "vector", "keyword"}
+    assert results["mcp"]["errors"] == 0
+    assert results["memory"]["max_rss_mb"] > 0
+    assert compare(results, results, max_regression=0.2) == []
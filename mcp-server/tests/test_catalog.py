@@ -0,0 +1,124 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+
+def _make_repo(tmp_path):
+    (tmp_path / "standards").mkdir()
+    (tmp_path / "workflows").mkdir()
+    (tmp_path / "standards" / "python.md").write_text(
+        "---\nowner: platform\n---\n# Python Style\n\n## Imports\n\n```\n# not a heading\n```\n\n## Naming\n"
+    )
+    (tmp_path / "workflows" / "review.md").write_text("# Review\n\nTwo approvals.\n")
+    return tmp_path
+
+
+def test_catalog_indexes_metadata(tmp_path):
+    """Documents are indexed once with titles, headings and front matter."""
+    from catalog import DocumentCatalog
+
+    catalog = DocumentCatalog(str(_make_repo(tmp_path)))
+    assert catalog.list_uris() == ["governance://standards/python", "governance://workflows/review"]
+    entry = catalog.get("standards", "python")
+    assert entry.title == "Python Style"
+    assert [h.title for h in entry.headings] == ["Python Style", "Imports", "Naming"]
+    assert entry.front_matter == {"owner": "platform"}
+
+
+def test_catalog_serves_from_memory_and_invalidates(tmp_path):
+    """Reads hit the cache until the file changes on disk."""
+    from catalog import DocumentCatalog
+
+    repo = _make_repo(tmp_path)
+    catalog = DocumentCatalog(str(repo), poll_interval=0)
+    assert catalog.read("workflows", "review").startswith("# Review")
+    assert catalog.cache_stats()["hits"] == 1
+
+    path = repo / "workflows" / "review.md"
+    path.write_text("# Review v2\n\nThree approvals.\n")
+    os.utime(path, (1, 1))
+    assert catalog.read("workflows", "review").startswith("# Review v2")
+    assert catalog.get("workflows", "review").title == "Review v2"
+
+    path.unlink()
+    assert catalog.read("workflows", "review") is None
+    assert catalog.list_uris() == ["governance://standards/python"]
+
+
+def test_catalog_respects_byte_budget(tmp_path):
+    """The content cache never holds more than its byte budget."""
+    from catalog import DocumentCatalog
+
+    catalog = DocumentCatalog(str(_make_repo(tmp_path)), max_bytes=60)
+    catalog.read("standards", "python")
+    catalog.read("workflows", "review")
+    assert catalog.cache_stats()["cached_bytes"] <= 60
+
+
+def test_catalog_reads_single_section(tmp_path):
+    """Sections are sliced out of the document through the precomputed outline."""
+    from catalog import DocumentCatalog
+
+    catalog = DocumentCatalog(str(_make_repo(tmp_path)))
+    section, text = catalog.read_section("standards", "python", "imports")
+    assert section.path == ["Python Style", "Imports"]
+    assert text.startswith("## Imports") and "# not a heading" in text and "Naming" not in text
+    assert catalog.read_section("standards", "python", "Naming")[1] == "## Naming\n"
+    assert catalog.read_section("standards", "python", "missing") is None
+
+
+def test_catalog_ranged_reads_and_validators(tmp_path):
+    """Line and byte ranges are served by seeking when the document is not cached."""
+    from catalog import DocumentCatalog
+
+    repo = _make_repo(tmp_path)
+    catalog = DocumentCatalog(str(repo), max_bytes=0, poll_interval=0)
+    entry = catalog.get("standards", "python")
+    data = (repo / "standards" / "python.md").read_bytes()
+    assert entry.line_count == data.count(b"\n")
+
+    start, end = catalog.line_range(entry, 4, 6)
+    assert catalog.read_range("standards", "python", start, end)[1] == b"# Python Style\n\n## Imports\n"
+    assert catalog.line_at(entry, start) == 4 and catalog.line_at(entry, end - 1) == 6
+    assert catalog.read_range("standards", "python", 0, 3)[1] == b"---"
+    assert catalog.cache_stats()["ranged_reads"] == 2
+
+    etag = entry.etag
+    path = repo / "standards" / "python.md"
+    path.write_text("# Python Style\n\n## Imports\n\nSorted.\n")
+    os.utime(path, (1, 1))
+    section, text = catalog.read_section("standards", "python", "imports")
+    assert text == "## Imports\n\nSorted.\n"
+    assert catalog.get("standards", "python").etag != etag
+
+
+def test_catalog_gives_up_on_a_document_that_keeps_changing(tmp_path):
+    """A ranged read re-indexes a changed document a bounded number of times."""
+    import pytest
+    from catalog import READ_ATTEMPTS, DocumentCatalog
+
+    repo = _make_repo(tmp_path)
+    path = repo / "standards" / "python.md"
+    catalog = DocumentCatalog(str(repo), max_bytes=0, poll_interval=0)
+    refresh = catalog.refresh
+    reindexed = []
+
+    def refresh_then_edit(force=False):
+        refresh(force=force)
+        # Someone writes to the document again right after it is indexed
+        reindexed.append(force)
+        with open(path, "a") as f:
+            f.write("More.\n")
+        os.utime(path, (len(reindexed), len(reindexed)))
+
+    catalog.refresh = refresh_then_edit
+    with pytest.raises(RuntimeError, match="kept changing"):
+        catalog.read_range("standards", "python", 0, 3)
+    assert reindexed.count(True) == READ_ATTEMPTS
+
+    # Once the writes stop, the next read serves the current content
+    catalog.refresh = refresh
+    catalog.refresh(force=True)
+    assert catalog.read_range("standards", "python", 0, 3)[1] == b"---"
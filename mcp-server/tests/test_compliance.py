@@ -0,0 +1,213 @@
+import datetime
+import json
+import os
+import sys
+import time
+import types
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+RULES_FILE = os.path.join(REPO_ROOT, "github-settings", "branch-protection-rules.yaml")
+FIXTURE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../fixtures/org-snapshot.json"))
+
+
+def _rules(today=datetime.date(2026, 1, 15)):
+    from compliance import RuleSet
+    return RuleSet.load(RULES_FILE, today=today)
+
+
+def test_rules_apply_overrides_and_exceptions():
+    from compliance import RuleSet
+
+    rules = _rules()
+    payment = rules.branch_rules("payment-service")["main"]
+    assert payment["required_pull_request_reviews"]["required_approving_review_count"] == 3
+    assert payment["required_pull_request_reviews"]["dismiss_stale_reviews"] is True  # inherited default
+    assert {c["context"] for c in payment["required_status_checks"]["checks"]} >= {"compliance-check"}
+
+    # The experimental-project exception expired on 2025-12-31
+    assert rules.branch_rules("experimental-project")["main"]["allow_force_pushes"] is False
+    active = RuleSet.load(RULES_FILE, today=datetime.date(2025, 6, 1))
+    assert active.branch_rules("experimental-project")["main"]["allow_force_pushes"] is True
+
+
+def test_fixture_evaluation_and_report_data():
+    from compliance import ComplianceEngine, FixtureSource
+
+    data = ComplianceEngine(_rules(), FixtureSource(FIXTURE), max_workers=4).report_data()
+    repos = {repo["name"]: repo for repo in data["repositories"]}
+
+    assert repos["org-governance"]["compliant"] is True
+    assert repos["org-governance"]["score"] == 100
+
+    payment_rules = {v["rule"] for v in repos["payment-service"]["violations"]}
+    assert {"required-reviews", "required-status-checks", "branch-protection-missing", "pr-template-missing"} <= payment_rules
+
+    experimental = {v["rule"]: v["severity"] for v in repos["experimental-project"]["violations"]}
+    assert experimental["branch-protection-missing"] == "P0"
+    assert experimental["pre-commit-hook-missing"] == "P1"
+    assert "codeowners-missing" in experimental
+
+    assert data["total_repos"] == 3 and data["compliant_repos"] == 1
+    assert data["active_violations"] == sum(len(r["violations"]) for r in data["repositories"])
+    assert data["health_score"] == round(sum(r["score"] for r in data["repositories"]) / 3)
+    assert data["recommendations"][0].startswith("[P0]")
+
+
+def test_local_clone_source(tmp_path):
+    from compliance import LocalCloneSource, evaluate_repository
+
+    repo = tmp_path / "service-a"
+    (repo / ".git" / "hooks").mkdir(parents=True)
+    (repo / ".git" / "refs" / "heads").mkdir(parents=True)
+    (repo / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (repo / ".git" / "refs" / "heads" / "main").write_text("abc123\n")
+    (repo / "README.md").write_text("# Service A")
+
+    source = LocalCloneSource(str(tmp_path))
+    assert source.list_repositories() == ["service-a"]
+    snapshot = source.load("service-a")
+    assert snapshot.head == "abc123"
+    assert snapshot.pre_commit_hook is False
+
+    # Without a protection export the source cannot tell, so the check is skipped, not failed
+    assert snapshot.branches is None
+    result = evaluate_repository(snapshot, _rules())
+    rules = {v.rule for v in result.violations}
+    assert {"pre-commit-hook-missing", "contributing-missing"} <= rules
+    assert "branch-protection-missing" not in rules and "readme-missing" not in rules
+    assert result.unknown == ["branch-protection"] and result.to_dict()["unknown"] == ["branch-protection"]
+
+    (repo / ".github").mkdir()
+    (repo / ".github" / "branch-protection.json").write_text(json.dumps({"main": {"protection": None}}))
+    result = evaluate_repository(source.load("service-a"), _rules())
+    assert "branch-protection-missing" in {v.rule for v in result.violations}
+    assert result.unknown == []
+
+
+def test_streaming_report_formats():
+    import csv
+    import io
+    from reporting import ComplianceReporter, get_mock_compliance_data
+
+    reporter = ComplianceReporter()
+    data = get_mock_compliance_data()
+
+    markdown = reporter.generate_report(data)
+    assert "| --- | --- | --- |" in markdown
+    assert "| payments-api | ❌ | Missing Branch Protection |" in markdown
+
+    parsed = json.loads(reporter.generate_report(data, format="json"))
+    assert parsed["health_score"] == 92
+    assert [r["name"] for r in parsed["repositories"]] == ["stock-v3", "payments-api", "org-governance"]
+
+    rows = list(csv.reader(io.StringIO(reporter.generate_report(data, format="csv"))))
+    assert rows[0][0] == "repository" and len(rows) == 4
+
+    assert reporter.generate_report(data, format="pdf") == "Unsupported format"
+
+
+def test_large_report_streams_from_generator():
+    import io
+    from reporting import ComplianceReporter
+
+    def repositories(count):
+        for i in range(count):
+            yield {"name": f"repo-{i}", "compliant": i % 2 == 0, "issues": [] if i % 2 == 0 else ["Missing CONTRIBUTING.md"]}
+
+    reporter = ComplianceReporter()
+    timings = []
+    for count in (2000, 20000):
+        out = io.StringIO()
+        start = time.perf_counter()
+        reporter.write_report({"repositories": repositories(count)}, out, format="markdown")
+        timings.append(time.perf_counter() - start)
+        assert out.getvalue().count("\n| repo-") == count
+    # 10x the repositories should cost roughly 10x, not 100x
+    assert timings[1] < timings[0] * 40
+
+
+def test_result_store_reevaluates_only_changed_repos(tmp_path):
+    from compliance import ComplianceEngine, FixtureSource, ResultStore, RuleSet, summarize
+
+    fixture = tmp_path / "org.json"
+    org = json.load(open(FIXTURE))
+    fixture.write_text(json.dumps(org))
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    rules = _rules()
+
+    def run(ruleset=rules):
+        engine = ComplianceEngine(ruleset, FixtureSource(str(fixture)), store=store)
+        data = engine.report_data()
+        # Streamed from the store, not loaded whole
+        assert isinstance(data["repositories"], types.GeneratorType)
+        return engine, {**data, "repositories": list(data["repositories"])}
+
+    engine, first = run()
+    assert engine.last_refresh == {"evaluated": 3, "unchanged": 0, "removed": 0}
+    engine, second = run()
+    assert engine.last_refresh == {"evaluated": 0, "unchanged": 3, "removed": 0}
+    assert second == first
+
+    # Fix one repo and drop another: incremental aggregates match a full evaluation
+    org["repositories"][2]["files"] += ["CONTRIBUTING.md", "CODEOWNERS", ".github/pull_request_template.md"]
+    del org["repositories"][1]
+    fixture.write_text(json.dumps(org))
+    engine, third = run()
+    assert engine.last_refresh == {"evaluated": 1, "unchanged": 1, "removed": 1}
+    full = summarize(ComplianceEngine(rules, FixtureSource(str(fixture))).evaluate_all())
+    assert third == full
+
+    # A new rule set version re-evaluates everything
+    changed_rules = RuleSet(rules.config, "other-version", today=rules.today)
+    engine, _ = run(changed_rules)
+    assert engine.last_refresh["evaluated"] == 2
+
+
+def test_result_store_reevaluates_when_an_exception_expires(tmp_path):
+    from compliance import ComplianceEngine, FixtureSource, ResultStore
+
+    fixture = tmp_path / "org.json"
+    fixture.write_text(json.dumps({"repositories": [{
+        "name": "experimental-project", "head": "abc123", "files": ["README.md"],
+        "branches": {"main": {"protection": {"allow_force_pushes": {"enabled": True}}}},
+    }]}))
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+
+    def rules_on(today):
+        engine = ComplianceEngine(_rules(today), FixtureSource(str(fixture)), store=store)
+        (repo,) = engine.report_data()["repositories"]
+        return engine.last_refresh, {v["rule"] for v in repo["violations"]}
+
+    # The force-push exception expires on 2025-12-31
+    refresh, rules = rules_on(datetime.date(2025, 6, 1))
+    assert refresh["evaluated"] == 1 and "force-pushes-allowed" not in rules
+    refresh, rules = rules_on(datetime.date(2025, 12, 31))
+    assert refresh["evaluated"] == 0
+    refresh, rules = rules_on(datetime.date(2026, 1, 1))
+    assert refresh["evaluated"] == 1 and "force-pushes-allowed" in rules
+
+
+def test_result_store_noop_rerun_is_fast(tmp_path):
+    from compliance import ComplianceEngine, FixtureSource, ResultStore
+
+    repos = [
+        {"name": f"repo-{i:05d}", "head": f"{i:040x}", "files": ["README.md"] if i % 3 else [],
+         "branches": {"main": {"protection": None if i % 7 == 0 else {"enforce_admins": True}}}}
+        for i in range(5000)
+    ]
+    fixture = tmp_path / "org.json"
+    fixture.write_text(json.dumps({"repositories": repos}))
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    source = FixtureSource(str(fixture))
+
+    ComplianceEngine(_rules(), source, store=store).refresh()
+    start = time.perf_counter()
+    engine = ComplianceEngine(_rules(), source, store=store)
+    data = engine.report_data()
+    elapsed = time.perf_counter() - start
+    assert engine.last_refresh["evaluated"] == 0
+    assert data["total_repos"] == 5000
+    assert elapsed < 10
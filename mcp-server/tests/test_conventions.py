@@ -0,0 +1,113 @@
+import sys
+import os
+import datetime
+import shutil
+import subprocess
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+GIT_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+def _git(path, *args):
+    return subprocess.run(["git", "-C", str(path), *args], check=True, capture_output=True, text=True, env=GIT_ENV).stdout
+
+
+def _commit(path, *subjects):
+    for subject in subjects:
+        _git(path, "commit", "--allow-empty", "-q", "-m", subject)
+
+
+def _clone(root, name, *subjects):
+    path = root / name
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _commit(path, *subjects)
+    return path
+
+
+def test_rules_are_read_from_the_standards():
+    from conventions import ConventionRules
+
+    rules = ConventionRules.load(REPO_ROOT)
+    assert {"feat", "fix", "docs", "revert"} <= set(rules.types)
+    assert {"feature", "feature-group", "epic", "bugfix", "hotfix", "perf"} <= set(rules.branch_prefixes)
+    assert rules.max_description == 72
+
+    assert rules.check_subject("feat(auth): add password reset functionality") == []
+    assert rules.check_subject("feat(api)!: change authentication endpoint structure") == []
+    assert rules.check_subject("fix: API returns 404 for archived repos") == []
+    for subject in ("update stuff", "WIP", "Fixed bug", "feature: add x", "feat:add x", "fixup! feat: add x"):
+        assert rules.check_subject(subject) == ["commit-message-format"], subject
+    assert rules.check_subject("feat: Add feature.") == ["commit-description-style"]
+    assert rules.check_subject("docs: " + "x" * 73) == ["commit-description-length"]
+
+    for branch in ("main", "development", "feature/user-authentication", "hotfix/security-vulnerability-cve-2024-1234"):
+        assert rules.branch_ok(branch), branch
+    for branch in ("master", "my-feature", "feature/User_Auth", "feature/", "release/1.0"):
+        assert not rules.branch_ok(branch), branch
+    # Editing prose in the standards leaves the rule version alone
+    assert ConventionRules.load(REPO_ROOT).version == rules.version
+
+
+def test_scanner_is_incremental_and_feeds_compliance(tmp_path):
+    from compliance import LocalCloneSource, RuleSet, evaluate_repository
+    from conventions import ConventionRules, ConventionScanner, ConventionStore
+
+    root = tmp_path / "clones"
+    root.mkdir()
+    api = _clone(root, "api", "feat: add orders endpoint", "update stuff", "fix(db): Handle null ids.")
+    _git(api, "branch", "feature/orders")
+    _git(api, "branch", "Johns-Branch")
+    web = _clone(root, "web", "chore: initial commit", "docs: add readme")
+
+    rules = ConventionRules.load(REPO_ROOT)
+    store = ConventionStore(str(tmp_path / "compliance.sqlite"))
+    scanner = ConventionScanner(rules, store, max_workers=2)
+    stats = scanner.scan_directory(str(root))
+    assert (stats["scanned"], stats["unchanged"], stats["commits"], stats["failed"]) == (2, 0, 5, {})
+
+    # Nothing new: HEAD is read from .git and no git process runs
+    assert scanner.scan_directory(str(root))["unchanged"] == 2
+
+    # Only the new commits are scanned, and their counts add up
+    _commit(api, "WIP")
+    stats = scanner.scan_directory(str(root))
+    assert (stats["scanned"], stats["commits"]) == (1, 1)
+    violations = dict(store.violations("api"))
+    assert violations["commit-message-format"].startswith("2 of 4 commit(s)")
+    assert "'Johns-Branch'" in violations["branch-naming"]
+    assert set(violations) == {"commit-message-format", "commit-description-style", "branch-naming"}
+    assert store.violations("web") == []
+
+    # Rewritten history is scanned from the start again
+    _git(api, "reset", "-q", "--hard", "HEAD~3")
+    _commit(api, "feat: add refunds")
+    _git(api, "branch", "-D", "Johns-Branch")
+    stats = scanner.scan_directory(str(root))
+    assert (stats["scanned"], stats["commits"]) == (1, 2)
+    assert store.violations("api") == []
+    _commit(api, "Add retries")
+    scanner.scan_directory(str(root))
+
+    # The scan results become violations in the compliance evaluation
+    snapshot = LocalCloneSource(str(root), conventions=store).load("api")
+    rules_file = os.path.join(REPO_ROOT, "github-settings", "branch-protection-rules.yaml")
+    result = evaluate_repository(snapshot, RuleSet.load(rules_file, today=datetime.date(2026, 1, 15)))
+    violation = next(v for v in result.violations if v.rule == "commit-message-format")
+    sha = _git(api, "log", "-1", "--format=%h").strip()
+    assert violation.severity == "P2"
+    assert violation.message == f"1 of 3 commit(s) not in Conventional Commits format: '{sha} Add retries'"
+    assert LocalCloneSource(str(root)).load("api").fingerprint() != snapshot.fingerprint()
+
+    # Removed clones are dropped from the scan state
+    shutil.rmtree(web)
+    assert scanner.scan_directory(str(root))["removed"] == 1
+    assert set(store.state()) == {"api"}
@@ -0,0 +1,136 @@
+import sys
+import os
+import asyncio
+import time
+
+import pytest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+FIXTURE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../fixtures/org-snapshot.json"))
+
+DAY = 86400
+START = 1767225600  # 2026-01-01T00:00:00Z
+
+
+def _run(repos):
+    """Report data for {name: [rules]} with a 10-point penalty per rule."""
+    repositories = [
+        {"name": name, "score": 100 - 10 * len(rules), "violations": [{"rule": rule} for rule in rules]}
+        for name, rules in repos.items()
+    ]
+    return {
+        "health_score": round(sum(r["score"] for r in repositories) / len(repositories)),
+        "active_violations": sum(len(rules) for rules in repos.values()),
+        "compliant_repos": sum(not rules for rules in repos.values()),
+        "total_repos": len(repositories),
+        "repositories": repositories,
+    }
+
+
+def test_history_records_changes_and_answers_trend_queries(tmp_path):
+    from history import ComplianceHistory
+
+    path = str(tmp_path / "compliance.sqlite")
+    history = ComplianceHistory(path)
+    repos = {"api": ["readme-missing"], "web": [], "ops": ["branch-protection-missing", "readme-missing"]}
+    history.record(_run(repos), START + 3600)
+    history.record(_run(repos), START + 7200)  # unchanged: a run row, no outcome rows
+    repos["web"] = ["required-reviews", "linear-history"]
+    history.record(_run(repos), START + 2 * DAY)
+    repos["ops"] = ["branch-protection-missing"]
+    del repos["api"]
+    history.close()
+
+    # A reopened history picks up where it left off
+    history = ComplianceHistory(path)
+    history.record(_run(repos), START + 9 * DAY)
+    repos["api"] = ["readme-missing"]
+    history.record(_run(repos), START + 10 * DAY)
+    conn = history._conn
+    assert conn.execute("SELECT COUNT(*) FROM history_runs").fetchone()[0] == 5
+    # 3 first outcomes, web's drop, ops' fix, api's removal, api's return
+    assert conn.execute("SELECT COUNT(*) FROM history_repo_outcomes").fetchone()[0] == 7
+
+    now = START + 10 * DAY + 60
+    trend = history.score_trend(days=30, now=now)
+    assert [day["day"] for day in trend] == ["2026-01-01", "2026-01-03", "2026-01-10", "2026-01-11"]
+    assert trend[0]["runs"] == 2 and trend[1]["health_score"] == 83
+
+    regressions = history.regressions(days=9, now=now)
+    assert regressions["since"].startswith("2026-01-01T02:00")
+    assert regressions["regressed"] == [
+        {"repo": "web", "score_then": 100, "score_now": 80, "new_rules": ["linear-history", "required-reviews"]}
+    ]
+    # Within the last week web did not change, and ops improved
+    assert history.regressions(days=7, now=now)["regressed"] == []
+
+    top = {rule["rule"]: rule for rule in history.top_rules(days=30, now=now)}
+    assert top["readme-missing"] == {
+        "rule": "readme-missing", "repo_days": 5, "days": 3, "newly_violated": 3, "current_repos": 1,
+    }
+    assert top["branch-protection-missing"]["current_repos"] == 1
+
+    # Append-only: runs are recorded in time order
+    with pytest.raises(ValueError):
+        history.record(_run(repos), START)
+
+
+def test_writers_sharing_a_database_see_each_others_runs(tmp_path):
+    """The server and the command line may both record runs into the same history."""
+    from history import ComplianceHistory
+
+    path = str(tmp_path / "compliance.sqlite")
+    server, cli = ComplianceHistory(path), ComplianceHistory(path)
+    server.record(_run({"api": [], "web": []}), START)
+    cli.record(_run({"api": ["readme-missing"], "web": []}), START + DAY)
+    # Back to the server's last recorded state: still a change against the latest run
+    server.record(_run({"api": [], "web": []}), START + 2 * DAY)
+
+    assert server.regressions(days=1, now=START + DAY + 60)["regressed"] == [
+        {"repo": "api", "score_then": 100, "score_now": 90, "new_rules": ["readme-missing"]}
+    ]
+    current = {rule["rule"]: rule["current_repos"] for rule in server.top_rules(days=7, now=START + 2 * DAY + 60)}
+    assert current == {"readme-missing": 0}
+    outcomes = server._conn.execute("SELECT COUNT(*) FROM history_repo_outcomes").fetchone()[0]
+    assert outcomes == 4  # api and web, api's drop, api's recovery
+
+
+def test_trend_queries_stay_fast_on_long_histories(tmp_path):
+    from history import ComplianceHistory
+
+    history = ComplianceHistory(str(tmp_path / "compliance.sqlite"))
+    rules = ["readme-missing", "contributing-missing", "required-reviews", "linear-history"]
+    repos = {f"repo-{i:04d}": rules[: i % 3] for i in range(2000)}
+    for day in range(180):
+        # A few repositories change every day
+        for i in range(day * 7, day * 7 + 20):
+            name = f"repo-{i % 2000:04d}"
+            repos[name] = rules[: (len(repos[name]) + 1) % 5]
+        history.record(_run(repos), START + day * DAY)
+
+    now = START + 180 * DAY
+    for query in (history.score_trend, history.regressions, history.top_rules):
+        started = time.perf_counter()
+        result = query(now=now)
+        assert time.perf_counter() - started < 0.25
+        assert result
+
+
+def test_report_runs_feed_compliance_trends(tmp_path, monkeypatch):
+    import server
+
+    # The benchmark tests may have imported the server against a synthetic corpus
+    monkeypatch.setattr(server, "BASE_PATH", REPO_ROOT)
+    monkeypatch.setenv("GOVERNANCE_COMPLIANCE_SOURCE", FIXTURE)
+    monkeypatch.setenv("GOVERNANCE_COMPLIANCE_DB", str(tmp_path / "compliance.sqlite"))
+
+    async def scenario():
+        await server.generate_compliance_report("json")
+        return await server.compliance_trends(days=7)
+
+    trends = asyncio.run(scenario())
+    assert trends["score"][-1]["total_repos"] == 3
+    assert trends["top_rules"][0]["current_repos"] >= 1
@@ -0,0 +1,31 @@
+import sys
+import os
+
+# Add src and the mcp-server directory (for the index_docs script) to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def test_index_docs_builds_the_index_and_ann(tmp_path, monkeypatch, capsys):
+    """The offline indexer runs end to end on a small tree: benchmark, index, ANN."""
+    import index_docs
+
+    root = tmp_path / "org-governance"
+    (root / "standards").mkdir(parents=True)
+    for i in range(12):
+        (root / "standards" / f"rule-{i}.md").write_text(f"# Rule {i}\n\nRepository {i} requires {i % 3 + 1} reviews.\n")
+    monkeypatch.setenv("GOVERNANCE_REPO_ROOT", str(root))
+    monkeypatch.setenv("GOVERNANCE_INDEX_DIR", str(tmp_path / "index"))
+    args = ["index_docs.py", "--embeddings", "local", "--vector-store", "numpy"]
+
+    monkeypatch.setattr(sys, "argv", args + ["--benchmark-embeddings"])
+    index_docs.main()
+    assert "Embedded 12 chunks" in capsys.readouterr().out
+    # Benchmarking leaves the index alone
+    assert not (tmp_path / "index" / "index_manifest.json").exists()
+
+    monkeypatch.setattr(sys, "argv", args + ["--ann", "--ann-quantization", "int8", "--ann-nlist", "2"])
+    index_docs.main()
+    out = capsys.readouterr().out
+    assert "Files: 12 added" in out
+    assert "ANN index: 12 vectors in 2 lists, int8 codes" in out
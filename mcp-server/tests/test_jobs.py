@@ -0,0 +1,73 @@
+import sys
+import os
+import threading
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+
+def _wait(job, timeout=10):
+    import time
+
+    deadline = time.time() + timeout
+    while not job.done and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def test_background_reindex_reports_progress(tmp_path, capsys):
+    """Reindex jobs run off-thread and report counts when complete, never on stdout (the MCP channel)."""
+    from jobs import JobManager, COMPLETED
+    from search import SemanticSearch
+
+    docs = tmp_path / "repo"
+    docs.mkdir()
+    for i in range(3):
+        (docs / f"doc{i}.md").write_text(f"# Doc {i}\n\nBranch protection rule {i}.\n")
+
+    engine = SemanticSearch(str(tmp_path / "db"), embedding_backend="local", vector_store_backend="numpy")
+    manager = JobManager()
+    job = manager.submit("reindex", lambda job: engine.index_documents(str(docs), progress=job.report))
+    _wait(job)
+    assert job.status == COMPLETED
+    assert job.result["added"] == 3
+    assert job.progress["files_loaded"] == 3
+    assert job.progress["phase"] == "done"
+    assert (job.progress["added"], job.progress["skipped"]) == (3, 0)
+    assert capsys.readouterr().out == ""
+    manager.shutdown()
+
+
+def test_cancelled_reindex_keeps_previous_index(tmp_path):
+    """A cancelled job leaves the published index untouched."""
+    from jobs import JobManager, CANCELLED
+    from search import SemanticSearch
+
+    docs = tmp_path / "repo"
+    docs.mkdir()
+    (docs / "merging.md").write_text("# Merging\n\nUse squash merges.\n")
+    engine = SemanticSearch(str(tmp_path / "db"), embedding_backend="local", vector_store_backend="numpy")
+    engine.index_documents(str(docs))
+    (docs / "reviews.md").write_text("# Reviews\n\nCODEOWNERS approve.\n")
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_progress(update):
+        started.set()
+        release.wait(5)
+
+    manager = JobManager()
+    job = manager.submit(
+        "reindex",
+        lambda job: engine.index_documents(str(docs), progress=blocking_progress, should_cancel=job.cancel_requested),
+    )
+    started.wait(5)
+    # Searches are served from the current snapshot while the job runs
+    assert engine.search("codeowners", mode="keyword") == []
+    assert manager.cancel(job.id)
+    release.set()
+    _wait(job)
+    assert job.status == CANCELLED
+    assert engine.generation == 1
+    manager.shutdown()
@@ -0,0 +1,199 @@
+import sys
+import os
+
+# Add scripts to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../scripts")))
+
+LOGBOOK_HEADER = """# Agent Logbook
+
+## Entry Format
+
+```markdown
+## YYYY-MM-DD HH:MM - Agent Name → Next Agent/Status
+**Status**: Brief description
+```
+
+---
+"""
+
+
+def _entry(day, agent, handoff, status):
+    return f"\n## 2025-11-{day:02d} 09:00 - {agent} → {handoff}\n**Status**: {status}\n**Active Priority**: P1\n"
+
+
+def test_logbook_index_parses_only_appended_entries(tmp_path):
+    """Each update reads from the last entry on, and state survives a restart."""
+    from memory_bank import LogbookIndex
+
+    logbook = tmp_path / "agent-logbook.md"
+    state = tmp_path / "state.json"
+    logbook.write_text(LOGBOOK_HEADER + _entry(1, "Governance Monitor", "Report Processor", "Scanned repos"))
+
+    index = LogbookIndex(logbook, state)
+    assert [e["agent"] for e in index.update()] == ["Governance Monitor"]
+    assert index.latest("Governance Monitor")["status"] == "Scanned repos"
+    assert index.latest("Governance Monitor")["active_priority"] == "P1"
+
+    body = "".join(_entry(day, "Report Processor", "Standards Updater", f"Report {day}") for day in range(2, 30))
+    with open(logbook, "a") as f:
+        f.write(body)
+
+    index = LogbookIndex(logbook, state)
+    new = index.update()
+    # The previously last entry is re-read (it might have grown) but only reported if it changed
+    assert len(new) == 28
+    assert index.bytes_parsed < len(body) + 200
+    assert index.entries == 29
+    assert index.latest("Report Processor")["status"] == "Report 29"
+    assert index.latest("Governance Monitor")["status"] == "Scanned repos"
+    assert [e["status"] for e in index.recent(2)] == ["Report 28", "Report 29"]
+
+    assert index.update() == []
+    assert index.bytes_parsed == 0
+
+    # Fields of a template in a code fence after the last entry are not picked up
+    with open(logbook, "a") as f:
+        f.write("\n```markdown\n**Status**: [State of work]\n```\n")
+    index.update()
+    assert index.latest("Report Processor")["status"] == "Report 29"
+
+
+def test_logbook_index_rebuilds_after_rewrite(tmp_path):
+    """Truncated or rewritten logbooks are reindexed from scratch."""
+    from memory_bank import LogbookIndex, status_snapshot
+
+    logbook = tmp_path / "agent-logbook.md"
+    logbook.write_text(LOGBOOK_HEADER + _entry(1, "Compliance Checker", "Complete", "Old run") * 3)
+    index = LogbookIndex(logbook, tmp_path / "state.json", recent=2)
+    index.update()
+    assert index.entries == 3
+    assert len(index.recent(5)) == 2
+
+    logbook.write_text(LOGBOOK_HEADER.replace("Agent Logbook", "Agent Log") + _entry(2, "Compliance Checker", "Complete", "New run"))
+    index.update()
+    assert index.entries == 1
+    assert index.latest("Compliance Checker")["status"] == "New run"
+
+    snapshot = status_snapshot(index, tmp_path / "missing.md")
+    checker = next(a for a in snapshot["agents"] if a["agent"] == "Compliance Checker")
+    assert checker["latest_entry"]["date"] == "2025-11-02"
+    assert snapshot["logbook_entries"] == 1
+
+
+def test_parse_entries_is_linear_in_logbook_size():
+    """A cold parse of a large logbook encodes each character once and walks the fences once."""
+    import time
+    from memory_bank import parse_entries
+
+    text = LOGBOOK_HEADER + "".join(
+        _entry(i % 28 + 1, f"Agënt {i % 7}", "Next", f"Run {i}") + ("```\n**Status**: fenced\n```\n" if i % 10 == 0 else "")
+        for i in range(20000)
+    )
+    started = time.perf_counter()
+    entries = parse_entries(text, 100)
+    assert time.perf_counter() - started < 2
+    assert len(entries) == 20000
+    assert entries[-1]["status"] == "Run 19999"
+    last = text.rindex("\n## ") + 1
+    assert entries[-1]["offset"] == 100 + len(text[:last].encode("utf-8"))
+
+
+def test_status_watcher_emits_deltas_for_changed_files(tmp_path):
+    """Polls re-parse only changed files and report handoffs, agent rows and file events."""
+    from memory_bank import LogbookIndex, StatusWatcher
+
+    bank = tmp_path / "memory-bank"
+    agents = tmp_path / "agent-memory-banks"
+    bank.mkdir()
+    agents.mkdir()
+    logbook = bank / "agent-logbook.md"
+    context = bank / "activeContext.md"
+    table = "| Agent Role | Status | Current Task | Last Update |\n|---|---|---|---|\n| Report Processor | {} | - | 10:00 |\n"
+    logbook.write_text(LOGBOOK_HEADER + _entry(1, "Governance Monitor", "Report Processor", "Scanned"))
+    context.write_text(table.format("Idle"))
+
+    watcher = StatusWatcher(LogbookIndex(logbook, tmp_path / "state.json"), [bank, agents], context)
+    snapshot = watcher.snapshot()
+    assert snapshot["logbook_entries"] == 1
+    assert next(a for a in snapshot["agents"] if a["agent"] == "Report Processor")["status"] == "Idle"
+    assert watcher.poll() == []
+
+    with open(logbook, "a") as f:
+        f.write(_entry(2, "Report Processor", "Complete", "Report sent"))
+    context.write_text(table.format("Active"))
+    (agents / "report-processor-memory.md").write_text("# Notes\n")
+
+    deltas = watcher.poll()
+    assert [d["type"] for d in deltas] == ["file", "agent", "handoff"]
+    assert deltas[0] == {"type": "file", "path": "agent-memory-banks/report-processor-memory.md", "event": "created"}
+    assert deltas[1]["agent"] == "Report Processor" and deltas[1]["status"] == "Active"
+    assert deltas[2]["entry"]["status"] == "Report sent"
+    assert watcher.poll() == []
+
+
+def _make_bank(tmp_path):
+    from validate_memory_bank import REQUIRED_FILES, REPO_ROOT
+
+    for path in REQUIRED_FILES:
+        target = tmp_path / path.relative_to(REPO_ROOT)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text("# Notes\n\n## Status\n")
+    (tmp_path / "memory-bank" / "activeContext.md").write_text(
+        "# Active Context\n\n## Current Focus\n\n## Recent Accomplishments\n\n## Active Tasks\n\n## Next Steps\n"
+    )
+    (tmp_path / "standards").mkdir()
+    (tmp_path / "standards" / "naming.md").write_text("# Naming\n\n## Branches\n")
+    return tmp_path
+
+
+def test_validator_checks_links_offline_and_caches_results(tmp_path):
+    """Links resolve against the catalog and files; unchanged files reuse cached results."""
+    from validate_memory_bank import Validator
+
+    repo = _make_bank(tmp_path)
+    notes = repo / "agent-memory-banks" / "governance-monitor-memory.md"
+    notes.write_text(
+        "# Monitor\n\n[naming](../standards/naming.md#branches)\n"
+        "[uri](governance://standards/naming#tags)\n[gone](missing.md)\n[web](https://example.com/x)\n"
+    )
+    cache = tmp_path / "cache.json"
+
+    report = Validator(repo, cache, workers=4).run()
+    assert report["errors"] == 0
+    assert report["checked"] == len(report["files"])
+    issues = next(f for f in report["files"] if f["path"].endswith("governance-monitor-memory.md"))["issues"]
+    assert [i["message"] for i in issues] == [
+        "Unknown anchor #tags in link: governance://standards/naming#tags",
+        "Broken link: missing.md",
+    ]
+
+    report = Validator(repo, cache).run()
+    assert report["checked"] == 0 and report["warnings"] == 2
+
+    # Creating a link target invalidates the cached result of the file linking to it
+    (repo / "agent-memory-banks" / "missing.md").write_text("# Found\n")
+    report = Validator(repo, cache).run()
+    # (the new file itself is checked too)
+    assert report["checked"] == 2 and report["warnings"] == 1
+
+
+def test_validator_reports_logbook_and_sensitive_data(tmp_path):
+    """Shared logbook parsing drives entry checks; secrets are errors."""
+    from validate_memory_bank import Validator
+
+    repo = _make_bank(tmp_path)
+    (repo / "memory-bank" / "agent-logbook.md").write_text(
+        LOGBOOK_HEADER
+        + _entry(2, "Governance Monitor", "Report Processor", "Scanned")
+        + _entry(1, "Report Processor", "Complete", "")
+        + "\n## 2025-11-3 9:00 - Report Processor → Complete\n"
+    )
+    (repo / "memory-bank" / "progress.md").write_text("# Progress\n\n## Status\n\npassword = hunter2\n")
+
+    report = Validator(repo, None).run()
+    messages = {(f["path"], i["message"]) for f in report["files"] for i in f["issues"]}
+    assert ("memory-bank/agent-logbook.md", "Invalid logbook entry header") in messages
+    assert ("memory-bank/agent-logbook.md", "Entry is older than the one before it") in messages
+    assert ("memory-bank/agent-logbook.md", "Entry has no **Status**") in messages
+    assert ("memory-bank/progress.md", "Possible sensitive data: password") in messages
+    assert report["errors"] == 1
@@ -0,0 +1,93 @@
+import sys
+import os
+import asyncio
+import json
+import time
+
+import pytest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+
+def test_histogram_quantiles_and_prometheus_buckets():
+    """Quantiles come from the buckets (clamped to the observed range); buckets are cumulative."""
+    from metrics import Histogram
+
+    histogram = Histogram((0.01, 0.1, 1.0))
+    for value in [0.005] * 90 + [0.05] * 9 + [0.5]:
+        histogram.observe(value)
+    assert histogram.quantile(0.5) <= 0.01
+    assert 0.01 < histogram.quantile(0.95) <= 0.1
+    assert histogram.quantile(0.999) == 0.5
+    assert histogram.summary(scale=1000)["max"] == 500.0
+
+    lines = histogram.prometheus("latency_seconds", 'tool="t"')
+    assert lines[:4] == [
+        'latency_seconds_bucket{tool="t",le="0.01"} 90',
+        'latency_seconds_bucket{tool="t",le="0.1"} 99',
+        'latency_seconds_bucket{tool="t",le="1.0"} 100',
+        'latency_seconds_bucket{tool="t",le="+Inf"} 100',
+    ]
+
+    single = Histogram((0.01, 0.1))
+    single.observe(0.07)
+    assert single.quantile(0.5) == single.quantile(0.99) == 0.07
+
+
+def test_tool_calls_record_errors_payloads_and_slow_call_spans(tmp_path):
+    """Calls, errors and sizes are counted; traced calls keep spans from worker threads too."""
+    from metrics import Metrics, SlowCallProfiler
+
+    log_path = tmp_path / "slow.jsonl"
+    metrics = Metrics(SlowCallProfiler(keep=2, log_path=str(log_path)))
+
+    def blocking_work():
+        with metrics.span("file_read"):
+            time.sleep(0.01)
+
+    async def call(seconds):
+        with metrics.tool_call("search_governance", {"query": "x" * 500}) as call:
+            await asyncio.to_thread(blocking_work)
+            await asyncio.sleep(seconds)
+            call["result"] = "résumé"
+
+    async def scenario():
+        for seconds in (0.0, 0.05, 0.02):
+            await call(seconds)
+        with pytest.raises(ValueError):
+            with metrics.tool_call("read_governance_section", {"category": ".."}):
+                raise ValueError("Invalid path")
+
+    asyncio.run(scenario())
+    snapshot = metrics.snapshot()
+    search = snapshot["tools"]["search_governance"]
+    assert (search["calls"], search["errors"]) == (3, 0)
+    assert search["response_bytes"]["max"] == len("résumé".encode("utf-8"))
+    assert snapshot["tools"]["read_governance_section"]["error_rate"] == 1.0
+    assert snapshot["spans"]["file_read"]["count"] == 3
+
+    # The two slowest (~60 ms and ~30 ms) are kept; the fast error never made the cut
+    slowest = snapshot["slow_calls"]
+    assert len(slowest) == 2 and slowest[0]["seconds"] >= 0.05 and slowest[1]["seconds"] >= 0.02
+    assert slowest[0]["spans"][0]["span"] == "file_read"
+    assert slowest[0]["arguments"]["query"].endswith("(500 chars)")
+    logged = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [record["tool"] for record in logged] == ["search_governance"] * 3
+
+    text = metrics.prometheus()
+    assert 'governance_tool_errors_total{tool="read_governance_section"} 1' in text
+    assert 'governance_span_seconds_count{span="file_read"} 3' in text
+
+
+def test_server_records_tool_calls():
+    """Every tool call through the MCP server shows up in server_metrics."""
+    import server
+
+    async def scenario():
+        await server.mcp.call_tool("list_governance_docs", {})
+        return await server.server_metrics()
+
+    tools = asyncio.run(scenario())["tools"]
+    assert tools["list_governance_docs"]["calls"] >= 1
+    assert tools["list_governance_docs"]["response_bytes"]["max"] > 0
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+
+def test_batch_review_is_concurrent_and_cached(tmp_path):
+    from recommendations import PolicyRecommender
+
+    cache_path = str(tmp_path / "llm_cache.sqlite")
+    documents = {f"standard-{i}": f"# Standard {i}\n\nAll repos must do thing {i}." for i in range(8)}
+
+    recommender = PolicyRecommender(backend="fake", cache_path=cache_path, max_concurrency=4)
+    recommender.llm.latency = 0.05
+
+    async def review():
+        return await recommender.suggest_updates_batch(documents)
+
+    first = asyncio.run(review())
+    assert set(first) == set(documents)
+    assert recommender.llm.calls == 8
+    assert all(text.startswith("Suggested updates") for text in first.values())
+
+    # Same documents: served from the cache
+    assert asyncio.run(review()) == first
+    assert recommender.llm.calls == 8
+
+    # A new process with the same cache file pays nothing either; an edited document costs one call
+    rerun = PolicyRecommender(backend="fake", cache_path=cache_path)
+    documents["standard-3"] += "\nAlso document exceptions."
+    second = asyncio.run(rerun.suggest_updates_batch(documents))
+    assert rerun.llm.calls == 1
+    assert second["standard-0"] == first["standard-0"]
+    assert second["standard-3"] != first["standard-3"]
+
+
+def test_identical_concurrent_requests_share_one_call():
+    from recommendations import PolicyRecommender
+
+    recommender = PolicyRecommender(backend="fake", max_concurrency=2)
+    recommender.llm.latency = 0.05
+
+    async def burst():
+        return await asyncio.gather(*(recommender.suggest_updates("Same policy") for _ in range(10)))
+
+    results = asyncio.run(burst())
+    assert len(set(results)) == 1
+    assert recommender.llm.calls == 1
+    stats = recommender.cache_stats()
+    assert stats["shared_in_flight"] == 9 and stats["in_flight"] == 0
+
+
+def test_llm_errors_are_reported_not_cached():
+    from recommendations import PolicyRecommender
+
+    recommender = PolicyRecommender(backend="fake")
+
+    async def failing(*args, **kwargs):
+        raise RuntimeError("rate limited")
+
+    original = recommender.llm.ainvoke
+    object.__setattr__(recommender.llm, "ainvoke", failing)
+    assert asyncio.run(recommender.analyze_violations(["Missing CODEOWNERS"])).startswith("Error analyzing violations")
+    object.__setattr__(recommender.llm, "ainvoke", original)
+    assert asyncio.run(recommender.analyze_violations(["Missing CODEOWNERS"])).startswith("Suggested updates")
+    assert recommender.cache_stats()["errors"] == 1
+
+
+def test_cluster_violations_groups_near_duplicates():
+    import time
+    from recommendations import cluster_violations, format_clusters
+
+    messages = [
+        "Missing branch protection on 'main'",
+        "Requires {n} approving review(s), expected 2 on 'main'",
+        "Missing CONTRIBUTING.md",
+        "Missing required checks ci-tests, security-scan on 'main'",
+    ]
+    violations = []
+    for i in range(100_000):
+        message = messages[i % 4].replace("{n}", str(i % 2))
+        violations.append(f"repo-{i % 5000}: {message}")
+    # Near-duplicate wordings of the same problem
+    violations += ["repo-x: Missing branch protection on the 'main' branch", "P0: Missing branch protection on 'release'"]
+
+    start = time.perf_counter()
+    clusters = cluster_violations(violations)
+    elapsed = time.perf_counter() - start
+
+    assert len(clusters) == 4
+    assert sum(c.count for c in clusters) == len(violations)
+    protection = next(c for c in clusters if c.representative.startswith("Missing branch protection"))
+    assert protection.count == 25_002 and protection.variants >= 2
+    assert "repo-x" in protection.repos and "P0" not in protection.repos
+    assert len(protection.examples) == 3
+    assert elapsed < 20
+
+    prompt = format_clusters(clusters, max_clusters=2)
+    assert len(prompt.splitlines()) == 3 and "smaller groups" in prompt
+
+
+def test_analyze_violations_sends_bounded_prompt():
+    from recommendations import PolicyRecommender
+
+    recommender = PolicyRecommender(backend="fake")
+    seen = []
+    original = recommender.llm.ainvoke
+
+    async def capture(messages, *args, **kwargs):
+        seen.append(messages[-1].content)
+        return await original(messages, *args, **kwargs)
+
+    object.__setattr__(recommender.llm, "ainvoke", capture)
+    violations = [f"svc-{i}: Missing CODEOWNERS" for i in range(20_000)]
+    assert asyncio.run(recommender.analyze_violations(violations)).startswith("Suggested updates")
+    assert len(seen[0]) < 1000 and "20000x across 20000 repos" in seen[0]
+
+
+def test_cancelled_caller_does_not_cancel_a_shared_call():
+    from recommendations import PolicyRecommender
+
+    recommender = PolicyRecommender(backend="fake")
+    recommender.llm.latency = 0.05
+
+    async def scenario():
+        owner = asyncio.ensure_future(recommender.suggest_updates("Same policy"))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(recommender.suggest_updates("Same policy"))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        return owner, await waiter
+
+    owner, result = asyncio.run(scenario())
+    assert owner.cancelled()
+    assert result.startswith("Suggested updates")
+    assert recommender.llm.calls == 1
+    assert recommender.cache_stats()["in_flight"] == 0
+
+
+def test_response_cache_is_used_off_the_event_loop(tmp_path):
+    import threading
+    from recommendations import PolicyRecommender
+
+    recommender = PolicyRecommender(backend="fake", cache_path=str(tmp_path / "llm_cache.sqlite"))
+    cache = recommender.cache
+    threads = []
+
+    def recorded(method):
+        def call(*args):
+            threads.append(threading.current_thread())
+            return method(*args)
+        return call
+
+    cache.get, cache.set = recorded(cache.get), recorded(cache.set)
+
+    async def review():
+        return await recommender.suggest_updates("Same policy"), threading.current_thread()
+
+    first, loop_thread = asyncio.run(review())
+    # A fresh in-memory cache falls through to the SQLite one
+    recommender._memory_cache.clear()
+    assert asyncio.run(review())[0] == first
+    assert recommender.llm.calls == 1 and recommender.cache_stats()["cache_hits"] == 1
+    assert len(threads) == 3 and loop_thread not in threads
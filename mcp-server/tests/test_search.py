@@ -0,0 +1,346 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+
+def _make_engine(db_path):
+    from search import SemanticSearch
+
+    engine = SemanticSearch(persistence_directory=str(db_path))
+    engine.embeddings = DeterministicFakeEmbedding(size=32)
+    return engine
+
+
+def test_incremental_reindex(tmp_path):
+    """Reindexing only embeds the diff and never duplicates chunks."""
+    docs = tmp_path / "repo"
+    (docs / "standards").mkdir(parents=True)
+    (docs / "standards" / "a.md").write_text("# A\n\nSquash merges only.\n")
+    (docs / "standards" / "b.md").write_text("# B\n\nCODEOWNERS required.\n")
+    db_path = tmp_path / "db"
+
+    engine = _make_engine(db_path)
+    stats = engine.index_documents(str(docs))
+    assert (stats["added"], stats["updated"], stats["deleted"], stats["skipped"]) == (2, 0, 0, 0)
+    assert (db_path / "index_manifest.json").exists()
+
+    # Unchanged rerun from a fresh process embeds nothing
+    engine = _make_engine(db_path)
+    engine._load_vector_store()
+    stats = engine.index_documents(str(docs))
+    assert (stats["added"], stats["updated"], stats["deleted"], stats["skipped"]) == (0, 0, 0, 2)
+    assert stats["chunks"] == 0
+
+    (docs / "standards" / "a.md").write_text("# A\n\nRebase merges only.\n")
+    (docs / "standards" / "b.md").unlink()
+    stats = engine.index_documents(str(docs))
+    assert (stats["added"], stats["updated"], stats["deleted"], stats["skipped"]) == (0, 1, 1, 0)
+    assert engine.vector_store._collection.count() == 1
+
+
+def test_local_embeddings_are_batched_and_deterministic():
+    """The offline embedder gives the same unit vectors in batch and one at a time."""
+    import numpy as np
+    from embeddings import HashingEmbeddings, load_embeddings
+
+    embedder = HashingEmbeddings(dim=256, batch_size=2)
+    texts = ["Require two approvals", "Squash merge feature/login", "", "CODEOWNERS review"]
+    batch = embedder.encode(texts)
+    assert batch.shape == (4, 256)
+    assert np.allclose(batch[1], embedder.embed_query(texts[1]))
+    assert np.allclose(np.linalg.norm(batch[[0, 1, 3]], axis=1), 1.0)
+    assert isinstance(load_embeddings("local"), HashingEmbeddings)
+
+
+def test_local_backend_search(tmp_path):
+    """Indexing and searching work end to end without network access."""
+    from search import SemanticSearch
+
+    docs = tmp_path / "repo"
+    docs.mkdir()
+    (docs / "merging.md").write_text("# Merging\n\nUse squash merges for feature branches.\n")
+    (docs / "reviews.md").write_text("# Reviews\n\nCODEOWNERS must approve every pull request.\n")
+
+    engine = SemanticSearch(persistence_directory=str(tmp_path / "db"), embedding_backend="local")
+    engine.index_documents(str(docs))
+    results = engine.search("who must approve a pull request", limit=1)
+    assert results[0]["source"].endswith("reviews.md")
+
+
+def test_numpy_vector_store_snapshot_and_reload(tmp_path):
+    """Staged writes publish on flush, persist as .npy and reload memory-mapped."""
+    import numpy as np
+    from embeddings import HashingEmbeddings
+    from vector_store import NumpyVectorStore
+
+    embedder = HashingEmbeddings(dim=64)
+    store = NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=embedder)
+    store.add_texts(["squash merge", "code owners", "release tags"], ids=["a", "b", "c"])
+    assert store.similarity_search("squash merge", k=1) == []
+    store.flush()
+
+    store.delete(ids=["b"])
+    store.add_texts(["signed release tags"], ids=["c"])
+    store.flush()
+
+    reloaded = NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=embedder)
+    assert isinstance(reloaded._snapshot[0], np.memmap)
+    assert len(reloaded) == 2
+    doc, score = reloaded.similarity_search_with_score("signed release tags", k=1)[0]
+    assert doc.id == "c" and doc.page_content == "signed release tags"
+    assert abs(score) < 1e-5
+
+
+def test_numpy_vector_store_appends_and_compacts(tmp_path):
+    """Small flushes append rows and tombstone deleted ones; enough deletes compact both files."""
+    import numpy as np
+    from embeddings import HashingEmbeddings
+    from vector_store import NumpyVectorStore
+
+    embedder = HashingEmbeddings(dim=32)
+    store = NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=embedder)
+    store.add_texts([f"rule {i} requires reviews" for i in range(20)], ids=[f"r{i}" for i in range(20)])
+    store.flush()
+    vectors, chunks = tmp_path / "vectors.npy", tmp_path / "chunks.jsonl"
+    inode, lines = vectors.stat().st_ino, len(chunks.read_text().splitlines())
+
+    store.delete(ids=["r1"])
+    store.add_texts(["squash merges only"], ids=["r2"])
+    store.flush()
+    # Appended in place: one new row, one side table line for it and one tombstone line
+    assert vectors.stat().st_ino == inode
+    assert np.load(vectors, mmap_mode="r").shape == (21, 32)
+    assert len(chunks.read_text().splitlines()) == lines + 2
+
+    reloaded = NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=embedder)
+    assert len(reloaded) == 19
+    assert reloaded.similarity_search("squash merges only", k=1)[0].id == "r2"
+    assert {doc.id for doc in reloaded.similarity_search("rule 1 requires reviews", k=19)} == set(reloaded._snapshot[2])
+    assert [doc.id for doc in reloaded.get_by_ids(["r1", "r2"])] == ["r2"]
+
+    # A flush whose side table never got written publishes nothing
+    with open(chunks, "a", encoding="utf-8") as f:
+        f.write('{"id": "half')
+    reloaded = NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=embedder)
+    assert len(reloaded) == 19
+    # ... and the next flush appends after the last whole line
+    reloaded.add_texts(["signed tags"], ids=["tags"])
+    reloaded.flush()
+    assert len(NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=embedder)) == 20
+
+    reloaded.delete(ids=["tags"] + [f"r{i}" for i in range(3, 10)])
+    reloaded.flush()
+    assert vectors.stat().st_ino != inode
+    assert np.load(vectors, mmap_mode="r").shape == (12, 32)
+    assert len(NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=embedder)) == 12
+
+
+def test_numpy_backend_search(tmp_path):
+    """SemanticSearch serves the same search contract from the NumPy store."""
+    from search import SemanticSearch
+
+    docs = tmp_path / "repo"
+    docs.mkdir()
+    (docs / "merging.md").write_text("# Merging\n\nUse squash merges for feature branches.\n")
+    (docs / "reviews.md").write_text("# Reviews\n\nCODEOWNERS must approve every pull request.\n")
+
+    db_path = str(tmp_path / "db")
+    SemanticSearch(db_path, embedding_backend="local", vector_store_backend="numpy").index_documents(str(docs))
+    engine = SemanticSearch(db_path, embedding_backend="local", vector_store_backend="numpy")
+    results = engine.search("squash merges", limit=5)
+    assert len(results) == 2
+    assert results[0]["source"].endswith("merging.md")
+
+
+def test_hybrid_and_keyword_search(tmp_path):
+    """Exact terms are found lexically, and keyword search works without embeddings."""
+    from search import SemanticSearch
+
+    docs = tmp_path / "repo"
+    docs.mkdir()
+    (docs / "merging.md").write_text("# Merging\n\nUse squash merges for feature branches.\n")
+    (docs / "reviews.md").write_text("# Reviews\n\nCODEOWNERS must approve every pull request.\n")
+    (docs / "checks.md").write_text("# Checks\n\nThe ci-tests and security-scan checks must pass.\n")
+
+    db_path = str(tmp_path / "db")
+    engine = SemanticSearch(db_path, embedding_backend="local", vector_store_backend="numpy")
+    engine.index_documents(str(docs))
+    assert engine.search("codeowners", mode="keyword")[0]["source"].endswith("reviews.md")
+    assert engine.search("ci-tests", mode="hybrid")[0]["source"].endswith("checks.md")
+
+    (docs / "reviews.md").unlink()
+    engine.index_documents(str(docs))
+    assert engine.search("codeowners", mode="keyword") == []
+
+    # No embedding backend: answers come from the persisted lexical index alone
+    engine = SemanticSearch(db_path, embedding_backend="local", vector_store_backend="numpy")
+    engine.embeddings = None
+    engine.vector_store = None
+    assert engine.search("squash", mode="hybrid")[0]["source"].endswith("merging.md")
+
+    # Nothing indexed yet: every mode reports the missing index
+    empty = SemanticSearch(str(tmp_path / "empty"), embedding_backend="local", vector_store_backend="numpy")
+    for mode in ("hybrid", "vector", "keyword"):
+        assert empty.search("squash", mode=mode)[0]["error"] == "Index not found. Please run indexing first."
+
+
+def test_ttl_cache_eviction_and_expiry():
+    """The cache evicts least recently used entries and expires stale ones."""
+    from cache import TTLCache
+
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, timer=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    now[0] = 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (1, 2, 1, 1)
+
+
+def test_lexical_index_appends_changes_and_keeps_no_duplicate_text(tmp_path):
+    """An incremental reindex appends to the BM25 log; the base is only rewritten when the log outgrows it."""
+    from search import SemanticSearch
+
+    docs = tmp_path / "repo"
+    docs.mkdir()
+    for i in range(20):
+        (docs / f"rule{i}.md").write_text(f"# Rule {i}\n\nRepository {i} requires signed commits.\n")
+    db = tmp_path / "db"
+    engine = SemanticSearch(str(db), embedding_backend="local", vector_store_backend="numpy")
+    engine.index_documents(str(docs))
+    base, log = db / "lexical_index.json", db / "lexical_index.json.log"
+    base_bytes = base.read_bytes()
+    # Chunk text lives in the vector store, not again in the keyword index
+    assert b"signed commits" not in base_bytes
+
+    (docs / "rule3.md").write_text("# Rule 3\n\nSquash merges only on main.\n")
+    engine.index_documents(str(docs))
+    assert base.read_bytes() == base_bytes
+    assert len(log.read_text().splitlines()) == 2  # remove the old chunk, add the new one
+
+    reloaded = SemanticSearch(str(db), embedding_backend="local", vector_store_backend="numpy")
+    hit = reloaded.search("squash merges", mode="keyword")[0]
+    assert hit["source"].endswith("rule3.md") and "Squash merges only on main." in hit["content"]
+    assert len(reloaded.lexical_index) == 20
+
+    # Enough changes and the log is folded back into the base
+    for i in range(20):
+        (docs / f"rule{i}.md").write_text(f"# Rule {i}\n\nRevision {i} needs two reviews.\n")
+        engine.index_documents(str(docs))
+    assert log.stat().st_size <= base.stat().st_size
+    assert base.read_bytes() != base_bytes
+    reloaded = SemanticSearch(str(db), embedding_backend="local", vector_store_backend="numpy")
+    assert reloaded.lexical_index.search("revision") == engine.lexical_index.search("revision")
+
+    # Without embeddings, the keyword index is the only place the text lives
+    keyword_only = SemanticSearch(str(tmp_path / "keyword"), embedding_backend="local", vector_store_backend="numpy")
+    keyword_only.embeddings = None
+    keyword_only.index_documents(str(docs))
+    keyword_only = SemanticSearch(str(tmp_path / "keyword"), embedding_backend="local", vector_store_backend="numpy")
+    assert "Revision 7 needs two reviews." in keyword_only.search("revision 7", mode="keyword")[0]["content"]
+
+
+def test_search_cache_invalidated_by_reindex(tmp_path):
+    """Repeated queries are served from cache until index_documents bumps the generation."""
+    from search import SemanticSearch
+
+    docs = tmp_path / "repo"
+    docs.mkdir()
+    (docs / "merging.md").write_text("# Merging\n\nUse squash merges for feature branches.\n")
+
+    engine = SemanticSearch(str(tmp_path / "db"), embedding_backend="local", vector_store_backend="numpy")
+    engine.index_documents(str(docs))
+    first = engine.search("Squash  merges")
+    assert engine.search("squash merges") == first
+    assert engine.cache_stats()["results"]["hits"] == 1
+
+    (docs / "reviews.md").write_text("# Reviews\n\nSquash merges need one review.\n")
+    engine.index_documents(str(docs))
+    assert engine.cache_stats()["generation"] == 2
+    assert len(engine.search("squash merges")) == 2
+    assert engine.cache_stats()["query_embeddings"]["hits"] >= 1
+
+
+def test_streaming_pipeline_with_worker_pools(tmp_path, monkeypatch):
+    """Parallel reads, process-pool splitting and small batches give the same index, with stage timings."""
+    import search
+    from search import SemanticSearch
+
+    docs = tmp_path / "repo"
+    docs.mkdir()
+    for i in range(6):
+        (docs / f"doc{i}.md").write_text(f"# Doc {i}\n\n" + f"Rule {i} requires review. " * 80)
+
+    monkeypatch.setattr(search, "PROCESS_POOL_MIN_FILES", 1)
+    engine = SemanticSearch(str(tmp_path / "db"), embedding_backend="local", vector_store_backend="numpy")
+    stats = engine.index_documents(str(docs), batch_size=3, workers=2)
+    assert stats["added"] == 6
+    assert len(engine.vector_store) == stats["chunks"] == len(engine.lexical_index)
+    assert stats["timings"]["embed"]["items"] == stats["chunks"]
+    assert stats["timings"]["split"]["items"] == 6
+    assert not [p for p in (tmp_path / "db").iterdir() if p.name.startswith(".staging-")]
+
+
+def test_section_chunker_follows_headings():
+    from sections import outline, split_markdown
+
+    table = "| Check | Required |\n| --- | --- |\n" + "".join(f"| check-{i} | yes |\n" for i in range(80))
+    text = (
+        "# Branching\n\nIntro paragraph.\n\n"
+        "## Main\n### Rules\n\nNo force pushes.\n\n```bash\n# not a heading\ngit push\n```\n\n"
+        f"## Checks\n\n{table}\n"
+        "## Main\n\nSecond section with a repeated title.\n"
+    )
+    chunks = split_markdown(text, max_chars=400, min_chars=0)
+    sections = [meta["section"] for _, meta in chunks]
+    assert sections == ["Branching", "Branching › Main › Rules", "Branching › Checks", "Branching › Main"]
+    # Empty "## Main" heading merged into its child; fences and tables kept whole
+    rules_text = chunks[1][0]
+    assert rules_text.startswith("## Main\n### Rules") and rules_text.rstrip().endswith("```")
+    assert chunks[2][0].count("| check-") == 80
+    assert chunks[3][1]["anchor"] == "main-1"
+    for chunk, meta in chunks:
+        assert text[meta["start_index"]:].startswith(chunk)
+    # Small sections are packed under their common parent
+    packed = split_markdown(text, max_chars=400, min_chars=100)
+    assert [meta["section"] for _, meta in packed] == ["Branching", "Branching › Checks", "Branching › Main"]
+
+    data = text.encode("utf-8")
+    heads = outline(data)
+    assert [h.anchor for h in heads] == ["branching", "main", "rules", "checks", "main-1"]
+    main = heads[1]
+    assert data[main.offset:main.end_offset].decode().startswith("## Main\n### Rules")
+    assert data[main.offset:main.end_offset].decode().rstrip().endswith("```")
+    assert heads[0].end_offset == len(data)
+
+
+def test_index_persists_outlines_and_cites_sections(tmp_path):
+    from search import SemanticSearch
+
+    docs = tmp_path / "docs"
+    (docs / "standards").mkdir(parents=True)
+    (docs / "standards" / "reviews.md").write_text(
+        "# Reviews\n\n## Approvals\n\n" + "Two approvals from CODEOWNERS are required. " * 30
+        + "\n\n## Stale Reviews\n\n" + "Dismiss stale reviews on push. " * 30 + "\n"
+    )
+    engine = SemanticSearch(str(tmp_path / "index"), embedding_backend="local", vector_store_backend="numpy")
+    engine.index_documents(str(docs))
+
+    results = engine.search("CODEOWNERS approvals", limit=1)
+    assert results[0]["section"] == "Reviews › Approvals"
+    assert results[0]["anchor"] == "approvals"
+
+    reloaded = SemanticSearch(str(tmp_path / "index"), embedding_backend="local", vector_store_backend="numpy")
+    assert [s["anchor"] for s in reloaded.outline("standards/reviews.md")] == ["reviews", "approvals", "stale-reviews"]
+
+    (docs / "standards" / "reviews.md").unlink()
+    reloaded.index_documents(str(docs))
+    assert reloaded.outline("standards/reviews.md") == []
@@ -0,0 +1,67 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+
+def _write_repo(root, docs):
+    for rel_path, text in docs.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return root
+
+
+def _make_engine(tmp_path):
+    from shards import ShardedSearch
+
+    central = _write_repo(tmp_path / "org-governance", {
+        "standards/branching.md": "# Branching\n\nSquash merges only on main.\n",
+        "policies/review.md": "# Review\n\nTwo approvals are required.\n",
+    })
+    return ShardedSearch(str(tmp_path / "index"), str(central), embedding_backend="local", vector_store_backend="numpy")
+
+
+def test_shards_index_independently_and_persist_registry(tmp_path):
+    """Adding and indexing a repository leaves the other shards untouched."""
+    from shards import CENTRAL_SHARD, ShardedSearch
+
+    engine = _make_engine(tmp_path)
+    assert engine.index_repo()["added"] == 2
+    payments = _write_repo(tmp_path / "payments-api", {"docs/runbook.md": "# Runbook\n\nRotate the ledger keys.\n"})
+    engine.add_repo("payments-api", str(payments))
+    stats = engine.index_repo("payments-api")
+    assert (stats["repo"], stats["added"]) == ("payments-api", 1)
+
+    central_manifest = tmp_path / "index" / "index_manifest.json"
+    before = central_manifest.stat().st_mtime_ns
+    (payments / "docs" / "runbook.md").write_text("# Runbook\n\nRotate the ledger keys monthly.\n")
+    assert engine.index_repo("payments-api")["updated"] == 1
+    assert central_manifest.stat().st_mtime_ns == before
+
+    reopened = ShardedSearch(str(tmp_path / "index"), engine.repos[CENTRAL_SHARD], embedding_backend="local", vector_store_backend="numpy")
+    assert {repo["repo"]: repo["documents"] for repo in reopened.describe()} == {CENTRAL_SHARD: 2, "payments-api": 1}
+
+
+def test_federated_search_merges_shards_and_filters_by_repo(tmp_path):
+    """Queries fan out to every shard (or the requested ones) and merge the top-k."""
+    engine = _make_engine(tmp_path)
+    engine.index_repo()
+    for name, text in [("payments-api", "Squash merges for the ledger."), ("web-app", "Squash merges for the frontend.")]:
+        engine.add_repo(name, str(_write_repo(tmp_path / name, {"README.md": f"# {name}\n\n{text}\n"})))
+        engine.index_repo(name)
+
+    for mode in ("hybrid", "vector", "keyword"):
+        results = engine.search("squash merges", limit=3, mode=mode)
+        assert len(results) == 3
+        assert {item["repo"] for item in results} == {"org-governance", "payments-api", "web-app"}
+
+    results = engine.search("squash merges", mode="keyword", repos=["web-app"])
+    assert [item["repo"] for item in results] == ["web-app"]
+    assert "Unknown repository" in engine.search("squash", repos=["nope"])[0]["error"]
+
+    # The query is embedded once for all shards
+    stats = engine.cache_stats()
+    assert stats["query_embeddings"]["misses"] == 1
+    assert set(stats["shards"]) == {"org-governance", "payments-api", "web-app"}
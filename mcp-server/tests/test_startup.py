@@ -0,0 +1,63 @@
+import sys
+import os
+import subprocess
+import threading
+import time
+
+# Add src to path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+sys.path.append(SRC)
+
+
+def test_subsystem_builds_once_and_retries_failures():
+    """Concurrent first uses share one build; a failed build is reported and retried."""
+    from startup import Subsystems
+
+    subsystems = Subsystems()
+    builds = []
+
+    def build():
+        builds.append(1)
+        time.sleep(0.05)
+        return object()
+
+    slow = subsystems.register("slow", build)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(slow.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 1 and len({id(r) for r in results}) == 1
+
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("backend down")
+        return "ok"
+
+    subsystems.register("flaky", flaky)
+    subsystems.warm_up(background=False)
+    report = subsystems.report()["subsystems"]
+    assert report["slow"]["ready"] and report["slow"]["seconds"] >= 0.05
+    assert report["flaky"] == {"ready": False, "seconds": report["flaky"]["seconds"], "warmed": False, "error": "RuntimeError: backend down"}
+    assert subsystems["flaky"].get() == "ok"
+    assert subsystems.report()["subsystems"]["flaky"]["error"] is None
+
+
+def test_server_import_defers_heavy_subsystems(tmp_path):
+    """Importing the server builds nothing heavy; a doc read only builds the catalog."""
+    script = (
+        "import asyncio, sys\n"
+        "import server\n"
+        "heavy = [m for m in ('search', 'shards', 'recommendations', 'langchain_openai', 'langchain_community') if m in sys.modules]\n"
+        "assert not heavy, heavy\n"
+        "asyncio.run(server.read_governance_doc('standards', 'memory-bank-format'))\n"
+        "built = [name for name, info in server.subsystems.report()['subsystems'].items() if info['ready']]\n"
+        "assert built == ['catalog'], built\n"
+    )
+    env = {**os.environ, "PYTHONPATH": SRC, "GOVERNANCE_INDEX_DIR": str(tmp_path / "index")}
+    result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
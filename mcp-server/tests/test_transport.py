@@ -0,0 +1,101 @@
+import sys
+import os
+import asyncio
+import json
+import socket
+import subprocess
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+# Add src to path
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+sys.path.append(SRC)
+
+
+def test_admission_limiter_caps_concurrency_and_rejects_after_timeout():
+    """At most limit calls run at once; a call that cannot get a slot in time is rejected."""
+    from transport import AdmissionLimiter, ServerBusy
+
+    limiter = AdmissionLimiter(limit=2, queue_timeout=0.5)
+    peak = []
+
+    async def call(seconds):
+        async with limiter.slot():
+            peak.append(limiter.in_flight)
+            await asyncio.sleep(seconds)
+
+    async def scenario():
+        await asyncio.gather(*(call(0.02) for _ in range(6)))
+        limiter.queue_timeout = 0.05
+        return await asyncio.gather(call(0.3), call(0.3), call(0), return_exceptions=True)
+
+    outcomes = asyncio.run(scenario())
+    assert max(peak) == 2
+    assert isinstance(outcomes[2], ServerBusy)
+    assert (limiter.admitted, limiter.rejected, limiter.in_flight, limiter.waiting) == (8, 1, 0, 0)
+
+
+def _get(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_http_transport_serves_concurrent_clients_from_one_process(tmp_path):
+    """Several MCP sessions share one server process; health and readiness are exposed."""
+    from mcp import ClientSession
+    from mcp.client.streamable_http import streamable_http_client
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = {
+        **os.environ,
+        "GOVERNANCE_TRANSPORT": "streamable-http",
+        "GOVERNANCE_HTTP_PORT": str(port),
+        "GOVERNANCE_INDEX_DIR": str(tmp_path / "index"),
+        "GOVERNANCE_WARMUP": "catalog",
+    }
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(SRC, "server.py")], env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                status, ready = _get(f"{url}/readyz")
+                if status == 200:
+                    break
+            except urllib.error.URLError:
+                pass
+            if time.time() > deadline:
+                pytest.fail("server did not become ready")
+            time.sleep(0.1)
+        assert ready["subsystems"]["catalog"]["warmed"] and not ready["subsystems"]["search"]["ready"]
+
+        async def client():
+            async with streamable_http_client(f"{url}/mcp") as (read, write, _):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    result = await session.call_tool("list_governance_docs", {})
+                    return result.structuredContent["result"]
+
+        async def clients():
+            return await asyncio.gather(*(client() for _ in range(4)))
+
+        listings = asyncio.run(clients())
+        assert all(listing == listings[0] for listing in listings) and listings[0]
+
+        status, health = _get(f"{url}/healthz")
+        assert status == 200 and health["transport"] == "streamable-http"
+        assert health["tool_calls"]["admitted"] == 4
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
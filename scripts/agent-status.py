@@ -4,78 +4,32 @@ Agent Status Dashboard
 
 Displays current status of all governance agents by parsing memory bank files.
 Shows active work, recent activity, and health status.
+
+Usage:
+    agent-status.py                    Print the dashboard
+    agent-status.py --json             Print the status snapshot as JSON
+    agent-status.py --watch            Stream a snapshot, then JSON-lines deltas as files change
+    agent-status.py --watch --socket /tmp/agent-status.sock
+                                       Serve the same stream to clients of a Unix socket
 """
 
+import argparse
+import json
 import os
-import re
+import socket
+import sys
+import time
 from datetime import datetime, timedelta
-from pathlib import Path
 from typing import Dict, List, Optional
 
-# Paths
-REPO_ROOT = Path(__file__).parent.parent
-MEMORY_BANK = REPO_ROOT / "memory-bank"
-AGENT_BANKS = REPO_ROOT / "agent-memory-banks"
-ACTIVE_CONTEXT = MEMORY_BANK / "activeContext.md"
-AGENT_LOGBOOK = MEMORY_BANK / "agent-logbook.md"
-
-# Agent definitions
-AGENTS = [
-    "Governance Monitor",
-    "Report Processor",
-    "Standards Updater",
-    "Compliance Checker"
-]
-
-def parse_active_agents_table(content: str) -> Dict[str, Dict]:
-    """Parse Active Agents table from activeContext.md"""
-    agents_data = {}
-    
-    # Find table section
-    table_pattern = r"\| Agent Role \| Status \| Current Task \| Last Update \|.*?\n\|[-\s|]+\|.*?\n((?:\|.*?\n)+)"
-    match = re.search(table_pattern, content, re.MULTILINE)
-    
-    if not match:
-        return agents_data
-    
-    table_rows = match.group(1).strip().split('\n')
-    
-    for row in table_rows:
-        parts = [p.strip() for p in row.split('|')[1:-1]]  # Remove empty first/last
-        if len(parts) >= 4:
-            role, status, task, last_update = parts[:4]
-            agents_data[role] = {
-                'status': status,
-                'task': task if task != '-' else None,
-                'last_update': last_update
-            }
-    
-    return agents_data
-
-def get_latest_logbook_entry(agent_name: str) -> Optional[Dict]:
-    """Get most recent logbook entry for an agent"""
-    if not AGENT_LOGBOOK.exists():
-        return None
-    
-    content = AGENT_LOGBOOK.read_text()
-    
-    # Pattern: ## YYYY-MM-DD HH:MM - Agent Name → ...
-    pattern = rf"##\s+(\d{{4}}-\d{{2}}-\d{{2}})\s+(\d{{2}}:\d{{2}})\s+-\s+{re.escape(agent_name)}\s+→\s+(.*?)\n\*\*Status\*\*:\s+(.*?)\n"
-    
-    matches = list(re.finditer(pattern, content, re.MULTILINE))
-    
-    if not matches:
-        return None
-    
-    # Get most recent
-    latest = matches[-1]
-    
-    return {
-        'date': latest.group(1),
-        'time': latest.group(2),
-        'handoff_to': latest.group(3),
-        'status': latest.group(4)
-    }
+from memory_bank import (
+    ACTIVE_CONTEXT,
+    AGENTS,
+    StatusWatcher,
+    load_index,
+    parse_active_agents_table,
+    status_snapshot,
+)
 
 def check_agent_health(agent_name: str, last_update: Optional[str]) -> str:
     """Determine agent health status"""
@@ -118,7 +72,10 @@ def print_dashboard():
     if ACTIVE_CONTEXT.exists():
         content = ACTIVE_CONTEXT.read_text()
         active_agents = parse_active_agents_table(content)
-    
+
+    # Only the logbook bytes appended since the last run are parsed
+    index = load_index()
+
     print(f"{'Agent Role':<25} {'Status':<12} {'Health':<15} {'Current Task':<30}")
     print("-" * 85)
     
@@ -144,13 +101,11 @@ def print_dashboard():
     print("RECENT ACTIVITY (Last 5 entries):")
     print("-" * 80)
     
-    if AGENT_LOGBOOK.exists():
-        content = AGENT_LOGBOOK.read_text()
-        entries = re.findall(r'##\s+(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2})\s+-\s+(.+?)\s+→\s+(.+?)\n', content)
-        
-        for timestamp, from_agent, to_agent in entries[-5:]:
-            print(f"{timestamp} | {from_agent:<25} → {to_agent}")
-    else:
+    entries = index.recent(5)
+    for entry in entries:
+        timestamp = f"{entry['date']} {entry['time']}"
+        print(f"{timestamp} | {entry['agent']:<25} → {entry['handoff_to']}")
+    if not entries:
         print("No logbook entries found")
     
     print()
@@ -163,9 +118,108 @@ def print_dashboard():
     
     print()
 
-if __name__ == "__main__":
+def with_health(message: Dict) -> Dict:
+    """Add the health column to the agent rows of a snapshot or delta."""
+    if "agent" in message and "status" in message:
+        return {**message, "health": check_agent_health(message["agent"], message.get("last_update"))}
+    if "agents" in message:
+        return {**message, "agents": [with_health(row) for row in message["agents"]]}
+    return message
+
+def encode(message: Dict) -> bytes:
+    return (json.dumps(with_health(message), default=str) + "\n").encode("utf-8")
+
+class SocketBroadcaster:
+    """Unix socket that sends every connecting client the current snapshot, then each delta."""
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.exists(path):
+            os.unlink(path)
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen()
+        self.server.setblocking(False)
+        self.clients: List[socket.socket] = []
+
+    def accept(self, snapshot) -> None:
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except BlockingIOError:
+                return
+            # A client that stops reading is dropped instead of stalling the stream
+            client.settimeout(1.0)
+            if self._send(client, encode(snapshot())):
+                self.clients.append(client)
+
+    def _send(self, client: socket.socket, data: bytes) -> bool:
+        try:
+            client.sendall(data)
+            return True
+        except OSError:
+            client.close()
+            return False
+
+    def broadcast(self, data: bytes) -> None:
+        self.clients = [client for client in self.clients if self._send(client, data)]
+
+    def close(self) -> None:
+        for client in self.clients:
+            client.close()
+        self.server.close()
+        os.unlink(self.path)
+
+def watch(interval: float, socket_path: Optional[str] = None):
+    """Stream status deltas; only files whose mtime or size changed are re-parsed."""
+    watcher = StatusWatcher()
+    if socket_path is None:
+        sys.stdout.buffer.write(encode(watcher.snapshot()))
+        sys.stdout.flush()
+        for deltas in watcher.watch(interval):
+            sys.stdout.buffer.write(b"".join(encode(delta) for delta in deltas))
+            sys.stdout.flush()
+        return
+
+    broadcaster = SocketBroadcaster(socket_path)
+    watcher.snapshot()
+
+    def current():
+        # New clients get fresh state; the watcher baseline is not reset
+        return {"type": "snapshot", **status_snapshot(watcher.index, watcher.active_context, watcher.recent)}
+
+    print(f"Serving agent status on {socket_path}", file=sys.stderr)
     try:
+        while True:
+            broadcaster.accept(current)
+            deltas = watcher.poll()
+            if deltas:
+                broadcaster.broadcast(b"".join(encode(delta) for delta in deltas))
+            time.sleep(interval)
+    finally:
+        broadcaster.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Governance agent status")
+    parser.add_argument("--json", action="store_true", help="Print the status snapshot as JSON")
+    parser.add_argument("--watch", action="store_true", help="Stream JSON-lines deltas as memory bank files change")
+    parser.add_argument("--socket", help="Serve the watch stream on this Unix socket instead of stdout")
+    parser.add_argument("--interval", type=float, default=0.5, help="Watch poll interval in seconds")
+    args = parser.parse_args()
+
+    if args.watch:
+        try:
+            watch(args.interval, args.socket)
+        except KeyboardInterrupt:
+            pass
+    elif args.json:
+        print(json.dumps(with_health(status_snapshot()), indent=2, default=str))
+    else:
         print_dashboard()
+
+if __name__ == "__main__":
+    try:
+        main()
     except Exception as e:
         print(f"❌ Error generating dashboard: {e}")
         import traceback
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Memory bank parsing shared by agent-status.py and other tooling.
+
+The agent logbook is append-only, so it is indexed incrementally: the index
+remembers the byte offset of the last entry it parsed and only reads bytes
+appended since. A compact per-agent "latest entry" table and a ring buffer of
+recent handoffs are persisted next to that offset, so status queries cost the
+same however long the logbook grows.
+
+Module API:
+    index = LogbookIndex()          # loads persisted state
+    index.update()                  # parses newly appended entries
+    index.latest("Governance Monitor"), index.recent(5), status_snapshot()
+    StatusWatcher().snapshot(), then .poll() for incremental deltas
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Paths
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MEMORY_BANK = REPO_ROOT / "memory-bank"
+AGENT_BANKS = REPO_ROOT / "agent-memory-banks"
+ACTIVE_CONTEXT = MEMORY_BANK / "activeContext.md"
+AGENT_LOGBOOK = MEMORY_BANK / "agent-logbook.md"
+# Local, untracked cache of derived state
+CACHE_DIR = REPO_ROOT / ".cache" / "memory-bank"
+
+# Agent definitions
+AGENTS = [
+    "Governance Monitor",
+    "Report Processor",
+    "Standards Updater",
+    "Compliance Checker"
+]
+
+# Logbook entry header, per standards/memory-bank-format.md:
+# ## YYYY-MM-DD HH:MM - Agent Name → Next Agent/Status
+ENTRY_HEADER = re.compile(
+    r"^##\s+(\d{4}-\d{2}-\d{2})\s+(\d{2}:\d{2})\s+-\s+(.+?)\s+→\s+(.+?)\s*$", re.MULTILINE
+)
+ENTRY_FIELD = re.compile(r"^\*\*(.+?)\*\*:[ \t]*(.*)$", re.MULTILINE)
+FENCE = re.compile(r"^[ \t]*(```|~~~)", re.MULTILINE)
+
+# Handoffs kept for "recent activity"
+RECENT_HANDOFFS = 50
+# Prefix hashed to tell appends from rewrites
+HEAD_BYTES = 4096
+INDEX_VERSION = 1
+
+
+def parse_active_agents_table(content: str) -> Dict[str, Dict]:
+    """Parse Active Agents table from activeContext.md"""
+    agents_data = {}
+
+    # Find table section
+    table_pattern = r"\| Agent Role \| Status \| Current Task \| Last Update \|.*?\n\|[-\s|]+\|.*?\n((?:\|.*?\n)+)"
+    match = re.search(table_pattern, content, re.MULTILINE)
+
+    if not match:
+        return agents_data
+
+    table_rows = match.group(1).strip().split('\n')
+
+    for row in table_rows:
+        parts = [p.strip() for p in row.split('|')[1:-1]]  # Remove empty first/last
+        if len(parts) >= 4:
+            role, status, task, last_update = parts[:4]
+            agents_data[role] = {
+                'status': status,
+                'task': task if task != '-' else None,
+                'last_update': last_update
+            }
+
+    return agents_data
+
+
+def _unfenced(matches: Iterator[re.Match], fenced: List[Tuple[int, int]]) -> Iterator[re.Match]:
+    """Matches (in text order) that start outside the sorted fence spans, in one merged pass."""
+    spans = iter(fenced)
+    span = next(spans, None)
+    for match in matches:
+        while span is not None and span[1] <= match.start():
+            span = next(spans, None)
+        if span is None or match.start() < span[0]:
+            yield match
+
+
+def parse_entries(text: str, base_offset: int = 0) -> List[Dict[str, Any]]:
+    """
+    Parse logbook entries from text (headers inside code fences are ignored).
+    Offsets are byte offsets in the file, counted from base_offset.
+    """
+    fenced = []
+    opened = None
+    for match in FENCE.finditer(text):
+        if opened is None:
+            opened = match.start()
+        else:
+            fenced.append((opened, match.end()))
+            opened = None
+    if opened is not None:
+        fenced.append((opened, len(text)))
+
+    headers = list(_unfenced(ENTRY_HEADER.finditer(text), fenced))
+    field_matches = _unfenced(ENTRY_FIELD.finditer(text), fenced)
+    field = next(field_matches, None)
+    entries = []
+    # Byte offsets advance by the text since the previous header, so each character is encoded once
+    position, offset = 0, base_offset
+    for i, match in enumerate(headers):
+        body_end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        fields: Dict[str, str] = {}
+        while field is not None and field.start() < body_end:
+            if field.start() >= match.end():
+                fields.setdefault(field.group(1).strip().lower().replace(" ", "_"), field.group(2).strip())
+            field = next(field_matches, None)
+        offset += len(text[position:match.start()].encode("utf-8"))
+        position = match.start()
+        entries.append({
+            "date": match.group(1),
+            "time": match.group(2),
+            "agent": match.group(3),
+            "handoff_to": match.group(4),
+            "status": fields.get("status", ""),
+            "active_priority": fields.get("active_priority", ""),
+            "offset": offset,
+        })
+    return entries
+
+
+class LogbookIndex:
+    """
+    Incremental index over the append-only agent logbook.
+
+    ``offset`` is the byte position of the last entry seen: that entry may still
+    be growing, so it is re-read on the next update along with anything appended
+    after it. If the file shrinks or its beginning changes, the index is rebuilt.
+    """
+
+    def __init__(self, logbook: Path = AGENT_LOGBOOK, state_path: Optional[Path] = None, recent: int = RECENT_HANDOFFS):
+        self.logbook = Path(logbook)
+        self.state_path = Path(state_path) if state_path else CACHE_DIR / "logbook-index.json"
+        self.recent_size = recent
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.offset = 0
+        self.size = 0
+        self.mtime_ns = 0
+        self.head = ""
+        self.entries = 0
+        self.latest_by_agent: Dict[str, Dict[str, Any]] = {}
+        self.handoffs: deque = deque(maxlen=self.recent_size)
+        self.bytes_parsed = 0
+
+    def _load(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if state.get("version") != INDEX_VERSION or state.get("logbook") != str(self.logbook):
+            return
+        self.offset = state["offset"]
+        self.size = state["size"]
+        self.mtime_ns = state["mtime_ns"]
+        self.head = state["head"]
+        self.entries = state["entries"]
+        self.latest_by_agent = state["latest"]
+        self.handoffs = deque(state["recent"], maxlen=self.recent_size)
+
+    def save(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "logbook": str(self.logbook),
+                "offset": self.offset,
+                "size": self.size,
+                "mtime_ns": self.mtime_ns,
+                "head": self.head,
+                "entries": self.entries,
+                "latest": self.latest_by_agent,
+                "recent": list(self.handoffs),
+            }, f)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def _head_hash(f, size: int) -> str:
+        f.seek(0)
+        return hashlib.sha1(f.read(min(size, HEAD_BYTES))).hexdigest()
+
+    def update(self, save: bool = True) -> List[Dict[str, Any]]:
+        """Parse bytes appended since the last update; returns new or changed entries."""
+        self.bytes_parsed = 0
+        try:
+            stat = self.logbook.stat()
+        except OSError:
+            if self.size:
+                self._reset()
+                if save:
+                    self.save()
+            return []
+        if stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns:
+            return []
+        with open(self.logbook, "rb") as f:
+            # Appends leave the already indexed beginning intact; anything else is a rewrite
+            if stat.st_size < self.size or (self.size and self._head_hash(f, self.size) != self.head):
+                self._reset()
+            f.seek(self.offset)
+            data = f.read()
+            size = self.offset + len(data)
+            head = self._head_hash(f, size)
+
+        self.bytes_parsed = len(data)
+        entries = parse_entries(data.decode("utf-8", errors="replace"), self.offset)
+        changed = [entry for entry in entries if self._record(entry)]
+        if entries:
+            self.offset = entries[-1]["offset"]
+        self.size = size
+        self.mtime_ns = stat.st_mtime_ns
+        self.head = head
+        if save:
+            self.save()
+        return changed
+
+    def _record(self, entry: Dict[str, Any]) -> bool:
+        # The entry at the stored offset is re-parsed on every update: replace it, do not count it twice
+        if self.handoffs and self.handoffs[-1]["offset"] == entry["offset"]:
+            if self.handoffs[-1] == entry:
+                return False
+            self.handoffs[-1] = entry
+        else:
+            self.handoffs.append(entry)
+            self.entries += 1
+        self.latest_by_agent[entry["agent"]] = entry
+        return True
+
+    def latest(self, agent: str) -> Optional[Dict[str, Any]]:
+        """Most recent entry written by an agent."""
+        return self.latest_by_agent.get(agent)
+
+    def recent(self, count: int = 5) -> List[Dict[str, Any]]:
+        """The last count handoffs, oldest first."""
+        return list(self.handoffs)[-count:] if count > 0 else []
+
+
+def load_index(logbook: Path = AGENT_LOGBOOK, state_path: Optional[Path] = None) -> LogbookIndex:
+    """Logbook index brought up to date with the file."""
+    index = LogbookIndex(logbook, state_path)
+    index.update()
+    return index
+
+
+def agent_rows(active_agents: Dict[str, Dict], index: LogbookIndex) -> List[Dict[str, Any]]:
+    """One status row per known agent: table columns plus its latest logbook entry."""
+    rows = []
+    for agent in AGENTS:
+        data = active_agents.get(agent, {})
+        rows.append({
+            "agent": agent,
+            "status": data.get("status", "Unknown"),
+            "task": data.get("task"),
+            "last_update": data.get("last_update"),
+            "latest_entry": index.latest(agent),
+        })
+    return rows
+
+
+def status_snapshot(index: Optional[LogbookIndex] = None, active_context: Path = ACTIVE_CONTEXT, recent: int = 5) -> Dict[str, Any]:
+    """Agent table, latest logbook entry per agent and recent handoffs, as JSON-ready data."""
+    index = index or load_index()
+    active_agents = parse_active_agents_table(active_context.read_text()) if active_context.exists() else {}
+    return {
+        "agents": agent_rows(active_agents, index),
+        "recent": index.recent(recent),
+        "logbook_entries": index.entries,
+    }
+
+
+class StatusWatcher:
+    """
+    Turns memory bank file changes into status deltas.
+
+    Each poll stats the markdown files under the watched directories (no
+    content is read) and re-parses only the files whose mtime or size moved:
+    the logbook through the incremental index, activeContext.md by diffing
+    the agent table. Deltas are JSON-ready dicts:
+
+        {"type": "handoff", "entry": {...}}      new or updated logbook entry
+        {"type": "agent", "agent": ..., ...}     changed agent table row
+        {"type": "file", "path": ..., "event": "created" | "modified" | "deleted"}
+    """
+
+    def __init__(
+        self,
+        index: Optional[LogbookIndex] = None,
+        roots: Optional[List[Path]] = None,
+        active_context: Path = ACTIVE_CONTEXT,
+        recent: int = 5,
+    ):
+        self.index = index or LogbookIndex()
+        self.roots = [Path(root) for root in (roots or [MEMORY_BANK, AGENT_BANKS])]
+        self.active_context = Path(active_context)
+        self.recent = recent
+        self._stats: Dict[Path, Tuple[int, int]] = {}
+        self._agents: Dict[str, Dict] = {}
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        found = {}
+        for root in self.roots:
+            if not root.is_dir():
+                continue
+            with os.scandir(root) as it:
+                for entry in it:
+                    if entry.name.endswith(".md") and entry.is_file():
+                        stat = entry.stat()
+                        found[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        return found
+
+    def _read_agents(self) -> Dict[str, Dict]:
+        try:
+            return parse_active_agents_table(self.active_context.read_text())
+        except OSError:
+            return {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Full status, which also becomes the baseline for the following polls."""
+        self._stats = self._scan()
+        self.index.update()
+        self._agents = self._read_agents()
+        return {
+            "type": "snapshot",
+            "agents": agent_rows(self._agents, self.index),
+            "recent": self.index.recent(self.recent),
+            "logbook_entries": self.index.entries,
+        }
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Deltas for the files changed since the previous poll (or snapshot)."""
+        found = self._scan()
+        changed = [path for path, stat in found.items() if self._stats.get(path) != stat]
+        removed = [path for path in self._stats if path not in found]
+        deltas: List[Dict[str, Any]] = []
+        for path in sorted(changed + removed):
+            if path == self.index.logbook:
+                deltas.extend({"type": "handoff", "entry": entry} for entry in self.index.update())
+            elif path == self.active_context:
+                agents = self._read_agents()
+                for row in agent_rows(agents, self.index):
+                    if agents.get(row["agent"]) != self._agents.get(row["agent"]):
+                        deltas.append({"type": "agent", **row})
+                self._agents = agents
+            else:
+                event = "deleted" if path not in found else "modified" if path in self._stats else "created"
+                deltas.append({"type": "file", "path": f"{path.parent.name}/{path.name}", "event": event})
+        self._stats = found
+        return deltas
+
+    def watch(self, interval: float = 0.5, stop: Optional[Callable[[], bool]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Poll every interval seconds, yielding each non-empty batch of deltas."""
+        while not (stop and stop()):
+            deltas = self.poll()
+            if deltas:
+                yield deltas
+            time.sleep(interval)
@@ -44,6 +44,16 @@ else
     echo "⚠️  README.md not found. Skipping badge."
 fi
 
+# 3. Make the repository's docs searchable (its own shard in the MCP server's index)
+REPO_NAME="$(basename "$(cd "$TARGET_REPO" && pwd)")"
+echo "Indexing documentation as search shard '$REPO_NAME'..."
+if python3 "$GOVERNANCE_ROOT/mcp-server/index_docs.py" --repo "$REPO_NAME" --root "$TARGET_REPO" > /dev/null; then
+    echo "✅ Documentation indexed."
+else
+    echo "⚠️  Indexing failed (is the MCP server venv active?). Run later with:"
+    echo "   python mcp-server/index_docs.py --repo $REPO_NAME --root $TARGET_REPO"
+fi
+
 echo
 echo "🎉 Onboarding complete!"
 echo "This repository is now compliant with organizational governance standards."
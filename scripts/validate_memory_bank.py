@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Memory Bank Validator
+
+Validates memory bank integrity and format compliance (standards/memory-bank-format.md).
+Run before committing changes to memory bank files.
+
+Files are checked in parallel and results are cached per file by content
+hash under .cache/memory-bank/, so unchanged files are not re-checked. A
+cached result is reused only while the files it links to are unchanged too.
+Links are validated offline: relative paths and anchors against the
+filesystem, governance documents against the MCP server's document catalog.
+
+Usage:
+    validate_memory_bank.py                    Validate every memory bank file
+    validate_memory_bank.py --changed-only     Only files changed relative to HEAD (or --base)
+    validate_memory_bank.py --format json      Machine-readable results
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from memory_bank import (
+    ACTIVE_CONTEXT,
+    AGENT_BANKS,
+    AGENT_LOGBOOK,
+    CACHE_DIR,
+    ENTRY_HEADER,
+    FENCE,
+    MEMORY_BANK,
+    REPO_ROOT,
+    parse_active_agents_table,
+    parse_entries,
+)
+
+# Markdown structure and the document catalog come from the MCP server
+sys.path.append(str(REPO_ROOT / "mcp-server" / "src"))
+from sections import outline  # noqa: E402
+
+try:
+    from catalog import CATEGORIES, DocumentCatalog
+except ImportError:  # PyYAML missing: governance documents are checked on the filesystem
+    CATEGORIES, DocumentCatalog = [], None
+
+# Bump when checks change, so cached results are not reused
+VALIDATOR_VERSION = 1
+CACHE_PATH = CACHE_DIR / "validate.json"
+
+REQUIRED_FILES = [
+    ACTIVE_CONTEXT,
+    MEMORY_BANK / "progress.md",
+    AGENT_LOGBOOK,
+    AGENT_BANKS / "governance-monitor-memory.md",
+    AGENT_BANKS / "report-processor-memory.md",
+    AGENT_BANKS / "standards-updater-memory.md",
+    AGENT_BANKS / "compliance-checker-memory.md",
+]
+
+# Required sections (heading prefixes) per shared memory file
+REQUIRED_SECTIONS = {
+    "activeContext.md": ["Current Focus", "Recent Accomplishments", "Active Tasks", "Next Steps"],
+    "progress.md": ["Status"],
+}
+
+SENSITIVE_PATTERNS = ["api_key", "password", "secret", "token"]
+LINK_PATTERN = re.compile(r"!?\[[^\]]*\]\(\s*<?([^)\s>]+)>?(?:\s+\"[^\"]*\")?\s*\)")
+INLINE_CODE = re.compile(r"`[^`]*`")
+
+
+@dataclass
+class Issue:
+    level: str  # "error" or "warning"
+    check: str
+    message: str
+    line: int = 0
+
+
+@dataclass
+class FileResult:
+    path: str
+    digest: str
+    issues: List[Issue] = field(default_factory=list)
+    # Link targets the result depends on, with their (mtime_ns, size) at check time
+    deps: Dict[str, Optional[List[int]]] = field(default_factory=dict)
+    cached: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"path": self.path, "cached": self.cached, "issues": [asdict(i) for i in self.issues]}
+
+
+def _stat_key(path: Path) -> Optional[List[int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _unfenced_lines(text: str) -> List[Tuple[int, str]]:
+    """(line number, line) pairs outside code fences."""
+    lines = []
+    in_fence = False
+    for number, line in enumerate(text.splitlines(), start=1):
+        if FENCE.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            lines.append((number, line))
+    return lines
+
+
+class Validator:
+    """Runs the memory bank checks over a set of files, reusing cached per-file results."""
+
+    def __init__(self, repo_root: Path = REPO_ROOT, cache_path: Optional[Path] = CACHE_PATH, workers: int = 8):
+        self.repo_root = Path(repo_root)
+        self.cache_path = cache_path
+        self.workers = workers
+        self._catalog = None
+        self._outlines: Dict[Tuple[str, Optional[Tuple[int, ...]]], List[str]] = {}
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict[str, Any]] = self._load_cache()
+
+    @property
+    def catalog(self):
+        """Document catalog, built on first use: fully cached runs never index the governance docs."""
+        if DocumentCatalog is None:
+            return None
+        with self._lock:
+            if self._catalog is None:
+                self._catalog = DocumentCatalog(str(self.repo_root))
+            return self._catalog
+
+    # Cache
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get("files", {}) if data.get("version") == VALIDATOR_VERSION else {}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": VALIDATOR_VERSION, "files": self._cache}, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _cached(self, rel: str, digest: str) -> Optional[FileResult]:
+        entry = self._cache.get(rel)
+        if not entry or entry["digest"] != digest:
+            return None
+        if any(_stat_key(self.repo_root / dep) != stat for dep, stat in entry["deps"].items()):
+            return None
+        issues = [Issue(**issue) for issue in entry["issues"]]
+        return FileResult(rel, digest, issues, entry["deps"], cached=True)
+
+    # Files
+
+    def memory_bank_files(self) -> List[Path]:
+        files = []
+        for root in (self.repo_root / "memory-bank", self.repo_root / "agent-memory-banks"):
+            if root.is_dir():
+                files.extend(sorted(root.rglob("*.md")))
+        return files
+
+    def changed_files(self, base: str = "HEAD") -> List[Path]:
+        """Memory bank files changed relative to base, including untracked ones."""
+        roots = ["memory-bank", "agent-memory-banks"]
+        commands = [
+            ["git", "diff", "--name-only", "--diff-filter=ACMR", base, "--", *roots],
+            ["git", "ls-files", "--others", "--exclude-standard", "--", *roots],
+        ]
+        names = set()
+        for command in commands:
+            output = subprocess.run(command, cwd=self.repo_root, capture_output=True, text=True, check=True).stdout
+            names.update(line for line in output.splitlines() if line.endswith(".md"))
+        return [self.repo_root / name for name in sorted(names)]
+
+    # Checks
+
+    def check_required_files(self) -> List[Issue]:
+        issues = []
+        for path in REQUIRED_FILES:
+            path = self.repo_root / path.relative_to(REPO_ROOT)
+            if not path.is_file():
+                issues.append(Issue("error", "required-file", f"Missing required file: {path.relative_to(self.repo_root)}"))
+        return issues
+
+    def validate_file(self, path: Path) -> FileResult:
+        data = path.read_bytes()
+        rel = path.relative_to(self.repo_root).as_posix()
+        digest = hashlib.sha256(data).hexdigest()
+        cached = self._cached(rel, digest)
+        if cached:
+            return cached
+
+        result = FileResult(rel, digest)
+        text = data.decode("utf-8", errors="replace")
+        lines = _unfenced_lines(text)
+        self._check_sensitive(text, result)
+        self._check_links(path, lines, result)
+        self._check_sections(path, lines, result)
+        if path.name == AGENT_LOGBOOK.name:
+            self._check_logbook(text, lines, result)
+        if path.name == ACTIVE_CONTEXT.name:
+            self._check_active_context(text, result)
+        return result
+
+    def _check_sensitive(self, text: str, result: FileResult):
+        for number, line in enumerate(text.splitlines(), start=1):
+            lowered = line.lower()
+            if "# " in line or "example" in lowered:
+                continue
+            for pattern in SENSITIVE_PATTERNS:
+                if pattern in lowered:
+                    result.issues.append(Issue("error", "sensitive-data", f"Possible sensitive data: {pattern}", number))
+
+    def _anchors(self, target: Path) -> List[str]:
+        """Heading anchors of a markdown file, memoized by its stat."""
+        stat = _stat_key(target)
+        key = (str(target), tuple(stat) if stat else None)
+        with self._lock:
+            anchors = self._outlines.get(key)
+        if anchors is None:
+            anchors = [section.anchor for section in outline(target.read_bytes())]
+            with self._lock:
+                self._outlines[key] = anchors
+        return anchors
+
+    def _resolve(self, path: Path, link: str, result: FileResult) -> Optional[str]:
+        """Check one link; returns an error message or None."""
+        if link.startswith("governance://"):
+            category, _, name = link[len("governance://"):].partition("/")
+            name, _, anchor = name.partition("#")
+            target = self.repo_root / category / f"{name}.md"
+        else:
+            link_path, _, anchor = link.partition("#")
+            target = (path.parent / link_path).resolve() if link_path else path
+        try:
+            dep = target.relative_to(self.repo_root).as_posix()
+        except ValueError:
+            return f"Link points outside the repository: {link}"
+        result.deps[dep] = _stat_key(target)
+
+        category = dep.split("/", 1)[0]
+        if self.catalog and category in CATEGORIES and dep.count("/") == 1 and dep.endswith(".md"):
+            entry = self.catalog.get(category, Path(dep).stem)
+            if entry is None:
+                return f"Broken link: {link}"
+            anchors = [heading.anchor for heading in entry.headings]
+        elif not target.exists():
+            return f"Broken link: {link}"
+        elif anchor and target.suffix == ".md":
+            anchors = self._anchors(target)
+        else:
+            return None
+        if anchor and anchor not in anchors:
+            return f"Unknown anchor #{anchor} in link: {link}"
+        return None
+
+    def _check_links(self, path: Path, lines: List[Tuple[int, str]], result: FileResult):
+        for number, line in lines:
+            for match in LINK_PATTERN.finditer(INLINE_CODE.sub("", line)):
+                link = match.group(1)
+                if re.match(r"^[a-z][a-z0-9+.-]*:", link) and not link.startswith("governance://"):
+                    continue  # external URLs are not checked offline
+                message = self._resolve(path, link, result)
+                if message:
+                    result.issues.append(Issue("warning", "links", message, number))
+
+    def _check_sections(self, path: Path, lines: List[Tuple[int, str]], result: FileResult):
+        required = REQUIRED_SECTIONS.get(path.name)
+        if not required or path.parent.name != "memory-bank":
+            return
+        headings = [line.lstrip("#").strip() for _, line in lines if line.startswith("## ")]
+        for section in required:
+            if not any(heading.startswith(section) for heading in headings):
+                result.issues.append(Issue("warning", "required-section", f"Missing section: {section}"))
+
+    def _check_logbook(self, text: str, lines: List[Tuple[int, str]], result: FileResult):
+        # Level-2 headings that look like entries must use the entry header format
+        for number, line in lines:
+            if line.startswith("## ") and ("→" in line or line[3:4].isdigit()) and not ENTRY_HEADER.match(line):
+                result.issues.append(Issue("warning", "logbook", "Invalid logbook entry header", number))
+
+        line_starts = [0]
+        for line in text.encode("utf-8").splitlines(keepends=True):
+            line_starts.append(line_starts[-1] + len(line))
+        previous = None
+        for entry in parse_entries(text):
+            number = bisect_right(line_starts, entry["offset"])
+            try:
+                timestamp = datetime.strptime(f"{entry['date']} {entry['time']}", "%Y-%m-%d %H:%M")
+            except ValueError:
+                result.issues.append(Issue("warning", "logbook", "Invalid entry timestamp", number))
+                continue
+            if not entry["status"]:
+                result.issues.append(Issue("warning", "logbook", "Entry has no **Status**", number))
+            if previous and timestamp < previous:
+                result.issues.append(Issue("warning", "logbook", "Entry is older than the one before it", number))
+            previous = timestamp
+
+    def _check_active_context(self, text: str, result: FileResult):
+        if "| Agent Role |" in text and not parse_active_agents_table(text):
+            result.issues.append(Issue("warning", "active-agents", "Active Agents table has no rows"))
+
+    # Run
+
+    def run(self, files: Optional[List[Path]] = None) -> Dict[str, Any]:
+        files = self.memory_bank_files() if files is None else files
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(self.validate_file, [f for f in files if f.is_file()]))
+        for result in results:
+            self._cache[result.path] = {
+                "digest": result.digest,
+                "issues": [asdict(issue) for issue in result.issues],
+                "deps": result.deps,
+            }
+        self._save_cache()
+
+        required = self.check_required_files()
+        issues = required + [issue for result in results for issue in result.issues]
+        return {
+            "required_files": [asdict(issue) for issue in required],
+            "files": [result.to_dict() for result in results],
+            "checked": sum(1 for result in results if not result.cached),
+            "cached": sum(1 for result in results if result.cached),
+            "errors": sum(1 for issue in issues if issue.level == "error"),
+            "warnings": sum(1 for issue in issues if issue.level == "warning"),
+        }
+
+
+def print_report(report: Dict[str, Any]):
+    """Human-readable report, in the layout of the original shell validator."""
+    icons = {"error": "❌", "warning": "⚠️ "}
+    print("🔍 Validating Memory Bank...")
+    print()
+    for issue in report["required_files"]:
+        print(f"{icons[issue['level']]} {issue['message']}")
+    for file in report["files"]:
+        for issue in file["issues"]:
+            location = f"{file['path']}:{issue['line']}" if issue["line"] else file["path"]
+            print(f"{icons[issue['level']]} {location}: {issue['message']}")
+    print()
+    print(f"📋 {len(report['files'])} file(s): {report['checked']} checked, {report['cached']} unchanged")
+    print("================================")
+    if report["errors"] == 0 and report["warnings"] == 0:
+        print("✅ All checks passed!")
+    elif report["errors"] == 0:
+        print(f"⚠️  Passed with {report['warnings']} warning(s)")
+    else:
+        print(f"❌ Failed with {report['errors']} error(s) and {report['warnings']} warning(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate memory bank files")
+    parser.add_argument("files", nargs="*", help="Files to validate (default: all memory bank files)")
+    parser.add_argument("--changed-only", action="store_true", help="Only validate files changed relative to --base")
+    parser.add_argument("--base", default="HEAD", help="Git revision --changed-only compares against")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    parser.add_argument("--workers", type=int, default=8, help="Files checked in parallel")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the result cache")
+    args = parser.parse_args()
+
+    validator = Validator(cache_path=None if args.no_cache else CACHE_PATH, workers=args.workers)
+    if args.files:
+        files = [Path(f).resolve() for f in args.files]
+    elif args.changed_only:
+        files = validator.changed_files(args.base)
+    else:
+        files = None
+    report = validator.run(files)
+
+    if args.format == "json":
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    sys.exit(1 if report["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()